@@ -0,0 +1 @@
+'''Benchmarks of PyBrinf, run them with python -m benchmarks.run.'''
@@ -0,0 +1,177 @@
+'''
+Benchmarks of the PyBrinf hot paths.
+Synthetic fixtures are generated in a temporary home directory, every benchmark is timed
+(best of several runs) and measured for peak memory, and the results can be saved as a
+baseline and compared with it.
+
+Usage:
+    python -m benchmarks.run --rows 100000 --tabs 2000
+    python -m benchmarks.run --save benchmarks/baseline.json
+    python -m benchmarks.run --baseline benchmarks/baseline.json --check
+
+Docstrings are written in Google style.
+'''
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+from pybrinf.__main__ import Brinf
+from pybrinf.browser import Browser
+from pybrinf.database import Database
+from pybrinf.parser import Parser
+from pybrinf.session import CACHE, Session
+from pybrinf.utilities import Utilities
+from pybrinf.testing import make_home
+
+
+def measure(function, repeat: int) -> dict:
+    '''
+    Time a function and measure its peak memory.
+
+    Args:
+        function (callable): The function to measure, it returns the number of items processed.
+        repeat (int): The number of timed runs, the best one is kept.
+    Returns:
+        dict: The best time in seconds, the items processed, the throughput and the peak memory.
+    '''
+    best = float('inf')
+    items = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        items = function()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        'seconds': best,
+        'items': items,
+        'throughput': items / best if best else 0.0,
+        'peak_mb': peak / 2 ** 20,
+    }
+
+
+def benchmarks(root: str, profiles: dict) -> dict:
+    '''
+    Get the benchmarks to run over a fixture home directory.
+
+    Args:
+        root (str): The home directory.
+        profiles (dict): The profile paths by browser name, see pybrinf.testing.make_home.
+    Returns:
+        dict: The functions by benchmark name.
+    '''
+    chrome = Browser('linux', root=root, **Utilities.get_browser_data('chrome'))
+    firefox = Browser('linux', root=root, **Utilities.get_browser_data('firefox'))
+    brinf = Brinf(root=root)
+    brinf.init()
+    profile = profiles['chrome'][0]
+    session = os.path.join(profile, 'Sessions', os.listdir(os.path.join(profile, 'Sessions'))[0])
+
+    def database_copy_open():
+        database = Database(path=os.path.join(profile, 'History'), bypass=True)
+        database.connect()
+        count = database.execute('SELECT COUNT(*) FROM urls')[0][0]
+        database.close()
+        return count
+
+    def session_tabs():
+        CACHE.clear()
+        return len(Session(profile, 'Google Chrome').tabs())
+
+    return {
+        'database_copy_open': database_copy_open,
+        'chrome_history': lambda: len(chrome.history()),
+        'firefox_history': lambda: len(firefox.history()),
+        'chrome_downloads': lambda: len(chrome.downloads()),
+        'brinf_history': lambda: len(brinf.history()),
+        'parser_commands': lambda: len(Parser(session).commands),
+        'session_tabs': session_tabs,
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    '''
+    Compare the results with a baseline.
+
+    Args:
+        results (dict): The results by benchmark name.
+        baseline (dict): The baseline results by benchmark name.
+        tolerance (float): The slowdown ratio allowed, e.g. 1.25.
+    Returns:
+        list[str]: The names of the benchmarks slower than the baseline allows.
+    '''
+    regressions = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if not expected or not expected.get('throughput'):
+            continue
+        ratio = expected['throughput'] / result['throughput'] if result['throughput'] else float('inf')
+        result['ratio'] = ratio
+        if ratio > tolerance:
+            regressions.append(name)
+    return regressions
+
+
+def report(results: dict, regressions: list[str], output=None) -> None:
+    '''Print the results as a table.'''
+    output = output or sys.stdout
+    output.write(f'{"benchmark":<20} {"items":>10} {"seconds":>10} {"items/s":>12} '
+                 f'{"peak MB":>9} {"vs base":>8}\n')
+    for name, result in results.items():
+        ratio = f'{1 / result["ratio"]:.2f}x' if result.get('ratio') else '-'
+        flag = '  REGRESSION' if name in regressions else ''
+        output.write(f'{name:<20} {result["items"]:>10} {result["seconds"]:>10.4f} '
+                     f'{result["throughput"]:>12.0f} {result["peak_mb"]:>9.2f} {ratio:>8}{flag}\n')
+
+
+def main(argv: list[str] = None) -> int:
+    '''
+    Run the benchmarks.
+
+    Args:
+        argv (list of str): The command line arguments. Defaults to sys.argv.
+    Returns:
+        int: The exit code, 1 if --check is given and a benchmark regressed.
+    '''
+    parser = argparse.ArgumentParser(description='Benchmark the PyBrinf hot paths.')
+    parser.add_argument('--rows', type=int, default=10000, help='history rows per browser')
+    parser.add_argument('--tabs', type=int, default=1000, help='tabs of the session file')
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per benchmark')
+    parser.add_argument('--only', nargs='*', help='benchmarks to run')
+    parser.add_argument('--baseline', help='baseline file to compare with')
+    parser.add_argument('--tolerance', type=float, default=1.25, help='allowed slowdown ratio')
+    parser.add_argument('--save', help='save the results as a baseline file')
+    parser.add_argument('--check', action='store_true', help='fail if a benchmark regressed')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix='pybrinf-bench-') as root:
+        start = time.perf_counter()
+        profiles = make_home(root, rows=args.rows, tabs=args.tabs)
+        sys.stdout.write(f'fixtures: {args.rows} rows, {args.tabs} tabs '
+                         f'in {time.perf_counter() - start:.2f}s\n')
+        results = {}
+        for name, function in benchmarks(root, profiles).items():
+            if args.only and name not in args.only:
+                continue
+            results[name] = measure(function, args.repeat)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as file:
+            regressions = compare(results, json.load(file)['results'], args.tolerance)
+    report(results, regressions)
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as file:
+            json.dump({'rows': args.rows, 'tabs': args.tabs, 'results': results}, file, indent=4)
+    return 1 if args.check and regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,13 +3,43 @@
     A simple way to get information about the browser and more.
 '''
 
+import importlib
+from typing import TYPE_CHECKING
+
 __title__ = 'pybrinf'
 __version__ = '0.0.4'
 __author__ = 'Manuel Cabral'
 __license__ = 'GNU General Public License v3.0'
 
-from pybrinf.__main__ import Brinf
-from pybrinf.browser import Browser
-from pybrinf.utilities import Utilities
+# The public names are imported from their modules on first access.
+_LAZY_IMPORTS = {
+    'Brinf': 'pybrinf.__main__',
+    'Browser': 'pybrinf.browser',
+    'Utilities': 'pybrinf.utilities',
+    'Fleet': 'pybrinf.fleet',
+    'Stats': 'pybrinf.stats',
+}
+
+if TYPE_CHECKING:
+    # Only for type checkers and linters, at runtime __getattr__ imports them.
+    from pybrinf.__main__ import Brinf
+    from pybrinf.browser import Browser
+    from pybrinf.fleet import Fleet
+    from pybrinf.stats import Stats
+    from pybrinf.utilities import Utilities
+
+__all__ = ['Brinf', 'Browser', 'Utilities', 'Fleet', 'Stats']
+
+
+def __getattr__(name: str):
+    '''Import a public name on first access.'''
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(_LAZY_IMPORTS[name]), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ['Brinf', 'Browser', 'Utilities']
+def __dir__():
+    '''List the module attributes, including the lazy ones.'''
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
@@ -4,20 +4,23 @@
     Docstrings are written in Google style.
 '''
 
-import re
+import os
+import configparser
 from typing import Union
+from concurrent.futures import ThreadPoolExecutor, wait
 
 from pybrinf.browser import Browser
+from pybrinf.discovery import Discovery, Installation
+from pybrinf.process import ProcessTable, install_folders
 from pybrinf.utilities import Utilities
-from pybrinf.item import History, Downloaded
+from pybrinf.item import History, Downloaded, Tab
+from pybrinf.stats import stage, bind
 from pybrinf.exceptions import BrowserError, BrinfError, SystemBrinfError
 
 # import some utils for Windows systems
 if Utilities.system() == 'win32':
     import winreg
     from pybrinf.register import Register
-elif Utilities.system() == 'linux':
-    import subprocess
 
 
 class Brinf:
@@ -26,9 +29,19 @@ class Brinf:
     __browser = None
     __os = Utilities.system()
 
-    def __init__(self):
-        '''Initialize the Brinf instance.'''
+    def __init__(self, ttl: float = 300.0, root: str = None):
+        '''
+        Initialize the Brinf instance.
+
+        Args:
+            ttl (float): Seconds to keep the installed browsers discovery, None keeps it
+                until refresh is called. Defaults to 300.
+            root (str): A home directory to read the browsers data from instead of the
+                current user one, see Browser. Defaults to None.
+        '''
         self.__utils = Utilities()
+        self.__root = root
+        self.__discovery = Discovery(self.__os, ttl, root)
 
     @property
     def __default_win_browser(self) -> dict:
@@ -44,16 +57,41 @@ class Brinf:
             hkey = winreg.HKEY_CURRENT_USER
             key = register.openkey(hkey, self.__utils.DEFAULT_BROWSER_KEY)
             progid = register.extract(key, 'ProgId')
-            for browser in self.__utils.BROWSERS:
-                if re.search(browser['name'], progid, re.IGNORECASE):
-                    return browser
-            raise BrowserError('The default browser could not be found.')
+            browser = self.__utils.REGISTRY.by_progid(progid)
+            if browser is None:
+                raise BrowserError('The default browser could not be found.')
+            return browser
         return {}
 
+    def __mimeapps_browser(self) -> str:
+        '''
+        Read the default web browser from the mimeapps.list files, without running xdg-settings.
+
+        Returns:
+            str: The desktop file of the default browser or None if it is not set.
+        '''
+        config = os.environ.get('XDG_CONFIG_HOME') or os.path.expanduser('~/.config')
+        for path in self.__utils.LINUX_MIMEAPPS:
+            parser = configparser.ConfigParser(interpolation=None, strict=False)
+            try:
+                with open(os.path.expanduser(path.format(config=config)),
+                          'r', encoding='utf-8') as file:
+                    parser.read_file(file)
+            except (OSError, configparser.Error):
+                continue
+            for key in self.__utils.LINUX_MIMEAPPS_KEYS:
+                value = parser.get('Default Applications', key, fallback='')
+                desktop = next((entry for entry in value.split(';') if entry.strip()), None)
+                if desktop:
+                    return desktop.strip()
+        return None
+
     @property
     def __default_linux_browser(self) -> dict:
         '''
         Get the default browser of Linux system.
+        The mimeapps.list files are read first, xdg-settings is only run if they do not
+        set a web browser.
 
         Raises:
             SystemBrinfError: A system error occurred while getting the default browser.
@@ -62,40 +100,39 @@ class Brinf:
             dict: The default browser.
         '''
         if self.__os == 'linux':
-            process = subprocess.Popen(
-                self.__utils.LINUX_DEFAULT_BROWSER, stdout=subprocess.PIPE)
-            output, error = process.communicate()
-            if error:
-                raise SystemBrinfError(error)
-            browser = output.decode().strip()
-            browser_data = None
-            for data in self.__utils.BROWSERS:
-                if re.search(data['name'], browser, re.IGNORECASE):
-                    browser_data = data
-                    break
+            browser = self.__mimeapps_browser()
+            if browser is None:
+                import subprocess  # pylint: disable=import-outside-toplevel
+                try:
+                    process = subprocess.Popen(
+                        self.__utils.LINUX_DEFAULT_BROWSER,
+                        stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+                except OSError as exc:
+                    raise SystemBrinfError(exc) from exc
+                output, error = process.communicate()
+                if error:
+                    raise SystemBrinfError(error)
+                browser = output.decode().strip()
+            browser_data = self.__utils.REGISTRY.by_desktop(browser)
             if browser_data is None:
                 raise BrowserError('The default browser could not be found.')
             if not self.__os in browser_data['os_support']:
                 raise BrowserError(
-                    f'{data["fullname"]} is not supported in {self.__os}. Sorry!')
-            return data
+                    f'{browser_data["fullname"]} is not supported in {self.__os}. Sorry!')
+            return browser_data
         return {}
 
     def init(self) -> None:
         '''
         This method must be called before using any other methods of the class.
+        The default browser is detected the first time it is requested.
 
         Raises:
             SystemBrinfError: The system is not supported.
-            BrowserError: The default browser could not be found.
         '''
         if self.__os not in self.__utils.SUPPORTED_SYSTEMS:
             raise SystemBrinfError(f'System {self.__os} is not supported.')
-        detector = {
-            'win32': self.__default_win_browser,
-            'linux': self.__default_linux_browser
-        }
-        self.__browser = Browser(self.__os, **detector[self.__os])
+        self.__browser = None
         self.__initialize = True
 
     def reset(self) -> None:
@@ -103,10 +140,32 @@ class Brinf:
         self.__initialize = False
         self.__os = 'Unknown'
         self.__browser = None
+        self.__discovery.refresh()
+
+    def refresh(self) -> None:
+        '''Forget the installed browsers discovery, the next call probes the system again.'''
+        self.__discovery.refresh()
+
+    def installations(self, refresh: bool = False) -> list[Installation]:
+        '''
+        Get the installed browsers with their resolved paths, profiles and versions.
+        The system is only probed the first time or when the discovery has expired.
+
+        Args:
+            refresh (bool): Probe the system again even if the discovery is fresh.
+        Raises:
+            BrinfError: The Brinf instance has not been initialized.
+        Returns:
+            list: The installed browsers.
+        '''
+        if not self.__initialize:
+            raise BrinfError('The Brinf instance is not initialized.')
+        return self.__discovery.installations(refresh)
 
     def installed_browsers(self, exclude: Union[str, list] = '') -> list[Browser]:
         '''
         Get a list of installed browsers.
+        The system is only probed the first time or when the discovery has expired.
 
         Args:
             exclude (str, list of str): Exclude especific browsers from the list.
@@ -119,18 +178,43 @@ class Brinf:
         if not self.__initialize:
             raise BrinfError('The Brinf instance is not initialized.')
         if isinstance(exclude, str):
-            exclude = list(exclude)
-        browsers = []
-        for browser in self.__utils.BROWSERS:
-            instance = Browser(self.__os, **browser)
-            if not self.__os in browser['os_support']:
-                continue
-            if instance.installed and not instance.name in exclude:
-                browsers.append(instance)
+            exclude = [exclude] if exclude else []
+        exclude = [name.lower() for name in exclude]
+        browsers = [browser for browser in self.__discovery.browsers()
+                    if browser.name.lower() not in exclude]
         if len(browsers) == 0:
             raise BrowserError('None browser could be found.')
         return browsers
 
+    def running_browsers(self) -> dict[str, list[int]]:
+        '''
+        Get the supported browsers that are running from a single scan of the processes.
+
+        Raises:
+            BrinfError: The Brinf instance has not been initialized.
+            SystemBrinfError: The processes could not be listed.
+        Returns:
+            dict: The process ids of every running browser by browser name.
+        '''
+        if not self.__initialize:
+            raise BrinfError('The Brinf instance is not initialized.')
+        table = ProcessTable.snapshot(self.__os)
+        found = {}
+        for process in table:
+            data = self.__utils.REGISTRY.by_process(process)
+            if data is not None and self.__os in data['os_support']:
+                found.setdefault(data['name'], (data, []))[1].append(process)
+        running = {}
+        for name, (data, processes) in found.items():
+            try:
+                folders = install_folders(self.__os, Browser(self.__os, **data).app_path)
+            except BrowserError:
+                folders = []
+            pids = table.pids(processes, folders)
+            if pids:
+                running[name] = pids
+        return running
+
     @property
     def supported_browsers(self) -> list[str]:
         '''
@@ -139,22 +223,68 @@ class Brinf:
         Returns:
             list: The list of supported browsers.
         '''
-        return self.__utils.SUPPORTED_BROWSERS
+        return self.__utils.REGISTRY.names
 
     @property
     def default_browser(self) -> Browser:
         '''
-        Get the default browser instance.
+        Get the default browser instance, detected on the first call and then kept.
 
         Raises:
             BrinfNotInitialized: The Brinf instance is not initialized.
+            SystemBrinfError: A system error occurred while getting the default browser.
+            BrowserError: The default browser could not be found.
         Returns:
             browser: The default browser of the system.
         '''
         if not self.__initialize:
             raise BrinfError('The Brinf instance is not initialized.')
+        if self.__browser is None:
+            detector = {
+                'win32': lambda: self.__default_win_browser,
+                'linux': lambda: self.__default_linux_browser
+            }
+            self.__browser = Browser(self.__os, root=self.__root, **detector[self.__os]())
         return self.__browser
 
+    def iter_history(self, **kwargs):
+        '''
+        Iterate over the history of all browsers without loading it in memory.
+        Items are yielded browser after browser, newest first within each browser.
+
+        Args:
+            exclude (str, list of str): Exclude especific browsers from the history.
+            limit (int): The maximum number of history items for each browser.
+            offset (int): The offset of the history items for each browser.
+        Raises:
+            BrinfNotInitialized: The Brinf instance is not initialized.
+        Yields:
+            History: The history items.
+        '''
+        if not self.__initialize:
+            raise BrinfError('The Brinf instance is not initialized.')
+        for browser in self.installed_browsers(kwargs.get('exclude', [])):
+            yield from browser.iter_history(**kwargs)
+
+    def iter_downloads(self, **kwargs):
+        '''
+        Iterate over the downloads of all browsers without loading them in memory.
+        Items are yielded browser after browser, newest first within each browser.
+
+        Args:
+            exclude (str, list of str): Exclude especific browsers from the downloads.
+            limit (int): The maximum number of downloads items for each browser.
+            offset (int): The offset of the downloads items for each browser.
+        Raises:
+            BrinfNotInitialized: The Brinf instance is not initialized.
+        Yields:
+            Downloaded: The downloaded items.
+        '''
+        if not self.__initialize:
+            raise BrinfError('The Brinf instance is not initialized.')
+        for browser in self.installed_browsers(kwargs.get('exclude', [])):
+            yield from browser.iter_downloads(**kwargs)
+
     def history(self, reverse: bool = True, **kwargs) -> list[History]:
         '''
         Get the history of all browsers.
@@ -179,7 +309,10 @@ class Brinf:
             if len(browser_websites) == 0:
                 continue
             history += browser_websites
-        return sorted(history, key=lambda x: Utilities.date_to_int(x.last_visit), reverse=reverse)
+        with stage(None, 'merge') as timer:
+            history.sort(key=lambda x: Utilities.date_to_int(x.last_visit), reverse=reverse)
+            timer.count(objects=len(history))
+        return history
 
     def downloads(self, reverse: bool = True, **kwargs) -> list[Downloaded]:
         '''
@@ -205,11 +338,44 @@ class Brinf:
             if len(browser_downloads) == 0:
                 continue
             downloads += browser_downloads
-        return sorted(downloads, key=lambda x: Utilities.date_to_int(x.start_time), reverse=reverse)
+        with stage(None, 'merge') as timer:
+            downloads.sort(key=lambda x: Utilities.date_to_int(x.start_time), reverse=reverse)
+            timer.count(objects=len(downloads))
+        return downloads
+
+    def all_tabs(self, timeout: float = 2.0, fields: tuple = Tab.DEFAULT_FIELDS) -> list[Tab]:
+        '''
+        Get the tabs of every installed browser in dev tools mode, querying them concurrently.
+        Browsers that do not answer within the timeout are skipped.
+
+        Args:
+            timeout (float): The maximum time to wait for the browsers in seconds. Defaults to 2.
+            fields (tuple of str): The Tab attributes to keep. Defaults to Tab.DEFAULT_FIELDS.
+        Raises:
+            BrinfError: The Brinf instance is not initialized.
+        Returns:
+            list: The tabs of all the browsers.
+        '''
+        if not self.__initialize:
+            raise BrinfError('The Brinf instance is not initialized.')
+        browsers = [browser for browser in self.installed_browsers() if browser.dev_tools]
+        if not browsers:
+            return []
+        executor = ThreadPoolExecutor(max_workers=len(browsers))
+        futures = [executor.submit(bind(browser.tabs), timeout, fields) for browser in browsers]
+        done, _ = wait(futures, timeout=timeout)
+        executor.shutdown(wait=False)
+        tabs = []
+        for future in futures:
+            if future in done and future.exception() is None:
+                tabs += future.result()
+        return tabs
 
     def browser(self, name: str) -> Browser:
         '''
         Get a browser instance from the name.
+        An installed browser is the same instance installed_browsers and all_tabs use,
+        the system is probed if the discovery has expired.
         If the browser is not installed, it will raise an exception.
 
         Args:
@@ -222,10 +388,22 @@ class Brinf:
         '''
         if not self.__initialize:
             raise BrinfError('The Brinf instance is not initialized.')
-        if not name in self.__utils.SUPPORTED_BROWSERS:
+        if not name in self.__utils.REGISTRY:
             raise BrowserError(f'The browser {name} is not supported.')
+        # The instance of the discovery is the one all_tabs and the other methods use,
+        # so its dev tools and port settings apply to them.
+        for browser in self.__discovery.browsers():
+            if browser.name.lower() == name.lower():
+                return browser
         try:
             data = self.__utils.get_browser_data(name)
-            return Browser(self.__os, **data)
+            return Browser(self.__os, root=self.__root, **data)
         except Exception as exc:
             raise BrowserError('The browser could not be found.') from exc
+
+
+if __name__ == '__main__':
+    # python -m pybrinf runs the command line interface.
+    import sys
+    from pybrinf.cli import main
+    sys.exit(main())
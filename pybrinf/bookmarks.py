@@ -0,0 +1,138 @@
+'''
+Bookmarks implementation for PyBrinf.
+This module reads the Bookmarks JSON file of chromium based browsers.
+The tree is flattened without recursion and the flat rows are cached by file identity
+and by the checksum chromium stores in the file, so an unchanged file is not parsed again.
+Firefox bookmarks are read from places.sqlite, see queries.MOZ_BOOKMARK_QUERY.
+Docstrings are written in Google style.
+'''
+
+import os
+import re
+import json
+import threading
+from collections import OrderedDict
+
+from pybrinf.stats import stage
+from pybrinf.exceptions import BrowserError
+
+# The checksum is the first key of the file, it is searched in the first bytes only.
+CHECKSUM = re.compile(rb'"checksum"\s*:\s*"([0-9A-Fa-f]*)"')
+CHECKSUM_WINDOW = 256
+
+
+def flatten(roots: dict) -> list[tuple]:
+    '''
+    Flatten the bookmark tree in depth first order, with an explicit stack.
+
+    Args:
+        roots (dict): The roots object of a Bookmarks file.
+    Returns:
+        list[tuple]: The (id, guid, url, title, folder, date added) rows of the bookmarks,
+            the folder is the path of folder names from the root, e.g. Bookmarks bar/News.
+    '''
+    rows = []
+    stack = [(node, '') for node in reversed(list(roots.values())) if isinstance(node, dict)]
+    while stack:
+        node, parent = stack.pop()
+        if node.get('type') == 'url':
+            rows.append((node.get('id'), node.get('guid'), node.get('url'), node.get('name'),
+                         parent, node.get('date_added')))
+            continue
+        name = node.get('name', '')
+        path = f'{parent}/{name}' if parent else name
+        stack.extend((child, path) for child in reversed(node.get('children', ())))
+    return rows
+
+
+class BookmarkCache:
+    '''
+        Bounded LRU cache of flattened Bookmarks files shared by all Browser instances.
+        An entry is used while the file identity (inode, size and mtime) is the same, or
+        when the file was rewritten with the same checksum.
+        IMPORTANT: The cached rows are shared, treat them as read-only.
+    '''
+
+    def __init__(self, size: int = 16):
+        '''
+        Initialize the BookmarkCache instance.
+
+        Args:
+            size (int): The maximum number of files to keep. Defaults to 16.
+        '''
+        self.__size = size
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def __len__(self) -> int:
+        '''Get the number of cached files.'''
+        return len(self.__entries)
+
+    def __lookup(self, path: str, identity: tuple, checksum: bytes = None) -> list[tuple]:
+        '''Get the rows of a file if the identity, or else the checksum, matches.'''
+        with self.__lock:
+            entry = self.__entries.get(path)
+            if entry is None:
+                return None
+            if entry[0] != identity and (not checksum or entry[1] != checksum):
+                return None
+            self.__entries[path] = (identity, entry[1], entry[2])
+            self.__entries.move_to_end(path)
+            return entry[2]
+
+    def __store(self, path: str, identity: tuple, checksum: bytes, rows: list[tuple]) -> None:
+        '''Store the rows of a file, evicting the least recently used ones.'''
+        with self.__lock:
+            self.__entries[path] = (identity, checksum, rows)
+            self.__entries.move_to_end(path)
+            while len(self.__entries) > self.__size:
+                self.__entries.popitem(last=False)
+
+    def get(self, path: str, browser: str = None) -> list[tuple]:
+        '''
+        Get the flattened rows of a Bookmarks file, parsing it only if it has changed.
+
+        Args:
+            path (str): The path of the Bookmarks file.
+            browser (str): The browser the file belongs to, used by pybrinf.stats.
+        Raises:
+            BrowserError: If the file cannot be read or parsed.
+        Returns:
+            list[tuple]: The rows of the bookmarks, see flatten.
+        '''
+        path = os.path.abspath(path)
+        try:
+            stat = os.stat(path)
+        except OSError as exc:
+            raise BrowserError(f'Bookmarks file {path} not found') from exc
+        identity = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        rows = self.__lookup(path, identity)
+        if rows is not None:
+            return rows
+        try:
+            with stage(browser, 'read') as timer, open(path, 'rb') as file:
+                data = file.read()
+                timer.count(bytes=len(data))
+        except OSError as exc:
+            raise BrowserError(f'Cannot read the bookmarks file {path}') from exc
+        match = CHECKSUM.search(data, 0, CHECKSUM_WINDOW)
+        checksum = match.group(1) if match else None
+        rows = self.__lookup(path, identity, checksum)
+        if rows is not None:
+            return rows
+        try:
+            with stage(browser, 'parse') as timer:
+                rows = flatten(json.loads(data).get('roots', {}))
+                timer.count(objects=len(rows))
+        except (ValueError, AttributeError) as exc:
+            raise BrowserError(f'Cannot parse the bookmarks file {path}') from exc
+        self.__store(path, identity, checksum, rows)
+        return rows
+
+    def clear(self) -> None:
+        '''Remove all the cached files.'''
+        with self.__lock:
+            self.__entries.clear()
+
+
+CACHE = BookmarkCache()
@@ -5,18 +5,28 @@ This module is used to simulate a simple browser.
 Docstrings are written in Google style.
 '''
 
-import re
 import os
+import signal
 import subprocess
-import urllib.request
-import json
+from typing import Union, TYPE_CHECKING
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
 
-from pybrinf.item import Downloaded, History, Tab
-from pybrinf.database import Database
+from pybrinf.item import Bookmark, Downloaded, History, SearchTerm, Tab
 from pybrinf.utilities import Utilities
-from pybrinf.session import Session
+from pybrinf.profile import Profile, chromium_profiles, firefox_profiles
+from pybrinf.process import ProcessTable, install_folders, process_names
+from pybrinf.version import disk_version
+from pybrinf.stats import stage, bind
 from pybrinf.exceptions import BrowserError
 
+# The database, session and devtools modules (sqlite3, http.client, ...) are only
+# imported when they are used, so importing pybrinf stays fast.
+if TYPE_CHECKING:
+    from pybrinf.database import Database
+    from pybrinf.session import Session
+    from pybrinf.devtools import DevTools
+
 
 class Browser:
     '''
@@ -32,8 +42,17 @@ class Browser:
             process (str): The process name of the browser.
             progid (str): The progid of the browser.
             chromium (bool): Whether the browser is a chromium based browser.
+            port (int): The remote debugging port, 0 picks a free one on open. Defaults to 9222.
+            root (str): A home directory to read the data from instead of the current user
+                one, e.g. a mounted disk. The browser is installed if its data exists there.
     '''
 
+    # Browser is the facade of a single browser: every kind of data has a list method and a
+    # streaming iter_ method next to the discovery and process control ones, so the public
+    # methods grow with the supported kinds by design. The work itself lives in the
+    # database, bookmarks, session and devtools modules.
+    # pylint: disable=too-many-public-methods
+
     # pylint: disable=too-many-instance-attributes
     def __init__(self, os_: str, **kwargs):
         '''Initialize the Browser instance.'''
@@ -45,6 +64,11 @@ class Browser:
         self.__process = kwargs.get('process', None)[os_]
         self.__chromium = kwargs.get('chromium', None)
         self.__dev_tools = False
+        self.__port = kwargs.get('port', 9222)
+        self.__root = kwargs.get('root', None)
+        self.__devtools = None
+        # Resolved values (installed, path, profiles, version), see refresh.
+        self.__cache = {}
 
     def __str__(self):
         '''Get the string representation of the browser.'''
@@ -58,27 +82,55 @@ class Browser:
         '''Compare the browser with another browser.'''
         return self.name == other.name and self.process == other.process
 
-    @property
-    def __history(self) -> Database:
+    def __database(self, path: str) -> 'Database':
         '''
-        Get the history database of the browser.
+        Get the history database of a browser profile.
 
+        Args:
+            path (str): The path of the profile.
         Raises:
             BrowserError: If the browser is not installed.
         Returns:
-            Database: The history database of the browser.
+            Database: The history database of the profile.
         '''
         if not self.installed:
             raise BrowserError('The browser is not installed.')
         file = 'History' if self.__chromium else 'places.sqlite'
-        path = os.path.join(self.path, file)
-        to_path = os.environ['TEMP'] if self.__os == 'win32' else '/tmp'
+        path = os.path.join(path, file)
+        if self.__root is not None:
+            # The root may come from another system, use the temporary folder of this one.
+            to_path = None
+        else:
+            to_path = os.environ['TEMP'] if self.__os == 'win32' else '/tmp'
+        from pybrinf.database import Database  # pylint: disable=import-outside-toplevel
         return Database(
             path=os.path.normpath(path),
             bypass=True,
             to=to_path,
+            browser=self.fullname,
         )
 
+    def __profile(self, profile: Union[str, Profile, None]) -> Profile:
+        '''
+        Resolve a profile from its name, its folder name or a Profile instance.
+
+        Args:
+            profile (str, Profile, None): The profile to resolve, None means the default path.
+        Raises:
+            BrowserError: If the profile could not be found.
+        Returns:
+            Profile: The resolved profile.
+        '''
+        if isinstance(profile, Profile):
+            return profile
+        if profile is None:
+            path = self.path
+            return Profile(self.fullname, os.path.basename(path), path, True)
+        for candidate in self.profiles():
+            if profile in (candidate.name, candidate.directory):
+                return candidate
+        raise BrowserError(f'The profile {profile} could not be found.')
+
     @ property
     def name(self) -> str:
         '''Get the name of the browser.'''
@@ -94,16 +146,43 @@ class Browser:
         '''Get the fullname of the browser.'''
         return self.__fullname
 
+    @ property
+    def chromium(self) -> bool:
+        '''Check if the browser is chromium based.'''
+        return bool(self.__chromium)
+
     @ property
     def version(self) -> str:
         '''
         Get the version of the browser.
 
+        Raises:
+            BrowserError: If the browser is not installed or cannot get the version.
+        '''
+        if 'version' not in self.__cache:
+            self.__cache['version'] = self.__version()
+        return self.__cache['version']
+
+    def __version(self) -> str:
+        '''
+        Get the version of the browser without using the cache.
+
         Raises:
             BrowserError: If the browser is not installed or cannot get the version.
         '''
         if not self.installed:
             raise BrowserError('The browser is not installed.')
+        try:
+            data_path = self.__user_data if self.__chromium else self.path
+        except (BrowserError, KeyError):
+            data_path = None
+        version = disk_version(self.app_path, self.__chromium, data_path)
+        if version:
+            return version
+        if self.__os == 'win32' and self.__chromium:
+            # chromium based browsers open a window instead of printing the version.
+            raise BrowserError('Error while getting the browser version.')
+        # Fallback, ask the browser binary.
         try:
             if self.__os == 'linux':
                 process = subprocess.Popen(
@@ -113,45 +192,61 @@ class Browser:
                     raise BrowserError(
                         'Error while getting the browser version.')
                 return output.decode('utf-8').split().pop().strip()
-            if not self.__chromium:
-                res = subprocess.check_output([self.app_path, '--version'])
-                return res.decode('utf-8').rsplit(' ', maxsplit=1)[-1]
-            # chromium based browsers for windows
-            path = self.app_path.split('\\')[:-1]
-            files = os.listdir('/'.join(path))
-            for file in files:
-                if re.match(r'\d+\.\d+\.\d+\.\d+', file):
-                    return file
+            res = subprocess.check_output([self.app_path, '--version'])
+            return res.decode('utf-8').rsplit(' ', maxsplit=1)[-1].strip()
         except Exception as exc:
             raise BrowserError(
                 'Unknown error while getting the browser version.') from exc
         return None
 
+    @property
+    def __local(self) -> str:
+        '''Get the local data path of the browser as defined in the browsers data.'''
+        base, path = self.__local_path.split('/', 1)
+        if self.__root is not None:
+            return os.path.normpath(os.path.join(self.__root, Utilities.ROOT_FOLDERS[base], path))
+        return os.path.join(os.environ[base], os.path.normpath(path))
+
+    @property
+    def __user_data(self) -> str:
+        '''Get the user data folder of a chromium based browser.'''
+        local = self.__local
+        return os.path.dirname(local) if os.path.basename(local) == 'Default' else local
+
     @property
     def path(self) -> str:
         '''
-        Get the full path of the browser.
+        Get the full path of the browser default profile.
 
         Raises:
             BrowserError: If the browser is not installed.
         '''
-        base, path = self.__local_path.split('/', 1)
-        path = os.path.join(os.environ[base], os.path.normpath(path))
-        if self.__chromium:
-            return path
-        # for now only firefox is supported
-        try:
-            with open(f'{path}/profiles.ini', 'r', encoding='utf-8') as file:
-                profile = file.readlines()[1].split('=')[1]
-                if self.__os == 'win32':
-                    profile = profile.split('/')[1].strip()
-                if self.__os == 'win32':
-                    path = os.path.join(path, 'Profiles')
-                path = os.path.join(path, profile.strip())
-        except Exception as exc:
-            raise BrowserError(
-                'Error while getting the profile path.') from exc
-        return path
+        if 'path' not in self.__cache:
+            if self.__chromium:
+                self.__cache['path'] = self.__local
+            else:
+                profiles = self.profiles()
+                if not profiles:
+                    raise BrowserError('Error while getting the profile path.')
+                self.__cache['path'] = profiles[0].path
+        return self.__cache['path']
+
+    def profiles(self) -> list[Profile]:
+        '''
+        Get all the profiles of the browser.
+        Chromium based browsers are read from Local State and Firefox from profiles.ini.
+
+        Raises:
+            BrowserError: If the profiles could not be read.
+        Returns:
+            list[Profile]: The profiles of the browser, the default one first.
+        '''
+        if 'profiles' not in self.__cache:
+            if self.__chromium:
+                self.__cache['profiles'] = chromium_profiles(self.__user_data, self.fullname)
+            else:
+                self.__cache['profiles'] = firefox_profiles(self.__local, self.fullname)
+        return list(self.__cache['profiles'])
 
     @property
     def app_path(self) -> str:
@@ -195,15 +290,57 @@ class Browser:
             raise BrowserError('Dev tools are only available for chromium based browsers. Sorry')
         self.__dev_tools = value
 
+    @property
+    def port(self) -> int:
+        '''
+            Get the remote debugging port of the browser.
+
+            Returns:
+                int: The port, 0 means a free port is picked when the browser is opened.
+        '''
+        return self.__port
+
+    @port.setter
+    def port(self, value: int) -> None:
+        '''
+            Set the remote debugging port of the browser.
+
+            Args:
+                value (int): The port to use, 0 picks a free port when the browser is opened.
+            Raises:
+                TypeError: If the value is not an integer.
+                ValueError: If the value is not a valid port.
+        '''
+        if not isinstance(value, int) or isinstance(value, bool):
+            raise TypeError('The port must be an integer.')
+        if not 0 <= value <= 65535:
+            raise ValueError('The port must be between 0 and 65535.')
+        if value != self.__port and self.__devtools is not None:
+            self.__devtools.close()
+            self.__devtools = None
+        self.__port = value
+
+    @property
+    def root(self) -> str:
+        '''Get the home directory the data is read from, None for the current user.'''
+        return self.__root
+
     @property
     def installed(self) -> bool:
         '''
         Check if the browser is installed.
+        With a root, the browser is installed if its data folder exists in the root.
+        The result is cached until refresh is called or the app path changes.
 
         Returns:
             bool: True if the browser is installed, False otherwise.
         '''
-        return os.path.exists(self.app_path)
+        if 'installed' not in self.__cache:
+            if self.__root is not None:
+                self.__cache['installed'] = os.path.exists(self.__local)
+            else:
+                self.__cache['installed'] = os.path.exists(self.app_path)
+        return self.__cache['installed']
 
     @property
     def running(self) -> bool:
@@ -213,9 +350,22 @@ class Browser:
         Returns:
             bool: True if the browser is running, False otherwise.
         '''
-        query = Utilities.SEARCH_PROCESS.format(self.process)
-        res = subprocess.check_output(query, stderr=subprocess.PIPE).decode()
-        return bool(re.search(self.name, res))
+        return bool(self.pids())
+
+    def pids(self, table: ProcessTable = None) -> list[int]:
+        '''
+        Get the process ids of the browser.
+
+        Args:
+            table (ProcessTable): A snapshot of the processes. Defaults to a new snapshot.
+        Raises:
+            SystemBrinfError: If the processes cannot be listed.
+        Returns:
+            list[int]: The process ids of the browser.
+        '''
+        table = table or ProcessTable.snapshot(self.__os)
+        names = process_names(self.__os, self.name, self.process, self.__app_path)
+        return table.pids(names, install_folders(self.__os, self.app_path))
 
     def set_app_path(self, path: str) -> None:
         '''
@@ -226,6 +376,7 @@ class Browser:
             path (str): The path to define.
         '''
         self.__app_path = path
+        self.refresh()
 
     def set_local_path(self, path: str) -> None:
         '''
@@ -236,6 +387,11 @@ class Browser:
             path (str): The path to define.
         '''
         self.__local_path = path
+        self.refresh()
+
+    def refresh(self) -> None:
+        '''Forget the resolved installed status, paths, profiles and version of the browser.'''
+        self.__cache.clear()
 
     def open(self) -> bool:
         '''
@@ -251,8 +407,11 @@ class Browser:
         if self.running:
             raise BrowserError('The browser is already running. Please close it first.')
         try:
-            args = [self.app_path, '--remote-debugging-port=9222'] if self.dev_tools \
-                else [self.app_path]
+            args = [self.app_path]
+            if self.dev_tools:
+                if self.port == 0:
+                    self.port = Utilities.free_port()
+                args.append(f'--remote-debugging-port={self.port}')
             subprocess.Popen(args)
             return True
         except Exception as exc:
@@ -279,19 +438,24 @@ class Browser:
             raise BrowserError('Error while opening the browser.') from exc
         return False
 
-    def session(self) -> Session:
+    def session(self, profile: Union[str, Profile] = None) -> 'Session':
         '''
         Get the last session of the browser.
+        Chromium based browsers read the SNSS files of the Sessions folder and Firefox
+        the sessionstore files, both are built into the same window and tab model.
 
+        Args:
+            profile (str, Profile): The profile to use. Defaults to the default profile.
         Raises:
-            BrowserError: If the browser is not installed or not supported.
+            BrowserError: If the browser is not installed.
+            SessionError: If the profile has no session folder.
         '''
         if not self.installed:
             raise BrowserError('The browser is not installed.')
-        if not self.__chromium:
-            raise BrowserError('Only chromium based browsers are supported.')
-        session = Session(self.path, self.fullname)
-        return session
+        # pylint: disable=import-outside-toplevel
+        from pybrinf.session import Session, FirefoxSession
+        session_class = Session if self.__chromium else FirefoxSession
+        return session_class(self.__profile(profile).path, self.fullname)
 
     def close(self) -> True:
         '''
@@ -304,11 +468,18 @@ class Browser:
         '''
         if not self.installed:
             raise BrowserError('The browser is not installed.')
-        query = Utilities.KILL_PROCESS.format(self.process)
         if self.__os == 'linux':
-            # only google chrome
-            process = self.name.lower() if self.name == 'Chrome' else self.process
-            query = f'pkill {process}'.split()
+            pids = self.pids()
+            for pid in pids:
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                except ProcessLookupError:
+                    continue
+                except OSError as exc:
+                    raise BrowserError(
+                        'Unknown error while closing the browser.') from exc
+            return bool(pids)
+        query = Utilities.KILL_PROCESS.format(self.process)
         try:
             with subprocess.Popen(query, stdout=subprocess.PIPE, stderr=subprocess.PIPE) as proc:
                 out, err = proc.communicate()
@@ -317,6 +488,35 @@ class Browser:
             raise BrowserError(
                 'Unknown error while closing the browser.') from exc
 
+    def iter_downloads(self, **kwargs):
+        '''
+        Iterate over the downloaded items of the browser, reading them in chunks.
+
+        Args:
+            limit (int): The limit of the items to get.
+            offset (int): The offset of the items to get.
+            profile (str, Profile): The profile to use. Defaults to the default profile.
+        Raises:
+            BrowserError: If the browser is not installed.
+        Yields:
+            Downloaded: The downloaded items.
+        '''
+        if not self.installed:
+            raise BrowserError('The browser is not installed.')
+        profile = self.__profile(kwargs.get('profile'))
+        db_history = self.__database(profile.path)
+        db_history.connect()
+        try:
+            for rows in db_history.chunks(Utilities.download_query(self.__chromium, **kwargs)):
+                with stage(self.fullname, 'build') as timer:
+                    items = [Downloaded(self.fullname, *row) for row in rows]
+                    for item in items:
+                        item.profile = profile.directory
+                    timer.count(objects=len(items))
+                yield from items
+        finally:
+            db_history.close()
+
     def downloads(self, **kwargs) -> list[Downloaded]:
         '''
         Get the list of downloaded items from the browser.
@@ -324,20 +524,42 @@ class Browser:
         Args:
             limit (int): The limit of the items to get. Default is 10.
             offset (int): The offset of the items to get. Default is 0.
+            profile (str, Profile): The profile to use. Defaults to the default profile.
         Raises:
             BrowserError: If the browser is not installed.
         Returns:
             list(Downloaded): The list of downloaded items.
         '''
+        return list(self.iter_downloads(**kwargs))
+
+    def iter_history(self, **kwargs):
+        '''
+        Iterate over the history items of the browser, reading them in chunks.
+
+        Args:
+            limit (int): The limit of the items to get.
+            offset (int): The offset of the items to get.
+            profile (str, Profile): The profile to use. Defaults to the default profile.
+        Raises:
+            BrowserError: If the browser is not installed.
+        Yields:
+            History: The history items.
+        '''
         if not self.installed:
             raise BrowserError('The browser is not installed.')
-        db_history = self.__history
+        profile = self.__profile(kwargs.get('profile'))
+        db_history = self.__database(profile.path)
         db_history.connect()
-        res = db_history.execute(
-            Utilities.download_query(self.__chromium, **kwargs))
-        downloads = [Downloaded(self.fullname, *download) for download in res]
-        db_history.close()
-        return downloads
+        try:
+            for rows in db_history.chunks(Utilities.website_query(self.__chromium, **kwargs)):
+                with stage(self.fullname, 'build') as timer:
+                    items = [History(self.fullname, *row) for row in rows]
+                    for item in items:
+                        item.profile = profile.directory
+                    timer.count(objects=len(items))
+                yield from items
+        finally:
+            db_history.close()
 
     def history(self, **kwargs) -> list[History]:
         '''
@@ -346,27 +568,172 @@ class Browser:
         Args:
             limit (int): The limit of the items to get.
             offset (int): The offset of the items to get.
+            profile (str, Profile): The profile to use. Defaults to the default profile.
         Raises:
             BrowserError: If the browser is not installed.
         Returns:
             list: The history of the browser.
         '''
+        return list(self.iter_history(**kwargs))
+
+    def iter_bookmarks(self, **kwargs):
+        '''
+        Iterate over the bookmarks of the browser, in the order of the bookmark tree.
+        Chromium based browsers read the Bookmarks file, which is only parsed again when it
+        changes, and Firefox reads places.sqlite in chunks.
+
+        Args:
+            limit (int): The limit of the items to get.
+            offset (int): The offset of the items to get.
+            profile (str, Profile): The profile to use. Defaults to the default profile.
+        Raises:
+            BrowserError: If the browser is not installed or the bookmarks cannot be read.
+        Yields:
+            Bookmark: The bookmarks, the folder attribute is the path of their folder.
+        '''
+        if not self.installed:
+            raise BrowserError('The browser is not installed.')
+        profile = self.__profile(kwargs.get('profile'))
+        if self.__chromium:
+            path = os.path.join(profile.path, 'Bookmarks')
+            if not os.path.exists(path):
+                # The profile has never had a bookmark.
+                return
+            from pybrinf.bookmarks import CACHE  # pylint: disable=import-outside-toplevel
+            offset = kwargs.get('offset') or 0
+            limit = kwargs.get('limit') or None
+            bookmarks = islice(CACHE.get(path, self.fullname), offset,
+                               None if limit is None else offset + limit)
+            chunks = iter(lambda: list(islice(bookmarks, 1000)), [])
+            database = None
+        else:
+            database = self.__database(profile.path)
+            database.connect()
+            chunks = database.chunks(Utilities.bookmark_query(**kwargs))
+        try:
+            for rows in chunks:
+                with stage(self.fullname, 'build') as timer:
+                    items = [Bookmark(self.fullname, *row) for row in rows]
+                    for item in items:
+                        item.profile = profile.directory
+                    timer.count(objects=len(items))
+                yield from items
+        finally:
+            if database is not None:
+                database.close()
+
+    def bookmarks(self, **kwargs) -> list[Bookmark]:
+        '''
+        Get the list of bookmarks from the browser.
+
+        Args:
+            limit (int): The limit of the items to get.
+            offset (int): The offset of the items to get.
+            profile (str, Profile): The profile to use. Defaults to the default profile.
+        Raises:
+            BrowserError: If the browser is not installed or the bookmarks cannot be read.
+        Returns:
+            list(Bookmark): The bookmarks of the browser.
+        '''
+        return list(self.iter_bookmarks(**kwargs))
+
+    def iter_search_terms(self, **kwargs):
+        '''
+        Iterate over the search terms of the browser with their frequency and recency.
+        The aggregates are computed by SQLite on the copy of the database and read in chunks.
+        Chromium counts the visits of the search results pages of keyword_search_terms and
+        Firefox the use count (which decays over time) of the moz_inputhistory inputs.
+
+        Args:
+            period (str): None for totals over all time, day or week for the top terms
+                of every period, newest period first.
+            top (int): The number of terms to get, of every period if there is one.
+                Defaults to all the terms, or 10 by period.
+            since (datetime): The oldest search to count.
+            limit (int): The limit of the items to get.
+            offset (int): The offset of the items to get.
+            profile (str, Profile): The profile to use. Defaults to the default profile.
+        Raises:
+            BrowserError: If the browser is not installed or the period is unknown.
+        Yields:
+            SearchTerm: The search terms, most used first.
+        '''
         if not self.installed:
             raise BrowserError('The browser is not installed.')
-        db_history = self.__history
+        query = Utilities.search_query(self.__chromium, **kwargs)
+        profile = self.__profile(kwargs.get('profile'))
+        db_history = self.__database(profile.path)
         db_history.connect()
-        result = db_history.execute(
-            Utilities.website_query(self.__chromium, **kwargs))
-        history = [History(self.fullname, *history) for history in result]
-        db_history.close()
-        return history
+        try:
+            for rows in db_history.chunks(query):
+                with stage(self.fullname, 'build') as timer:
+                    items = [SearchTerm(self.fullname, *row) for row in rows]
+                    for item in items:
+                        item.profile = profile.directory
+                    timer.count(objects=len(items))
+                yield from items
+        finally:
+            db_history.close()
+
+    def search_terms(self, **kwargs) -> list[SearchTerm]:
+        '''
+        Get the list of search terms from the browser, see iter_search_terms.
+
+        Args:
+            period (str): None for totals over all time, day or week for the top terms
+                of every period.
+            top (int): The number of terms to get, of every period if there is one.
+            since (datetime): The oldest search to count.
+            profile (str, Profile): The profile to use. Defaults to the default profile.
+        Raises:
+            BrowserError: If the browser is not installed or the period is unknown.
+        Returns:
+            list(SearchTerm): The search terms.
+        '''
+        return list(self.iter_search_terms(**kwargs))
 
-    def tabs(self) -> list[Tab]:
+    def extract(self, kind: str, profiles: list = None, workers: int = None, **kwargs) -> list:
+        '''
+        Get the history, downloads or bookmarks of several profiles concurrently.
+        Every item is tagged with the folder name of its profile in the profile attribute.
+
+        Args:
+            kind (str): The data to extract, history, downloads or bookmarks.
+            profiles (list of str or Profile): The profiles to use. Defaults to all profiles.
+            workers (int): The maximum number of threads. Defaults to one per profile.
+            **kwargs: The arguments of the history, downloads or bookmarks method.
+        Raises:
+            BrowserError: If the browser is not installed or the data kind is not supported.
+        Returns:
+            list: The items of all the profiles.
+        '''
+        extractors = {'history': self.history, 'downloads': self.downloads,
+                      'bookmarks': self.bookmarks}
+        if kind not in extractors:
+            raise BrowserError(f'Cannot extract {kind} from the browser.')
+        if not self.installed:
+            raise BrowserError('The browser is not installed.')
+        targets = self.profiles() if profiles is None else \
+            [self.__profile(profile) for profile in profiles]
+        if not targets:
+            return []
+        kwargs.pop('profile', None)
+        extractor = bind(extractors[kind])
+        with ThreadPoolExecutor(max_workers=workers or len(targets)) as executor:
+            futures = [executor.submit(extractor, profile=profile, **kwargs)
+                       for profile in targets]
+            return [item for future in futures for item in future.result()]
+
+    def tabs(self, timeout: float = None, fields: tuple = Tab.DEFAULT_FIELDS) -> list[Tab]:
         '''
         Get the list of tabs from the browser in dev tools mode.
 
+        Args:
+            timeout (float): The timeout of this DevTools request in seconds.
+                Defaults to the timeout of the client.
+            fields (tuple of str): The Tab attributes to keep. Defaults to Tab.DEFAULT_FIELDS.
         Raises:
-            BrowserError: If the browser is not installed or not supported.
+            BrowserError: If the browser is not installed, not supported or a field is unknown.
         Returns:
             list: The list of tabs.
         '''
@@ -376,13 +743,36 @@ class Browser:
             raise BrowserError('Only chromium based browsers are supported.')
         if not self.dev_tools:
             raise BrowserError('The browser is not in dev tools mode. Please enable it.')
-        tabs = []
+        unknown = set(fields) - set(Tab.FIELDS)
+        if unknown:
+            raise BrowserError(f'Unknown tab fields: {", ".join(sorted(unknown))}')
         try:
-            response = urllib.request.urlopen('http://localhost:9222/json')
-            data = json.loads(response.read())
-            for tab_data in data:
-                if tab_data['type'] == 'page':
-                    tabs.append(Tab(browser=self.fullname, **tab_data))
+            client = self.devtools()
+            with stage(self.fullname, 'tabs') as timer:
+                data = client.targets(timeout)
+                tabs = [Tab.from_json(self.fullname, tab_data, fields)
+                        for tab_data in data if tab_data.get('type') == 'page']
+                timer.count(objects=len(tabs))
             return tabs
         except Exception as exc:
             raise BrowserError('Error while getting the tabs.') from exc
+
+    def devtools(self) -> 'DevTools':
+        '''
+        Get the DevTools client of the browser.
+        The client keeps its connection open between calls, call watch on it to keep
+        a live table of tabs updated from the browser events.
+
+        Raises:
+            BrowserError: If the browser is not in dev tools mode or has no port yet.
+        Returns:
+            DevTools: The DevTools client.
+        '''
+        if not self.dev_tools:
+            raise BrowserError('The browser is not in dev tools mode. Please enable it.')
+        if self.port == 0:
+            raise BrowserError('The dev tools port is assigned when the browser is opened.')
+        if self.__devtools is None:
+            from pybrinf.devtools import DevTools  # pylint: disable=import-outside-toplevel
+            self.__devtools = DevTools('localhost', self.port)
+        return self.__devtools
@@ -1,11 +1,21 @@
 '''
-This file contains all browser necessary data.
+This file contains all browser necessary data and the registry to look it up.
 NOTE:
     Windows supports all browsers.
     Linux only supports Chrome and Firefox.
     MacOS not supported yet.
+Docstrings are written in Google style.
 '''
 
+import os
+import json
+import threading
+
+from pybrinf.exceptions import BrowserError
+
+# Keys every browser definition must have.
+REQUIRED_KEYS = ('name', 'fullname', 'process', 'chromium', 'app_path', 'local_path', 'os_support')
+
 BROWSERS = [
     {
         'name': 'Chrome',
@@ -15,6 +25,7 @@ BROWSERS = [
             'linux': 'google-chrome'
         },
         'progid': 'ChromeHTML',
+        'desktop': 'google-chrome',
         'chromium': True,
         'app_path': {
             'win32': 'ProgramFiles/Google/Chrome/Application/chrome.exe',
@@ -33,7 +44,8 @@ BROWSERS = [
             'win32': 'firefox.exe',
             'linux': 'firefox'
         },
-        'progid': 'FirefoxHTML',
+        'progid': ['FirefoxHTML', 'FirefoxURL'],
+        'desktop': 'firefox',
         'chromium': False,
         'app_path': {
             'win32': 'ProgramFiles/Mozilla Firefox/firefox.exe',
@@ -52,7 +64,8 @@ BROWSERS = [
             'win32': 'msedge.exe',
             'linux': 'msedge'
         },
-        'progid': 'EdgeHTML',
+        'progid': ['MSEdgeHTM', 'EdgeHTML'],
+        'desktop': 'microsoft-edge',
         'chromium': True,
         'app_path': {
             'win32': 'ProgramFiles(x86)/Microsoft/Edge/Application/msedge.exe',
@@ -73,6 +86,7 @@ BROWSERS = [
         },
         'chromium': True,
         'progid': 'YandexHTML',
+        'desktop': 'yandex-browser',
         'app_path': {
             'win32': 'LOCALAPPDATA/Yandex/YandexBrowser/Application/browser.exe',
             'linux': 'HOME/usr/bin/yandex-browser'
@@ -91,7 +105,8 @@ BROWSERS = [
             'linux': 'opera'
         },
         'chromium': True,
-        'progid': 'OperaHTML',
+        'progid': ['OperaStable', 'OperaHTML'],
+        'desktop': 'opera',
         'app_path': {
             'win32': 'LOCALAPPDATA/Programs/Opera/launcher.exe',
             'linux': 'HOME/usr/bin/opera'
@@ -111,6 +126,7 @@ BROWSERS = [
         },
         'chromium': True,
         'progid': 'BraveHTML',
+        'desktop': 'brave-browser',
         'app_path': {
             'win32': 'ProgramFiles/BraveSoftware/Brave-Browser/Application/brave.exe',
             'linux': 'HOME/usr/bin/brave-browser'
@@ -129,7 +145,8 @@ BROWSERS = [
             'linux': 'vivaldi'
         },
         'chromium': True,
-        'progid': 'VivaldiHTML',
+        'progid': ['VivaldiHTM', 'VivaldiHTML'],
+        'desktop': 'vivaldi',
         'app_path': {
             'win32': 'LOCALAPPDATA/Vivaldi/Application/vivaldi.exe',
             'linux': 'HOME/usr/bin/vivaldi'
@@ -141,3 +158,200 @@ BROWSERS = [
         'os_support': ['win32']
     }
 ]
+
+
+def _keys(value) -> list[str]:
+    '''Get the lowercase lookup keys of a definition value (str, list or dict by os).'''
+    if isinstance(value, dict):
+        value = list(value.values())
+    elif not isinstance(value, (list, tuple)):
+        value = [value]
+    return [item.lower() for item in value if isinstance(item, str) and item]
+
+
+class Registry:
+    '''
+        Registry of the supported browsers.
+        Definitions are indexed by name, progid, process and desktop file, so every
+        lookup is a dictionary access. New definitions can be registered at runtime or
+        loaded from a JSON file, e.g. chromium forks or custom install roots.
+    '''
+
+    def __init__(self, browsers: list[dict]):
+        '''
+        Initialize the Registry instance.
+
+        Args:
+            browsers (list of dict): The browser definitions. The list is kept and
+                updated in place, so it always holds the registered browsers.
+        '''
+        self.__browsers = browsers
+        self.__lock = threading.Lock()
+        self.__indexes = {}
+        self.__reindex()
+
+    def __reindex(self) -> None:
+        '''Build the lookup indexes from the definitions.'''
+        indexes = {'name': {}, 'progid': {}, 'process': {}, 'desktop': {}}
+        for data in self.__browsers:
+            indexes['name'][data['name'].lower()] = data
+            for key in ('progid', 'process', 'desktop'):
+                for value in _keys(data.get(key)):
+                    indexes[key].setdefault(value, data)
+            for path in _keys(data.get('app_path')):
+                indexes['process'].setdefault(os.path.basename(path), data)
+        # Linux binaries are often named after the browser, e.g. chrome, with the lowest priority.
+        for data in self.__browsers:
+            indexes['process'].setdefault(data['name'].lower(), data)
+        self.__indexes = indexes
+
+    def __iter__(self):
+        '''Iterate over the browser definitions.'''
+        return iter(list(self.__browsers))
+
+    def __len__(self) -> int:
+        '''Get the number of registered browsers.'''
+        return len(self.__browsers)
+
+    def __contains__(self, name: str) -> bool:
+        '''Check if a browser is registered.'''
+        return name.lower() in self.__indexes['name']
+
+    @property
+    def names(self) -> list[str]:
+        '''Get the lowercase names of the registered browsers.'''
+        return list(self.__indexes['name'])
+
+    def get(self, name: str) -> dict:
+        '''
+        Get a browser definition by name.
+
+        Args:
+            name (str): The name of the browser, case insensitive.
+        Returns:
+            dict: The definition or None if the browser is not registered.
+        '''
+        return self.__indexes['name'].get(name.lower())
+
+    def by_progid(self, progid: str) -> dict:
+        '''
+        Get a browser definition by its Windows progid.
+        Suffixes such as FirefoxURL-308046B0AF4A39CB or VivaldiHTM.XXXX are ignored.
+
+        Args:
+            progid (str): The progid.
+        Returns:
+            dict: The definition or None if no browser has this progid.
+        '''
+        progid = progid.lower()
+        index = self.__indexes['progid']
+        return index.get(progid) or index.get(progid.split('-', 1)[0].split('.', 1)[0])
+
+    def by_process(self, process: str) -> dict:
+        '''
+        Get a browser definition by its process or executable name.
+
+        Args:
+            process (str): The process name.
+        Returns:
+            dict: The definition or None if no browser runs with this process.
+        '''
+        return self.__indexes['process'].get(process.lower())
+
+    def by_desktop(self, desktop: str) -> dict:
+        '''
+        Get a browser definition by its Linux desktop file, e.g. google-chrome.desktop.
+
+        Args:
+            desktop (str): The desktop file name.
+        Returns:
+            dict: The definition or None if no browser has this desktop file.
+        '''
+        desktop = desktop.lower().strip()
+        if desktop.endswith('.desktop'):
+            desktop = desktop[:-len('.desktop')]
+        return (self.__indexes['desktop'].get(desktop)
+                or self.__indexes['process'].get(desktop)
+                or self.__indexes['name'].get(desktop))
+
+    def register(self, data: dict, replace: bool = False) -> dict:
+        '''
+        Register a browser definition.
+        A definition with an extends key copies the named browser and overrides
+        its values, per system for the app_path, local_path and process keys.
+
+        Args:
+            data (dict): The browser definition.
+            replace (bool): Replace a browser with the same name. Defaults to False.
+        Raises:
+            BrowserError: If the definition is invalid or the browser already exists.
+        Returns:
+            dict: The registered definition.
+        '''
+        data = dict(data)
+        if 'extends' in data:
+            base = self.get(data.pop('extends'))
+            if base is None:
+                raise BrowserError(f'Cannot extend an unknown browser in {data.get("name")}.')
+            merged = dict(base)
+            for key, value in data.items():
+                if isinstance(value, dict) and isinstance(base.get(key), dict):
+                    value = {**base[key], **value}
+                merged[key] = value
+            data = merged
+        missing = [key for key in REQUIRED_KEYS if key not in data]
+        if missing:
+            raise BrowserError(f'The browser definition lacks {", ".join(missing)}.')
+        with self.__lock:
+            current = self.get(data['name'])
+            if current is not None and not replace:
+                raise BrowserError(f'The browser {data["name"]} is already registered.')
+            if current is not None:
+                self.__browsers[self.__browsers.index(current)] = data
+            else:
+                self.__browsers.append(data)
+            self.__reindex()
+        return data
+
+    def unregister(self, name: str) -> None:
+        '''
+        Remove a browser definition.
+
+        Args:
+            name (str): The name of the browser.
+        Raises:
+            BrowserError: If the browser is not registered.
+        '''
+        with self.__lock:
+            data = self.get(name)
+            if data is None:
+                raise BrowserError(f'The browser {name} is not registered.')
+            self.__browsers.remove(data)
+            self.__reindex()
+
+    def load(self, path: str, replace: bool = False) -> list[dict]:
+        '''
+        Register the browser definitions of a JSON file.
+        The file holds a list of definitions or an object with a browsers list.
+
+        Args:
+            path (str): The path of the JSON file.
+            replace (bool): Replace browsers with the same name. Defaults to False.
+        Raises:
+            BrowserError: If the file cannot be read or a definition is invalid.
+        Returns:
+            list[dict]: The registered definitions.
+        '''
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                browsers = json.load(file)
+        except (OSError, ValueError) as exc:
+            raise BrowserError(f'Error while reading the browsers file {path}.') from exc
+        if isinstance(browsers, dict):
+            browsers = browsers.get('browsers', [])
+        if not isinstance(browsers, list):
+            raise BrowserError(f'The browsers file {path} must hold a list of browsers.')
+        return [self.register(data, replace) for data in browsers]
+
+
+REGISTRY = Registry(BROWSERS)
@@ -0,0 +1,399 @@
+'''
+CLI implementation for PyBrinf.
+This module is the command line interface run by python -m pybrinf. Items are streamed
+to stdout as NDJSON or CSV while they are read, so the output can be piped.
+Docstrings are written in Google style.
+
+Usage:
+    python -m pybrinf history --since 2024-01-01 --limit 100 > history.ndjson
+    python -m pybrinf downloads --browser chrome --format csv
+    python -m pybrinf bookmarks --profile Default
+    python -m pybrinf search_terms --period week --top 10
+    python -m pybrinf tabs --port 9222
+    python -m pybrinf sessions --browser chrome --workers 4
+    python -m pybrinf export history history.parquet --workers 4
+    python -m pybrinf bench --synthetic 100000
+'''
+
+import os
+import sys
+import queue
+import argparse
+import tempfile
+import threading
+import functools
+from typing import TYPE_CHECKING
+from datetime import datetime
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+
+from pybrinf.browser import Browser
+from pybrinf.file import CHUNK_SIZE, Exporter
+from pybrinf.stats import Stats, bind
+from pybrinf.exceptions import (
+    BrinfError, BrowserError, DatabaseError, FileError, ParserError, SessionError,
+    SystemBrinfError,
+)
+
+# pybrinf.__main__ runs this module, so Brinf is only imported when a command builds it.
+if TYPE_CHECKING:
+    from pybrinf.__main__ import Brinf
+
+ERRORS = (BrinfError, BrowserError, DatabaseError, FileError, ParserError, SessionError,
+          SystemBrinfError)
+KINDS = ('history', 'downloads', 'bookmarks', 'search_terms', 'tabs', 'sessions')
+# Items handed from a worker thread to the writer at once.
+CHUNK_SIZE = 500
+DONE = object()
+
+
+def parse_date(value: str) -> datetime:
+    '''
+    Parse the date of the since flag.
+
+    Args:
+        value (str): An ISO date or date and time, e.g. 2024-01-31 or 2024-01-31T12:00.
+    Raises:
+        ArgumentTypeError: If the value is not an ISO date.
+    Returns:
+        datetime: The date.
+    '''
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f'invalid ISO date: {value}') from exc
+
+
+def merged(sources: list, workers: int = None):
+    '''
+    Iterate over the items of several sources, reading them concurrently.
+    With one worker the sources are read in order, otherwise the items of the sources
+    are yielded in chunks as soon as a worker reads them.
+
+    Args:
+        sources (list of callable): The functions returning the iterables to read.
+        workers (int): The maximum number of threads. Defaults to one.
+    Yields:
+        object: The items of the sources.
+    '''
+    if not workers or workers < 2 or len(sources) < 2:
+        for source in sources:
+            yield from source()
+        return
+    chunks = queue.Queue(maxsize=workers * 2)
+    stop = threading.Event()
+
+    def produce(source):
+        iterator = None
+        try:
+            iterator = iter(source())
+            while not stop.is_set():
+                chunk = list(islice(iterator, CHUNK_SIZE))
+                if not chunk:
+                    break
+                chunks.put(chunk)
+        except Exception as exc:  # pylint: disable=broad-except
+            chunks.put(exc)
+        finally:
+            if hasattr(iterator, 'close'):
+                iterator.close()
+            chunks.put(DONE)
+
+    executor = ThreadPoolExecutor(max_workers=workers)
+    for source in sources:
+        executor.submit(bind(produce), source)
+    pending = len(sources)
+    try:
+        while pending:
+            chunk = chunks.get()
+            if chunk is DONE:
+                pending -= 1
+            elif isinstance(chunk, Exception):
+                raise chunk
+            else:
+                yield from chunk
+    finally:
+        # Unblock and finish the workers when the reader stops early.
+        stop.set()
+        while pending:
+            if chunks.get() is DONE:
+                pending -= 1
+        executor.shutdown()
+
+
+def limited(iterable, limit: int = None):
+    '''
+    Iterate over at most limit items, closing the iterable when done.
+
+    Args:
+        iterable (iterable): The items.
+        limit (int): The maximum number of items. Defaults to all.
+    Yields:
+        object: The items.
+    '''
+    try:
+        yield from islice(iterable, limit)
+    finally:
+        if hasattr(iterable, 'close'):
+            iterable.close()
+
+
+def select(brinf: 'Brinf', names: list[str]) -> list[Browser]:
+    '''
+    Get the browsers of the browser flags.
+
+    Args:
+        brinf (Brinf): The initialized Brinf instance.
+        names (list of str): The browser names, None for all the installed browsers.
+    Raises:
+        BrowserError: If a browser is not supported or not installed.
+    Returns:
+        list[Browser]: The browsers.
+    '''
+    if not names:
+        return brinf.installed_browsers()
+    browsers = []
+    for name in names:
+        browser = brinf.browser(name)
+        if not browser.installed:
+            raise BrowserError(f'The browser {name} is not installed.')
+        browsers.append(browser)
+    return browsers
+
+
+def profiles(browser: Browser, names: list[str]) -> list:
+    '''
+    Get the profiles of a browser matching the profile flags.
+
+    Args:
+        browser (Browser): The browser.
+        names (list of str): The profile names or folder names, None for all the profiles.
+    Returns:
+        list[Profile]: The profiles.
+    '''
+    try:
+        found = browser.profiles()
+    except BrowserError:
+        return []
+    if not names:
+        return found
+    return [profile for profile in found if profile.name in names or profile.directory in names]
+
+
+def warn(message: str) -> None:
+    '''Write a message to stderr.'''
+    sys.stderr.write(f'pybrinf: {message}\n')
+
+
+def guarded(source, label: str, errors: list):
+    '''
+    Read a source, reporting its error to stderr instead of stopping the other sources.
+
+    Args:
+        source (callable): The function returning the iterable to read.
+        label (str): The name of the source in the error message.
+        errors (list): The list the errors are added to.
+    Yields:
+        object: The items of the source.
+    '''
+    try:
+        yield from source()
+    except ERRORS as exc:
+        errors.append(exc)
+        warn(f'{label}: {exc}')
+
+
+def items(brinf: 'Brinf', args: argparse.Namespace, errors: list):
+    '''
+    Get the items of a command.
+
+    Args:
+        brinf (Brinf): The initialized Brinf instance.
+        args (Namespace): The parsed arguments, the kind is the command or the export kind.
+        errors (list): The list the errors of the browsers and profiles are added to.
+    Raises:
+        BrowserError: If a browser is not supported or not installed.
+    Returns:
+        iterable: The items.
+    '''
+    browsers = select(brinf, args.browser)
+    if args.kind == 'tabs':
+        for browser in browsers:
+            if browser.chromium:
+                browser.dev_tools = True
+                if args.port is not None:
+                    browser.port = args.port
+        return limited(brinf.all_tabs(timeout=args.timeout), args.limit)
+    sources = []
+    for browser in browsers:
+        for profile in profiles(browser, args.profile):
+            label = f'{browser.fullname} {profile.directory}'
+            if args.kind == 'sessions':
+                source = functools.partial(session_rows, browser, profile, args.workers)
+            elif args.kind == 'search_terms':
+                source = functools.partial(
+                    browser.iter_search_terms, profile=profile, limit=args.limit,
+                    since=args.since, period=args.period, top=args.top)
+            else:
+                source = functools.partial(
+                    getattr(browser, f'iter_{args.kind}'), profile=profile,
+                    limit=args.limit, since=args.since)
+            sources.append(functools.partial(guarded, source, label, errors))
+    return limited(merged(sources, args.workers), args.limit)
+
+
+def session_rows(browser: Browser, profile, workers: int):
+    '''
+    Get the tabs of every session file of a profile.
+
+    Yields:
+        SessionTab: The tabs, tagged with their profile and file.
+    '''
+    files, _ = browser.session(profile).all_sessions(workers)
+    for file, tabs in files.items():
+        for tab in tabs:
+            row = tab.to_dict()
+            row['profile'] = profile.directory
+            row['file'] = file
+            yield row
+
+
+def write(args: argparse.Namespace, output, path: str = None) -> int:
+    '''
+    Write the items of a command to a file or to the output.
+
+    Args:
+        args (Namespace): The parsed arguments.
+        output (BufferedIOBase): The binary stream of the output.
+        path (str): The path of the file, None to write to the output.
+    Raises:
+        FileError: If the file cannot be written.
+    Returns:
+        int: The exit code, 1 if a browser or profile failed.
+    '''
+    from pybrinf.__main__ import Brinf  # pylint: disable=import-outside-toplevel
+    brinf = Brinf(root=args.root)
+    brinf.init()
+    errors = []
+    rows = items(brinf, args, errors)
+    try:
+        options = {'fmt': args.format, 'chunk_size': args.chunk_size}
+        if path is None:
+            options['stream'] = output
+            path = '-'
+        else:
+            options.update(compression=args.compression, overwrite=args.overwrite)
+        with Exporter(path, **options) as exporter:
+            exporter.write(rows)
+    finally:
+        rows.close()
+    return 1 if errors else 0
+
+
+def bench(args: argparse.Namespace, output) -> int:
+    '''
+    Read the history, downloads, bookmarks and sessions of every browser and write the time and
+    counters of every stage, see pybrinf.stats.
+
+    Args:
+        args (Namespace): The parsed arguments.
+        output (BufferedIOBase): The binary stream of the output.
+    Returns:
+        int: The exit code, 1 if a browser or profile failed.
+    '''
+    from pybrinf.__main__ import Brinf  # pylint: disable=import-outside-toplevel
+    with tempfile.TemporaryDirectory(prefix='pybrinf-bench-') as folder:
+        if args.synthetic:
+            from pybrinf.testing import make_home  # pylint: disable=import-outside-toplevel
+            make_home(folder, rows=args.synthetic, downloads=args.synthetic // 10,
+                      tabs=args.tabs)
+            args.root = folder
+        brinf = Brinf(root=args.root)
+        brinf.init()
+        errors = []
+        lines = []
+        with Stats() as stats:
+            for kind in ('history', 'downloads', 'bookmarks', 'sessions'):
+                args.kind = kind
+                rows = items(brinf, args, errors)
+                lines.append(f'{kind}: {sum(1 for _ in rows)} items')
+        lines += ['', stats.report(), '', f'total: {stats.total():.4f}s']
+    output.write(('\n'.join(lines) + '\n').encode('utf-8'))
+    output.flush()
+    return 1 if errors else 0
+
+
+def parser() -> argparse.ArgumentParser:
+    '''Get the parser of the command line arguments.'''
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--browser', action='append',
+                        help='browser to read, repeat for several (default: all installed)')
+    common.add_argument('--profile', action='append',
+                        help='profile name or folder to read, repeat for several (default: all)')
+    common.add_argument('--root', help='home directory to read instead of the current user one')
+    common.add_argument('--workers', type=int, default=1,
+                        help='profiles read concurrently (default: 1)')
+    output = argparse.ArgumentParser(add_help=False)
+    output.add_argument('--limit', type=int, help='maximum number of items')
+    output.add_argument('--since', type=parse_date,
+                        help='oldest visit or download to read, ISO date (UTC)')
+    output.add_argument('--period', choices=('day', 'week'),
+                        help='top search terms of every day or week (search_terms)')
+    output.add_argument('--top', type=int, help='search terms of every period (search_terms)')
+    output.add_argument('--port', type=int, help='remote debugging port of the browsers (tabs)')
+    output.add_argument('--timeout', type=float, default=2.0,
+                        help='seconds to wait for the browsers (tabs, default: 2)')
+    output.add_argument('--chunk-size', type=int, default=CHUNK_SIZE,
+                        help=f'items written at once (default: {CHUNK_SIZE})')
+
+    main_parser = argparse.ArgumentParser(
+        prog='pybrinf', description='Read the history, downloads, bookmarks, search terms, '
+                                    'tabs and sessions of the installed browsers.')
+    commands = main_parser.add_subparsers(dest='command', required=True)
+    for kind in KINDS:
+        command = commands.add_parser(
+            kind, parents=[common, output], help=f'write the {kind} to stdout')
+        command.add_argument('--format', choices=('ndjson', 'csv'), default='ndjson',
+                             help='output format (default: ndjson)')
+        command.set_defaults(kind=kind)
+    export = commands.add_parser('export', parents=[common, output],
+                                 help='write the items to a file')
+    export.add_argument('kind', choices=KINDS, help='items to export')
+    export.add_argument('path', help='file to write, the extension selects the format')
+    export.add_argument('--format', help='format, one of pybrinf.file.WRITERS or columnar')
+    export.add_argument('--compression', choices=('gzip', 'zstd'), help='compression')
+    export.add_argument('--overwrite', action='store_true', help='replace the file')
+    command = commands.add_parser('bench', parents=[common],
+                                  help='time every stage of the extraction')
+    command.add_argument('--synthetic', type=int, metavar='ROWS',
+                         help='read a synthetic home directory with ROWS history rows per profile')
+    command.add_argument('--tabs', type=int, default=100,
+                         help='tabs of the synthetic session files (default: 100)')
+    command.set_defaults(limit=None, since=None)
+    return main_parser
+
+
+def main(argv: list[str] = None, output=None) -> int:
+    '''
+    Run the command line interface.
+
+    Args:
+        argv (list of str): The command line arguments. Defaults to sys.argv.
+        output (BufferedIOBase): The binary stream of the output. Defaults to stdout.
+    Returns:
+        int: The exit code.
+    '''
+    args = parser().parse_args(argv)
+    output = output or sys.stdout.buffer
+    try:
+        if args.command == 'bench':
+            return bench(args, output)
+        return write(args, output, args.path if args.command == 'export' else None)
+    except ERRORS as exc:
+        warn(str(exc))
+        return 1
+    except BrokenPipeError:
+        # The reader closed the pipe, e.g. head, stop quietly.
+        if output is sys.stdout.buffer:
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
@@ -0,0 +1,436 @@
+'''
+Columnar implementation for PyBrinf.
+This module contains the columnar export backends of pybrinf.file: Arrow IPC and
+Parquet when pyarrow is installed, and a small stdlib columnar format otherwise.
+Docstrings are written in Google style.
+
+The stdlib format (.pbc) is a magic header followed by record batches:
+
+    batch:  rows (uint32) columns (uint16) column...
+    column: name length (uint16) name (utf-8) type (uint8) sections (uint8) section...
+    section: length (uint64) bytes
+
+Every column starts with a validity bitmap section (bit set = value present). Integers,
+booleans, floats and timestamps (int64 microseconds since the Unix epoch, UTC) are
+stored as little endian arrays. Strings are int64 offsets plus a utf-8 blob, and
+dictionary columns (hosts, browsers, profiles) are a string dictionary plus int32 indices.
+The type is stored in every batch, a column is a string column until its first value.
+'''
+
+import os
+import sys
+import json
+import struct
+import urllib.parse
+from array import array
+from datetime import datetime, timezone
+
+from pybrinf.exceptions import FileError
+
+MAGIC = b'PBCOL1\x00\x00'
+BATCH = struct.Struct('<IH')
+NAME = struct.Struct('<H')
+COLUMN = struct.Struct('<BB')
+SECTION = struct.Struct('<Q')
+
+EPOCH = datetime(1970, 1, 1)
+
+# Column type codes of the stdlib format.
+INT64, TIMESTAMP, FLOAT64, BOOL, STRING, DICTIONARY = range(1, 7)
+
+# String columns with few distinct values, stored as a dictionary plus indices.
+DICTIONARY_COLUMNS = ('host', 'browser', 'profile')
+
+# The rows the Arrow writers keep while a column has no value yet, the columns still
+# without a value after them are strings.
+PENDING_ROWS = 65536
+
+
+def has_pyarrow() -> bool:
+    '''Check if pyarrow can be imported.'''
+    try:
+        import pyarrow  # pylint: disable=import-outside-toplevel,unused-import
+    except ImportError:
+        return False
+    return True
+
+
+def columnar_format() -> str:
+    '''Get the best columnar format available: parquet with pyarrow, pbc otherwise.'''
+    return 'parquet' if has_pyarrow() else 'pbc'
+
+
+def host(url: str) -> str:
+    '''Get the host of an url, None if the url has none.'''
+    if not isinstance(url, str):
+        return None
+    try:
+        return urllib.parse.urlsplit(url).hostname
+    except ValueError:
+        return None
+
+
+def prepare(rows: list[dict]) -> dict[str, list]:
+    '''
+    Turn rows into columns, adding the host of the url column.
+    Nested values (lists, dictionaries) are stored as JSON strings.
+
+    Args:
+        rows (list of dict): The rows.
+    Returns:
+        dict: The values by column name.
+    '''
+    columns = {name: [] for name in rows[0]}
+    for row in rows:
+        for name, values in columns.items():
+            value = row.get(name)
+            if isinstance(value, (list, tuple, dict)):
+                value = json.dumps(value, default=str)
+            values.append(value)
+    if 'url' in columns and 'host' not in columns:
+        columns['host'] = [host(url) for url in columns['url']]
+    return columns
+
+
+def to_micros(value: datetime) -> int:
+    '''Get the microseconds since the Unix epoch of a datetime, naive ones are UTC.'''
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    delta = value - EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+
+def column_type(name: str, values: list) -> int:
+    '''Infer the stdlib type of a column from its first value, None if it has no value.'''
+    value = next((value for value in values if value is not None), None)
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return BOOL
+    if isinstance(value, int):
+        return INT64
+    if isinstance(value, float):
+        return FLOAT64
+    if isinstance(value, datetime):
+        return TIMESTAMP
+    return DICTIONARY if name in DICTIONARY_COLUMNS else STRING
+
+
+def packed(typecode: str, values: list) -> bytes:
+    '''Pack numbers as a little endian array.'''
+    data = array(typecode, values)
+    if sys.byteorder == 'big':
+        data.byteswap()
+    return data.tobytes()
+
+
+def unpacked(typecode: str, data: bytes) -> list:
+    '''Unpack a little endian array.'''
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values.tolist()
+
+
+def strings(values: list) -> list[bytes]:
+    '''Encode strings as offsets and a utf-8 blob.'''
+    encoded = [b'' if value is None else str(value).encode('utf-8') for value in values]
+    offsets = [0]
+    for value in encoded:
+        offsets.append(offsets[-1] + len(value))
+    return [packed('q', offsets), b''.join(encoded)]
+
+
+def encode(kind: int, values: list) -> list[bytes]:
+    '''
+    Encode the values of a column.
+
+    Args:
+        kind (int): The column type.
+        values (list): The column values, None is a missing value.
+    Returns:
+        list[bytes]: The sections of the column, the validity bitmap first.
+    '''
+    validity = bytearray((len(values) + 7) // 8)
+    for index, value in enumerate(values):
+        if value is not None:
+            validity[index >> 3] |= 1 << (index & 7)
+    sections = [bytes(validity)]
+    if kind == INT64:
+        sections.append(packed('q', [int(value or 0) for value in values]))
+    elif kind == TIMESTAMP:
+        sections.append(packed('q', [
+            to_micros(value) if isinstance(value, datetime) else 0 for value in values]))
+    elif kind == FLOAT64:
+        sections.append(packed('d', [float(value or 0.0) for value in values]))
+    elif kind == BOOL:
+        sections.append(bytes(bool(value) for value in values))
+    elif kind == DICTIONARY:
+        positions = {}
+        indices = [-1 if value is None else positions.setdefault(str(value), len(positions))
+                   for value in values]
+        sections += strings(list(positions)) + [packed('i', indices)]
+    else:
+        sections += strings(values)
+    return sections
+
+
+def decode_strings(offsets: bytes, blob: bytes) -> list[str]:
+    '''Decode strings from their offsets and utf-8 blob.'''
+    offsets = unpacked('q', offsets)
+    return [blob[start:end].decode('utf-8') for start, end in zip(offsets, offsets[1:])]
+
+
+def decode(kind: int, rows: int, sections: list[bytes]) -> list:
+    '''
+    Decode the values of a column.
+
+    Args:
+        kind (int): The column type.
+        rows (int): The number of values.
+        sections (list of bytes): The sections of the column.
+    Raises:
+        FileError: If the column type is unknown.
+    Returns:
+        list: The column values, None for the missing ones.
+    '''
+    validity = sections[0]
+    if kind == INT64:
+        values = unpacked('q', sections[1])
+    elif kind == TIMESTAMP:
+        values = [datetime.fromtimestamp(value / 1000000, timezone.utc).replace(tzinfo=None)
+                  for value in unpacked('q', sections[1])]
+    elif kind == FLOAT64:
+        values = unpacked('d', sections[1])
+    elif kind == BOOL:
+        values = [bool(value) for value in sections[1]]
+    elif kind == DICTIONARY:
+        dictionary = decode_strings(sections[1], sections[2])
+        values = [dictionary[index] if index >= 0 else None
+                  for index in unpacked('i', sections[3])]
+    elif kind == STRING:
+        values = decode_strings(sections[1], sections[2])
+    else:
+        raise FileError(f'Unknown column type {kind}.')
+    return [value if validity[index >> 3] >> (index & 7) & 1 else None
+            for index, value in enumerate(values[:rows])]
+
+
+class ColumnarWriter:
+    '''Writes the stdlib columnar format, one record batch per chunk.'''
+
+    def __init__(self, path: str, compression: str = None, overwrite: bool = False, **_):
+        '''Create the file.'''
+        if compression is not None:
+            raise FileError('The pbc format cannot be compressed.')
+        try:
+            self.__file = open(path, 'wb' if overwrite else 'xb')
+        except OSError as exc:
+            raise FileError(f'Error while creating the file {path}') from exc
+        self.__file.write(MAGIC)
+        self.__types = None
+
+    def write(self, rows: list[dict]) -> None:
+        '''
+        Write a chunk of rows as a record batch, the columns of the first chunk are kept.
+        A column without any value yet is typed by the first chunk that has one.
+        '''
+        columns = prepare(rows)
+        if self.__types is None:
+            self.__types = dict.fromkeys(columns)
+        for name, kind in self.__types.items():
+            if kind is None and name in columns:
+                self.__types[name] = column_type(name, columns[name])
+        parts = [BATCH.pack(len(rows), len(self.__types))]
+        for name, kind in self.__types.items():
+            kind = kind or STRING
+            sections = encode(kind, columns.get(name, [None] * len(rows)))
+            encoded = name.encode('utf-8')
+            parts += [NAME.pack(len(encoded)), encoded, COLUMN.pack(kind, len(sections))]
+            for section in sections:
+                parts += [SECTION.pack(len(section)), section]
+        self.__file.write(b''.join(parts))
+
+    def close(self) -> None:
+        '''Flush and close the file.'''
+        self.__file.close()
+
+
+def read_columnar(path: str):
+    '''
+    Read a file of the stdlib columnar format.
+
+    Args:
+        path (str): The path of the file.
+    Raises:
+        FileError: If the file cannot be read or is not a pbc file.
+    Yields:
+        dict: The values by column name of every record batch.
+    '''
+    try:
+        with open(path, 'rb') as file:
+            data = memoryview(file.read())
+    except OSError as exc:
+        raise FileError(f'Error while reading the file {path}') from exc
+    if bytes(data[:len(MAGIC)]) != MAGIC:
+        raise FileError(f'The file {path} is not a pbc file.')
+    offset = len(MAGIC)
+    try:
+        while offset < len(data):
+            rows, count = BATCH.unpack_from(data, offset)
+            offset += BATCH.size
+            batch = {}
+            for _ in range(count):
+                size, = NAME.unpack_from(data, offset)
+                offset += NAME.size
+                name = bytes(data[offset:offset + size]).decode('utf-8')
+                offset += size
+                kind, total = COLUMN.unpack_from(data, offset)
+                offset += COLUMN.size
+                sections = []
+                for _ in range(total):
+                    size, = SECTION.unpack_from(data, offset)
+                    offset += SECTION.size
+                    sections.append(bytes(data[offset:offset + size]))
+                    offset += size
+                batch[name] = decode(kind, rows, sections)
+            yield batch
+    except (struct.error, IndexError, UnicodeDecodeError) as exc:
+        raise FileError(f'The file {path} is corrupted.') from exc
+
+
+def require_pyarrow():
+    '''
+    Import pyarrow.
+
+    Raises:
+        FileError: If pyarrow is not installed.
+    Returns:
+        module: The pyarrow module.
+    '''
+    try:
+        import pyarrow  # pylint: disable=import-outside-toplevel
+    except ImportError as exc:
+        raise FileError('Arrow and Parquet exports require the pyarrow package.') from exc
+    return pyarrow
+
+
+class ArrowWriter:
+    '''
+        Writes an Arrow IPC file, one record batch per chunk, with dictionary encoded hosts.
+        The file is opened once every column has a value or PENDING_ROWS rows are kept,
+        so a column is typed by its first value even if the first chunks have none.
+    '''
+
+    # The pending chunks are part of the writer state.
+    # pylint: disable=too-many-instance-attributes
+
+    # The codecs of the format, the buffers of Arrow IPC files are only lz4 or zstd.
+    COMPRESSIONS = ('lz4', 'zstd')
+
+    def __init__(self, path: str, compression: str = None, overwrite: bool = False, **_):
+        '''
+        Create the file.
+
+        Raises:
+            FileError: If the compression is not supported by the format, pyarrow is not
+                installed or the file exists.
+        '''
+        if compression is not None and compression not in self.COMPRESSIONS:
+            raise FileError(f'{type(self).__name__[:-len("Writer")]} exports support '
+                            f'{", ".join(self.COMPRESSIONS)} compression, not {compression}.')
+        self._pa = require_pyarrow()
+        if os.path.exists(path) and not overwrite:
+            raise FileError(f'The file {path} already exists.')
+        self._path = path
+        self._compression = compression
+        self._schema = None
+        self._writer = None
+        self._pending = []
+        self._untyped = None
+        self._rows = 0
+
+    def _schema_of(self, chunks: list[dict]):
+        '''Build the schema from the first value of each column, strings if it has none.'''
+        pa = self._pa
+        fields = []
+        for name in chunks[0]:
+            kind = pa.string()
+            for columns in chunks:
+                values = columns.get(name, ())
+                if any(value is not None for value in values):
+                    kind = pa.array(values).type
+                    break
+            if name in DICTIONARY_COLUMNS:
+                kind = pa.dictionary(pa.int32(), kind)
+            fields.append(pa.field(name, kind))
+        return pa.schema(fields)
+
+    def _batch(self, columns: dict, rows: int):
+        '''Build a record batch with the schema of the file.'''
+        pa = self._pa
+        arrays = [pa.array(columns.get(field.name, [None] * rows), type=field.type)
+                  for field in self._schema]
+        return pa.RecordBatch.from_arrays(arrays, schema=self._schema)
+
+    def _open(self, schema) -> object:
+        '''Open the Arrow IPC writer.'''
+        pa = self._pa
+        options = pa.ipc.IpcWriteOptions(compression=self._compression)
+        return pa.ipc.new_file(self._path, schema, options=options)
+
+    def write(self, rows: list[dict]) -> None:
+        '''
+        Write a chunk of rows as a record batch.
+
+        Raises:
+            FileError: If the rows do not match the columns or the file cannot be created.
+        '''
+        columns = prepare(rows)
+        self._pending.append((columns, len(rows)))
+        if self._writer is None:
+            if self._untyped is None:
+                self._untyped = set(columns)
+            self._untyped -= {name for name, values in columns.items()
+                              if any(value is not None for value in values)}
+            self._rows += len(rows)
+            if self._untyped and self._rows < PENDING_ROWS:
+                return
+        self.__flush()
+
+    def __flush(self) -> None:
+        '''Write the pending chunks, opening the file with their schema first.'''
+        pa = self._pa
+        try:
+            if self._writer is None:
+                self._schema = self._schema_of([columns for columns, _ in self._pending])
+                try:
+                    self._writer = self._open(self._schema)
+                except OSError as exc:
+                    raise FileError(f'Error while creating the file {self._path}') from exc
+            for columns, rows in self._pending:
+                self._writer.write_batch(self._batch(columns, rows))
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as exc:
+            raise FileError('The items do not match the columns of the export.') from exc
+        finally:
+            self._pending = []
+
+    def close(self) -> None:
+        '''Write the pending chunks, flush and close the file.'''
+        if self._pending:
+            self.__flush()
+        if self._writer is not None:
+            self._writer.close()
+
+
+class ParquetWriter(ArrowWriter):
+    '''Writes a Parquet file, one row group per chunk, with dictionary encoded hosts.'''
+
+    COMPRESSIONS = ('snappy', 'gzip', 'brotli', 'lz4', 'zstd', 'none')
+
+    def _open(self, schema) -> object:
+        '''Open the Parquet writer.'''
+        import pyarrow.parquet  # pylint: disable=import-outside-toplevel
+        return pyarrow.parquet.ParquetWriter(
+            self._path, schema, compression=self._compression or 'snappy')
@@ -4,9 +4,20 @@
     Docstrings are written in Google style.
 '''
 
-import io
+# The command classes only decode their payload into attributes.
+# pylint: disable=too-few-public-methods
+
 import enum
-from pybrinf.reader import Reader
+from pybrinf.reader import (
+    Reader,
+    UINT32,
+    UINT32_PAIR,
+    UINT32_TRIPLE,
+    UINT32_BOOL,
+    UINT32_INT64,
+    UINT32_PAIR_INT64,
+    WINDOW_BOUNDS
+)
 
 class MetaEnum(enum.EnumMeta):
     '''This class is used for creating an enum with a custom __contains__ method'''
@@ -21,11 +32,31 @@ class CommandType(enum.Enum, metaclass=MetaEnum):
         Source:
         https://source.chromium.org/chromium/chromium/src/+/main:components/sessions/core/session_service_commands.cc
     '''
+    SetTabWindow = 0
+    SetTabIndexInWindow = 2
+    TabNavigationPathPrunedFromBack = 5
     UpdateTabNavigation = 6
     SetSelectedNavigationIndex = 7
     SetSelectedTabInIndex = 8
+    SetWindowType = 9
+    TabNavigationPathPrunedFromFront = 11
     SetPinnedState = 12
+    SetWindowBounds = 14
     TabClosed = 16
+    WindowClosed = 17
+    SetActiveWindow = 20
+    LastActiveTime = 21
+    TabNavigationPathPruned = 24
+
+class RestoreCommandType(enum.Enum, metaclass=MetaEnum):
+    '''
+        Enum for SNSS command types of the Tabs files (recently closed tabs)
+        Source:
+        https://source.chromium.org/chromium/chromium/src/+/main:components/sessions/core/tab_restore_service_impl.cc
+    '''
+    UpdateTabNavigation = 1
+    RestoredEntry = 2
+    SelectedNavigationInTab = 4
 
 class Command:
     '''Command class core.'''
@@ -43,12 +74,54 @@ class Command:
 
     def __str__(self) -> str:
         '''Get the string representation of the command'''
-        return __class__.__name__ + f'(id={self.id})'
+        return self.__class__.__name__ + f'(id={self.id})'
 
     def __repr__(self) -> str:
         '''Get the representation of the command'''
         return self.__str__()
 
+class SetTabWindow(Command):
+    '''Command class for SetTabWindow'''
+
+    def __init__(self, _id: int, content: bytes):
+        '''
+        Initialize the SetTabWindow instance
+
+        Args:
+            id (int): The command id
+            content (bytes): The command content
+        '''
+        super().__init__(_id, content)
+        self.window_id, self.tab_id = UINT32_PAIR.unpack_from(content)
+
+class SetTabIndexInWindow(Command):
+    '''Command class for SetTabIndexInWindow'''
+
+    def __init__(self, _id: int, content: bytes):
+        '''
+        Initialize the SetTabIndexInWindow instance
+
+        Args:
+            id (int): The command id
+            content (bytes): The command content
+        '''
+        super().__init__(_id, content)
+        self.tab_id, self.index = UINT32_PAIR.unpack_from(content)
+
+class TabNavigationPathPrunedFromBack(Command):
+    '''Command class for TabNavigationPathPrunedFromBack'''
+
+    def __init__(self, _id: int, content: bytes):
+        '''
+        Initialize the TabNavigationPathPrunedFromBack instance
+
+        Args:
+            id (int): The command id
+            content (bytes): The command content
+        '''
+        super().__init__(_id, content)
+        self.tab_id, self.index = UINT32_PAIR.unpack_from(content)
+
 class CommandTabNavigation(Command):
     '''Command class for UpdateTabNavigation'''
 
@@ -61,20 +134,9 @@ class CommandTabNavigation(Command):
             content (bytes): The command content
         '''
         super().__init__(_id, content)
-        self.content = io.BytesIO(content)
-        self.payload_size = Reader.uInt32(self.content)
-        self.tab_id = Reader.uInt32(self.content)
-        self.index = Reader.uInt32(self.content)
-        self.url = Reader.string(self.content)
-        self.title = Reader.string16(self.content)
-
-    def __str__(self) -> str:
-        '''Get the string representation of the command'''
-        return __class__.__name__ + f'(id={self.id})'
-
-    def __repr__(self) -> str:
-        '''Get the string representation of the command'''
-        return self.__str__()
+        self.payload_size, self.tab_id, self.index = UINT32_TRIPLE.unpack_from(content)
+        self.url, offset = Reader.string_at(content, UINT32_TRIPLE.size)
+        self.title, _ = Reader.string16_at(content, offset)
 
 class SetSelectedNavigationIndex(Command):
     '''Command class for SetSelectedNavigationIndex'''
@@ -88,17 +150,7 @@ class SetSelectedNavigationIndex(Command):
             content (bytes): The command content
         '''
         super().__init__(_id, content)
-        self.content = io.BytesIO(content)
-        self.tab_id = Reader.uInt32(self.content)
-        self.index = Reader.uInt32(self.content)
-
-    def __str__(self) -> str:
-        '''Get the string representation of the command'''
-        return __class__.__name__ + f'(id={self.id})'
-
-    def __repr__(self) -> str:
-        '''Get the string representation of the command'''
-        return self.__str__()
+        self.tab_id, self.index = UINT32_PAIR.unpack_from(content)
 
 class SetSelectedTabInIndex(Command):
     '''Command class for SetSelectedTabInIndex'''
@@ -112,16 +164,35 @@ class SetSelectedTabInIndex(Command):
             content (bytes): The command content
         '''
         super().__init__(_id, content)
-        self.content = io.BytesIO(content)
-        self.index = Reader.uInt32(self.content)
+        self.window_id, self.index = UINT32_PAIR.unpack_from(content)
 
-    def __str__(self) -> str:
-        '''Get the string representation of the command'''
-        return __class__.__name__ + f'(id={self.id})'
+class SetWindowType(Command):
+    '''Command class for SetWindowType'''
 
-    def __repr__(self) -> str:
-        '''Get the string representation of the command'''
-        return self.__str__()
+    def __init__(self, _id: int, content: bytes):
+        '''
+        Initialize the SetWindowType instance
+
+        Args:
+            id (int): The command id
+            content (bytes): The command content
+        '''
+        super().__init__(_id, content)
+        self.window_id, self.type = UINT32_PAIR.unpack_from(content)
+
+class TabNavigationPathPrunedFromFront(Command):
+    '''Command class for TabNavigationPathPrunedFromFront'''
+
+    def __init__(self, _id: int, content: bytes):
+        '''
+        Initialize the TabNavigationPathPrunedFromFront instance
+
+        Args:
+            id (int): The command id
+            content (bytes): The command content
+        '''
+        super().__init__(_id, content)
+        self.tab_id, self.count = UINT32_PAIR.unpack_from(content)
 
 class SetPinnedState(Command):
     '''Command class for SetPinnedState'''
@@ -135,18 +206,23 @@ class SetPinnedState(Command):
             content (bytes): The command content
         '''
         super().__init__(_id, content)
-        self.content = io.BytesIO(content)
-        self.tab_id = Reader.uInt32(self.content)
-        self.pinned = Reader.uInt32(self.content)
+        # The payload is a bool followed by padding bytes.
+        self.tab_id, self.pinned = UINT32_BOOL.unpack_from(content)
 
-    def __str__(self) -> str:
-        '''Get the string representation of the command'''
-        return __class__.__name__ + f'(id={self.id})'
+class SetWindowBounds(Command):
+    '''Command class for SetWindowBounds (SetWindowBounds3 in Chromium)'''
 
-    def __repr__(self) -> str:
-        '''Get the string representation of the command'''
-        return self.__str__()
+    def __init__(self, _id: int, content: bytes):
+        '''
+        Initialize the SetWindowBounds instance
 
+        Args:
+            id (int): The command id
+            content (bytes): The command content
+        '''
+        super().__init__(_id, content)
+        (self.window_id, self.x, self.y, self.width, self.height,
+         self.show_state) = WINDOW_BOUNDS.unpack_from(content)
 
 class TabClosed(Command):
     '''Command class for TabClosed'''
@@ -160,13 +236,112 @@ class TabClosed(Command):
             content (bytes): The command content
         '''
         super().__init__(_id, content)
-        self.content = io.BytesIO(content)
-        self.tab_id = Reader.uInt32(self.content)
+        self.tab_id, self.close_time = UINT32_INT64.unpack_from(content)
 
-    def __str__(self) -> str:
-        '''Get the string representation of the command'''
-        return __class__.__name__ + f'(id={self.id})'
+class WindowClosed(Command):
+    '''Command class for WindowClosed'''
 
-    def __repr__(self) -> str:
-        '''Get the string representation of the command'''
-        return self.__str__()
+    def __init__(self, _id: int, content: bytes):
+        '''
+        Initialize the WindowClosed instance
+
+        Args:
+            id (int): The command id
+            content (bytes): The command content
+        '''
+        super().__init__(_id, content)
+        self.window_id, self.close_time = UINT32_INT64.unpack_from(content)
+
+class SetActiveWindow(Command):
+    '''Command class for SetActiveWindow'''
+
+    def __init__(self, _id: int, content: bytes):
+        '''
+        Initialize the SetActiveWindow instance
+
+        Args:
+            id (int): The command id
+            content (bytes): The command content
+        '''
+        super().__init__(_id, content)
+        self.window_id, = UINT32.unpack_from(content)
+
+class LastActiveTime(Command):
+    '''Command class for LastActiveTime'''
+
+    def __init__(self, _id: int, content: bytes):
+        '''
+        Initialize the LastActiveTime instance
+
+        Args:
+            id (int): The command id
+            content (bytes): The command content
+        '''
+        super().__init__(_id, content)
+        self.tab_id, self.last_active_time = UINT32_INT64.unpack_from(content)
+
+class TabNavigationPathPruned(Command):
+    '''Command class for TabNavigationPathPruned'''
+
+    def __init__(self, _id: int, content: bytes):
+        '''
+        Initialize the TabNavigationPathPruned instance
+
+        Args:
+            id (int): The command id
+            content (bytes): The command content
+        '''
+        super().__init__(_id, content)
+        self.tab_id, self.index, self.count = UINT32_TRIPLE.unpack_from(content)
+
+class RestoredEntry(Command):
+    '''Command class for RestoredEntry'''
+
+    def __init__(self, _id: int, content: bytes):
+        '''
+        Initialize the RestoredEntry instance
+
+        Args:
+            id (int): The command id
+            content (bytes): The command content
+        '''
+        super().__init__(_id, content)
+        self.tab_id, = UINT32.unpack_from(content)
+
+class SelectedNavigationInTab(Command):
+    '''Command class for SelectedNavigationInTab'''
+
+    def __init__(self, _id: int, content: bytes):
+        '''
+        Initialize the SelectedNavigationInTab instance
+
+        Args:
+            id (int): The command id
+            content (bytes): The command content
+        '''
+        super().__init__(_id, content)
+        self.tab_id, self.index, self.close_time = UINT32_PAIR_INT64.unpack_from(content)
+
+COMMANDS = {
+    CommandType.SetTabWindow.value: SetTabWindow,
+    CommandType.SetTabIndexInWindow.value: SetTabIndexInWindow,
+    CommandType.TabNavigationPathPrunedFromBack.value: TabNavigationPathPrunedFromBack,
+    CommandType.UpdateTabNavigation.value: CommandTabNavigation,
+    CommandType.SetSelectedNavigationIndex.value: SetSelectedNavigationIndex,
+    CommandType.SetSelectedTabInIndex.value: SetSelectedTabInIndex,
+    CommandType.SetWindowType.value: SetWindowType,
+    CommandType.TabNavigationPathPrunedFromFront.value: TabNavigationPathPrunedFromFront,
+    CommandType.SetPinnedState.value: SetPinnedState,
+    CommandType.SetWindowBounds.value: SetWindowBounds,
+    CommandType.TabClosed.value: TabClosed,
+    CommandType.WindowClosed.value: WindowClosed,
+    CommandType.SetActiveWindow.value: SetActiveWindow,
+    CommandType.LastActiveTime.value: LastActiveTime,
+    CommandType.TabNavigationPathPruned.value: TabNavigationPathPruned,
+}
+
+RESTORE_COMMANDS = {
+    RestoreCommandType.UpdateTabNavigation.value: CommandTabNavigation,
+    RestoreCommandType.RestoredEntry.value: RestoredEntry,
+    RestoreCommandType.SelectedNavigationInTab.value: SelectedNavigationInTab,
+}
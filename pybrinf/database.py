@@ -7,8 +7,10 @@ Docstrings are written in Google style.
 
 import sqlite3
 import shutil
+import tempfile
 import os
 
+from pybrinf.stats import stage
 from pybrinf.exceptions import DatabaseError
 
 
@@ -16,28 +18,52 @@ class Database:
     '''Database class core'''
     __conn = None
     __c = None
+    __copied = False
     connected = property(lambda self: self.__conn is not None)
 
     def __init__(self, path: str, **kwargs):
-        '''Initialize the Database instance.'''
+        '''
+        Initialize the Database instance.
+
+        Args:
+            path (str): The path of the database.
+            bypass (bool): Copy the database to a temporary file first, so it can be read
+                while the browser has it locked. Defaults to False.
+            to (str): The folder of the copy. Defaults to the temporary folder.
+            browser (str): The browser the database belongs to, used by pybrinf.stats.
+        '''
         self.__path = path
+        self.__browser = kwargs.get('browser', None)
         if kwargs.get('bypass', False):
             # If bypass is true, the database will be copied to a temporary directory.
+            # Every copy gets a unique name so several profiles can be read at once.
             to_path = kwargs.get('to', None)
-            self.__copy(self.__path, to_path)
-            self.__path = os.path.join(to_path, self.__path.split(os.sep)[-1])
+            self.__path = self.__copy(self.__path, to_path)
+            self.__copied = True
 
-    def __copy(self, from_path: str, to_path: str) -> None:
+    def __copy(self, from_path: str, to_path: str) -> str:
         '''
-        Copy a file to another directory.
+        Copy a file to another directory with a unique name.
 
         Raises:
             DatabaseError: If the file cannot be copied.
+        Returns:
+            str: The path of the copy.
         '''
         try:
-            shutil.copy(from_path, to_path)
+            descriptor, path = tempfile.mkstemp(
+                prefix='pybrinf-', suffix=f'-{os.path.basename(from_path)}', dir=to_path)
+            os.close(descriptor)
         except Exception as exc:
             raise DatabaseError('Cannot copy the database') from exc
+        try:
+            with stage(self.__browser, 'copy') as timer:
+                shutil.copyfile(from_path, path)
+                timer.count(bytes=os.path.getsize(path))
+        except Exception as exc:
+            os.remove(path)
+            raise DatabaseError('Cannot copy the database') from exc
+        return path
 
     def __del__(self) -> None:
         '''When the Database instance is deleted, close the connection.'''
@@ -45,12 +71,21 @@ class Database:
             self.__conn.close()
 
     def close(self) -> None:
-        '''Close the connection to the database.'''
+        '''Close the connection to the database and remove the temporary copy.'''
         if self.connected:
             self.__conn.close()
             self.__conn = None
             self.__c = None
-            os.remove(self.__path)
+        self.__remove()
+
+    def __remove(self) -> None:
+        '''Remove the temporary copy of the database, if any.'''
+        if self.__copied:
+            self.__copied = False
+            try:
+                os.remove(self.__path)
+            except FileNotFoundError:
+                pass
 
     def connect(self) -> None:
         '''
@@ -62,9 +97,12 @@ class Database:
         if self.connected:
             raise DatabaseError('Database is already connected')
         try:
-            self.__conn = sqlite3.connect(self.__path)
-            self.__c = self.__conn.cursor()
+            with stage(self.__browser, 'connect'):
+                self.__conn = sqlite3.connect(self.__path)
+                self.__c = self.__conn.cursor()
         except Exception as exc:
+            # close is only called after a successful connect, the copy is removed here.
+            self.__remove()
             raise DatabaseError('Cannot connect to the database') from exc
 
     def execute(self, query: str) -> list:
@@ -79,7 +117,55 @@ class Database:
         if not self.connected:
             raise DatabaseError('Database is not connected')
         try:
-            self.__c.execute(query)
-            return self.__c.fetchall()
+            with stage(self.__browser, 'query') as timer:
+                self.__c.execute(query)
+                rows = self.__c.fetchall()
+                timer.count(rows=len(rows))
+            return rows
         except Exception as exc:
             raise DatabaseError('Cannot execute the query') from exc
+
+    def chunks(self, query: str, size: int = 1000):
+        '''
+        Execute a query and yield its rows in chunks.
+
+        Args:
+            query (str): The query to execute.
+            size (int): The number of rows fetched at once. Defaults to 1000.
+        Raises:
+            DatabaseError: If the database is not connected or the query cannot be executed.
+        Yields:
+            list[tuple]: The rows of the result, at most size at a time.
+        '''
+        if not self.connected:
+            raise DatabaseError('Database is not connected')
+        try:
+            with stage(self.__browser, 'query'):
+                cursor = self.__conn.execute(query)
+        except Exception as exc:
+            raise DatabaseError('Cannot execute the query') from exc
+        while True:
+            try:
+                with stage(self.__browser, 'query') as timer:
+                    rows = cursor.fetchmany(size)
+                    timer.count(rows=len(rows))
+            except Exception as exc:
+                raise DatabaseError('Cannot execute the query') from exc
+            if not rows:
+                return
+            yield rows
+
+    def iterate(self, query: str, size: int = 1000):
+        '''
+        Execute a query and yield its rows, fetching them in chunks.
+
+        Args:
+            query (str): The query to execute.
+            size (int): The number of rows fetched at once. Defaults to 1000.
+        Raises:
+            DatabaseError: If the database is not connected or the query cannot be executed.
+        Yields:
+            tuple: The rows of the result.
+        '''
+        for rows in self.chunks(query, size):
+            yield from rows
@@ -0,0 +1,396 @@
+'''
+DevTools implementation for PyBrinf.
+This module contains a client for the Chrome DevTools Protocol (CDP) that keeps a
+persistent HTTP connection and can follow the browser targets over a WebSocket.
+Docstrings are written in Google style.
+'''
+
+import os
+import json
+import base64
+import socket
+import struct
+import hashlib
+import logging
+import threading
+import http.client
+import urllib.parse
+
+from pybrinf.exceptions import DevToolsError
+
+LOGGER = logging.getLogger(__name__)
+WEBSOCKET_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+TARGET_EVENTS = (
+    'Target.targetCreated',
+    'Target.targetDestroyed',
+    'Target.targetInfoChanged',
+)
+
+
+class WebSocket:
+    '''
+        Minimal WebSocket client (RFC 6455) used to talk with the DevTools endpoint.
+        Only text messages are supported, which is all the protocol uses.
+    '''
+
+    def __init__(self, url: str, timeout: float = 5.0):
+        '''
+        Open the WebSocket connection.
+
+        Args:
+            url (str): The ws:// url to connect to.
+            timeout (float): The timeout of the handshake in seconds.
+        Raises:
+            DevToolsError: If the connection or the handshake fails.
+        '''
+        parsed = urllib.parse.urlparse(url)
+        if parsed.scheme != 'ws':
+            raise DevToolsError(f'Unsupported WebSocket url {url}')
+        self.__lock = threading.Lock()
+        self.__buffer = b''
+        try:
+            self.__socket = socket.create_connection(
+                (parsed.hostname, parsed.port or 80), timeout=timeout)
+            self.__handshake(parsed)
+        except OSError as exc:
+            raise DevToolsError(f'Cannot connect to {url}') from exc
+        self.__socket.settimeout(None)
+
+    def __handshake(self, parsed: urllib.parse.ParseResult) -> None:
+        '''
+        Upgrade the connection to the WebSocket protocol.
+
+        Args:
+            parsed (ParseResult): The parsed url.
+        Raises:
+            DevToolsError: If the server refuses the upgrade.
+        '''
+        key = base64.b64encode(os.urandom(16)).decode()
+        request = (
+            f'GET {parsed.path or "/"} HTTP/1.1\r\n'
+            f'Host: {parsed.netloc}\r\n'
+            'Upgrade: websocket\r\n'
+            'Connection: Upgrade\r\n'
+            f'Sec-WebSocket-Key: {key}\r\n'
+            'Sec-WebSocket-Version: 13\r\n\r\n'
+        )
+        self.__socket.sendall(request.encode())
+        response = b''
+        while b'\r\n\r\n' not in response:
+            chunk = self.__socket.recv(4096)
+            if not chunk:
+                raise DevToolsError('The WebSocket handshake was interrupted')
+            response += chunk
+        head, self.__buffer = response.split(b'\r\n\r\n', 1)
+        accept = base64.b64encode(
+            hashlib.sha1((key + WEBSOCKET_GUID).encode()).digest()).decode()
+        lines = head.decode('latin-1').split('\r\n')
+        headers = dict(line.split(': ', 1) for line in lines[1:] if ': ' in line)
+        headers = {name.lower(): value for name, value in headers.items()}
+        status = lines[0].split()
+        if len(status) < 2 or status[1] != '101' or headers.get('sec-websocket-accept') != accept:
+            raise DevToolsError('The WebSocket handshake was refused')
+
+    def __read(self, size: int) -> bytes:
+        '''
+        Read exactly size bytes from the socket.
+
+        Raises:
+            DevToolsError: If the connection is closed.
+        '''
+        while len(self.__buffer) < size:
+            chunk = self.__socket.recv(max(65536, size - len(self.__buffer)))
+            if not chunk:
+                raise DevToolsError('The WebSocket connection was closed')
+            self.__buffer += chunk
+        data, self.__buffer = self.__buffer[:size], self.__buffer[size:]
+        return data
+
+    def __send(self, opcode: int, payload: bytes) -> None:
+        '''
+        Send a single masked frame.
+
+        Args:
+            opcode (int): The frame opcode.
+            payload (bytes): The frame payload.
+        '''
+        length = len(payload)
+        if length < 126:
+            header = struct.pack('!BB', 0x80 | opcode, 0x80 | length)
+        elif length < 65536:
+            header = struct.pack('!BBH', 0x80 | opcode, 0x80 | 126, length)
+        else:
+            header = struct.pack('!BBQ', 0x80 | opcode, 0x80 | 127, length)
+        mask = os.urandom(4)
+        masked = bytes(byte ^ mask[index % 4] for index, byte in enumerate(payload))
+        with self.__lock:
+            self.__socket.sendall(header + mask + masked)
+
+    def send(self, message: str) -> None:
+        '''
+        Send a text message.
+
+        Args:
+            message (str): The message to send.
+        Raises:
+            DevToolsError: If the message cannot be sent.
+        '''
+        try:
+            self.__send(0x1, message.encode('utf-8'))
+        except OSError as exc:
+            raise DevToolsError('Cannot send the WebSocket message') from exc
+
+    def receive(self) -> str:
+        '''
+        Wait for the next text message, answering pings on the way.
+
+        Raises:
+            DevToolsError: If the connection is closed.
+        Returns:
+            str: The received message.
+        '''
+        message = b''
+        try:
+            while True:
+                first, second = self.__read(2)
+                opcode, length = first & 0x0F, second & 0x7F
+                if length == 126:
+                    length = struct.unpack('!H', self.__read(2))[0]
+                elif length == 127:
+                    length = struct.unpack('!Q', self.__read(8))[0]
+                mask = self.__read(4) if second & 0x80 else None
+                payload = self.__read(length)
+                if mask:
+                    payload = bytes(byte ^ mask[index % 4] for index, byte in enumerate(payload))
+                if opcode == 0x8:
+                    raise DevToolsError('The WebSocket connection was closed')
+                if opcode == 0x9:
+                    self.__send(0xA, payload)
+                    continue
+                if opcode in (0x0, 0x1, 0x2):
+                    message += payload
+                    if first & 0x80:
+                        return message.decode('utf-8', errors='ignore')
+        except OSError as exc:
+            raise DevToolsError('The WebSocket connection was closed') from exc
+
+    def close(self) -> None:
+        '''Close the WebSocket connection.'''
+        try:
+            self.__send(0x8, b'')
+        except OSError:
+            pass
+        try:
+            self.__socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.__socket.close()
+
+
+class Connections:
+    '''
+        The open connections of a DevTools client.
+
+        Attributes:
+            http (HTTPConnection): The keep-alive connection of the HTTP endpoints.
+            websocket (WebSocket): The browser WebSocket while watching.
+            thread (Thread): The thread reading the WebSocket while watching.
+    '''
+
+    # pylint: disable=too-few-public-methods
+    __slots__ = ('http', 'websocket', 'thread')
+
+    def __init__(self):
+        '''Initialize the Connections instance, nothing is connected.'''
+        self.http = None
+        self.websocket = None
+        self.thread = None
+
+
+class DevTools:
+    '''
+        Client of the DevTools endpoint of a chromium based browser.
+        HTTP requests reuse a single keep-alive connection. When watching, the client
+        subscribes to the target events over the browser WebSocket and keeps a live
+        table of targets, so targets() returns without any request.
+    '''
+
+    def __init__(self, host: str = 'localhost', port: int = 9222, timeout: float = 5.0):
+        '''
+        Initialize the DevTools instance.
+
+        Args:
+            host (str): The host of the DevTools endpoint. Defaults to localhost.
+            port (int): The remote debugging port. Defaults to 9222.
+            timeout (float): The timeout of every request in seconds. Defaults to 5.
+        '''
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.__connections = Connections()
+        self.__lock = threading.Lock()
+        self.__targets = {}
+        self.__listeners = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def watching(self) -> bool:
+        '''Check if the live target table is being updated.'''
+        thread = self.__connections.thread
+        return thread is not None and thread.is_alive()
+
+    def __request(self, path: str, timeout: float = None) -> object:
+        '''
+        Make a GET request over the persistent connection and decode the JSON body.
+        A dropped keep-alive connection is opened again once.
+
+        Args:
+            path (str): The path to request.
+            timeout (float): The timeout of this request in seconds. Defaults to the client one.
+        Raises:
+            DevToolsError: If the request fails.
+        Returns:
+            object: The decoded JSON response.
+        '''
+        connections = self.__connections
+        timeout = self.timeout if timeout is None else timeout
+        with self.__lock:
+            for attempt in range(2):
+                if connections.http is None:
+                    connections.http = http.client.HTTPConnection(
+                        self.host, self.port, timeout=timeout)
+                elif connections.http.sock is not None:
+                    connections.http.sock.settimeout(timeout)
+                try:
+                    connections.http.request('GET', path)
+                    response = connections.http.getresponse()
+                    body = response.read()
+                    if response.status != 200:
+                        raise DevToolsError(f'DevTools answered {response.status} for {path}')
+                    return json.loads(body)
+                except (http.client.HTTPException, OSError, ValueError) as exc:
+                    connections.http.close()
+                    connections.http = None
+                    if attempt or isinstance(exc, (ValueError, socket.timeout)):
+                        raise DevToolsError(f'Error while requesting {path}') from exc
+        return None
+
+    def version(self) -> dict:
+        '''
+        Get the browser version information.
+
+        Raises:
+            DevToolsError: If the request fails.
+        Returns:
+            dict: The data of the /json/version endpoint.
+        '''
+        return self.__request('/json/version')
+
+    def targets(self, timeout: float = None) -> list[dict]:
+        '''
+        Get the targets (tabs, workers, ...) of the browser.
+        If the client is watching, the live table is returned without any request.
+
+        Args:
+            timeout (float): The timeout of the request in seconds. Defaults to the client one.
+        Raises:
+            DevToolsError: If the request fails.
+        Returns:
+            list[dict]: The targets in the format of the /json/list endpoint.
+        '''
+        if self.watching:
+            with self.__lock:
+                return list(self.__targets.values())
+        return self.__request('/json/list', timeout)
+
+    def subscribe(self, listener) -> None:
+        '''
+        Register a function called with (event, target) on every target event.
+        Listeners run in the watching thread and must not block.
+
+        Args:
+            listener (callable): The function to call.
+        '''
+        self.__listeners.append(listener)
+
+    def watch(self) -> None:
+        '''
+        Start following the target events over the browser WebSocket.
+        The live table is filled with the current targets before returning.
+
+        Raises:
+            DevToolsError: If the WebSocket connection fails.
+        '''
+        if self.watching:
+            return
+        url = self.version().get('webSocketDebuggerUrl')
+        if not url:
+            raise DevToolsError('The browser does not expose a WebSocket endpoint')
+        connections = self.__connections
+        connections.websocket = WebSocket(url, self.timeout)
+        targets = {target['id']: target for target in self.__request('/json/list')}
+        with self.__lock:
+            self.__targets = targets
+        connections.websocket.send(json.dumps({
+            'id': 1, 'method': 'Target.setDiscoverTargets', 'params': {'discover': True}}))
+        connections.thread = threading.Thread(target=self.__listen, daemon=True)
+        connections.thread.start()
+
+    def __listen(self) -> None:
+        '''Apply the target events to the live table until the connection is closed.'''
+        websocket = self.__connections.websocket
+        while True:
+            try:
+                message = json.loads(websocket.receive())
+            except (DevToolsError, ValueError):
+                return
+            event = message.get('method')
+            if event not in TARGET_EVENTS:
+                continue
+            params = message.get('params', {})
+            info = params.get('targetInfo', {})
+            target = {
+                'id': info.get('targetId', params.get('targetId')),
+                'type': info.get('type'),
+                'title': info.get('title'),
+                'url': info.get('url'),
+            }
+            with self.__lock:
+                if event == 'Target.targetDestroyed':
+                    target = self.__targets.pop(target['id'], target)
+                else:
+                    target = {**self.__targets.get(target['id'], {}), **target}
+                    target.setdefault('webSocketDebuggerUrl', self.__websocket_url(target))
+                    self.__targets[target['id']] = target
+            self.__notify(event, target)
+
+    def __websocket_url(self, target: dict) -> str:
+        '''Get the WebSocket url of a target, the events do not include it.'''
+        return f'ws://{self.host}:{self.port}/devtools/{target["type"] or "page"}/{target["id"]}'
+
+    def __notify(self, event: str, target: dict) -> None:
+        '''Call every listener, a failing listener does not stop the others nor the watching.'''
+        for listener in list(self.__listeners):
+            try:
+                listener(event, target)
+            except Exception:  # pylint: disable=broad-except
+                LOGGER.exception('DevTools listener %r failed on %s', listener, event)
+
+    def close(self) -> None:
+        '''Stop watching and close the persistent connections.'''
+        connections = self.__connections
+        if connections.websocket is not None:
+            connections.websocket.close()
+            connections.websocket = None
+        if connections.thread is not None:
+            connections.thread.join(self.timeout)
+            connections.thread = None
+        with self.__lock:
+            if connections.http is not None:
+                connections.http.close()
+                connections.http = None
@@ -0,0 +1,147 @@
+'''
+Discovery implementation for PyBrinf.
+This module is used to find the installed browsers once and keep the results.
+Docstrings are written in Google style.
+'''
+
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from pybrinf.browser import Browser
+from pybrinf.exceptions import BrowserError
+from pybrinf.utilities import Utilities
+
+
+class Installation:
+    '''
+        An installed browser with its resolved data.
+
+        Attributes:
+            browser (Browser): The browser instance, shared by every call.
+            app_path (str): The path of the browser executable.
+            path (str): The path of the default profile or None if it could not be resolved.
+            profiles (list[Profile]): The profiles of the browser.
+            version (str): The version of the browser or None if it could not be resolved.
+    '''
+
+    # pylint: disable=too-few-public-methods
+    def __init__(self, browser: Browser, **kwargs):
+        '''Initialize the Installation instance.'''
+        self.browser = browser
+        self.app_path = kwargs.get('app_path')
+        self.path = kwargs.get('path')
+        self.profiles = kwargs.get('profiles', [])
+        self.version = kwargs.get('version')
+
+    def __repr__(self):
+        '''Get the string representation of the installation.'''
+        return f'Installation(name={self.browser.name}, version={self.version})'
+
+
+class Discovery:
+    '''
+        Cache of the installed browsers of a system.
+        Every supported browser is probed concurrently the first time and the results
+        are kept until the time to live expires or refresh is called.
+    '''
+
+    def __init__(self, os_: str, ttl: float = 300.0, root: str = None):
+        '''
+        Initialize the Discovery instance.
+
+        Args:
+            os_ (str): The system name, e.g. win32, linux.
+            ttl (float): Seconds to keep the results, None keeps them forever. Defaults to 300.
+            root (str): A home directory to find the browsers in, see Browser. Defaults to
+                the current user.
+        '''
+        self.__os = os_
+        self.__ttl = ttl
+        self.__root = root
+        self.__installations = None
+        self.__expires = 0.0
+        self.__lock = threading.Lock()
+
+    @property
+    def expired(self) -> bool:
+        '''Check if the results must be probed again.'''
+        if self.__installations is None:
+            return True
+        return self.__ttl is not None and time.monotonic() >= self.__expires
+
+    def __probe(self, data: dict) -> Installation:
+        '''
+        Probe a single browser.
+
+        Args:
+            data (dict): The browser data.
+        Returns:
+            Installation: The installation or None if the browser is not installed.
+        '''
+        browser = Browser(self.__os, root=self.__root, **data)
+        try:
+            if not browser.installed:
+                return None
+        except BrowserError:
+            return None
+        resolved = {'app_path': browser.app_path}
+        for key, resolve in (('path', lambda: browser.path),
+                             ('profiles', browser.profiles),
+                             ('version', lambda: browser.version)):
+            try:
+                resolved[key] = resolve()
+            except (BrowserError, OSError, KeyError):
+                continue
+        return Installation(browser, **resolved)
+
+    def installations(self, refresh: bool = False) -> list[Installation]:
+        '''
+        Get the installed browsers, probing them only if needed.
+
+        Args:
+            refresh (bool): Probe the browsers again even if the results are fresh.
+        Returns:
+            list[Installation]: The installed browsers in the order of the browsers data.
+        '''
+        with self.__lock:
+            if refresh or self.expired:
+                candidates = [data for data in Utilities.BROWSERS
+                              if self.__os in data['os_support']]
+                with ThreadPoolExecutor(max_workers=max(len(candidates), 1)) as executor:
+                    probes = list(executor.map(self.__probe, candidates))
+                self.__installations = [probe for probe in probes if probe]
+                self.__expires = time.monotonic() + (self.__ttl or 0.0)
+            return list(self.__installations)
+
+    def browsers(self, refresh: bool = False) -> list[Browser]:
+        '''
+        Get the installed browser instances, probing them only if needed.
+
+        Args:
+            refresh (bool): Probe the browsers again even if the results are fresh.
+        Returns:
+            list[Browser]: The installed browsers.
+        '''
+        return [installation.browser for installation in self.installations(refresh)]
+
+    def find(self, name: str) -> Browser:
+        '''
+        Get an installed browser instance from the fresh results without probing.
+
+        Args:
+            name (str): The name of the browser.
+        Returns:
+            Browser: The browser or None if it is not known to be installed.
+        '''
+        if self.expired:
+            return None
+        for installation in self.__installations:
+            if installation.browser.name.lower() == name.lower():
+                return installation.browser
+        return None
+
+    def refresh(self) -> None:
+        '''Forget the results, the next call probes the browsers again.'''
+        with self.__lock:
+            self.__installations = None
@@ -19,3 +19,6 @@ class ParserError(Exception):
 
 class FileError(Exception):
     '''Raise then the file handling and managements fails'''
+
+class DevToolsError(Exception):
+    '''Raise when the communication with the browser dev tools fails.'''
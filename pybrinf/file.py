@@ -1,97 +1,318 @@
-# pylint: skip-file
 '''
-Implementation of file management to export data to JSON file.
-NOTE: Module is in alpha development.
+File implementation for PyBrinf.
+This module is used to export items (history, downloads, tabs, ...) to files.
+Items are streamed in chunks, so the memory used does not depend on the export size.
+Docstrings are written in Google style.
 '''
 
-from json import dumps
-from os import remove
-from os.path import join, exists
+import io
+import os
+import csv
+import gzip
+import json
+import sqlite3
+from datetime import datetime
+from itertools import islice
+
+from pybrinf.item import Item
+from pybrinf.columnar import ColumnarWriter, ArrowWriter, ParquetWriter, columnar_format
 from pybrinf.exceptions import FileError
 
-class File:
-    '''Class File'''
-    __indentation = 4
-    __path = '/saves/'
-
-    '''Attributes and Parameters'''
-    __append = 'a'
-    __create = 'x'
-    __write = 'w'
-    __text = 't'
-    __binary = 'b'
-
-    def __init__(self) -> None:
-        '''INFO: This istance doesnt contains attributes for now'''
-        pass
-    
-    def __getType(self) -> None:
-        '''
-        Get class type instead
+# Formats by file extension, the compression extension is removed first.
+EXTENSIONS = {
+    '.ndjson': 'ndjson',
+    '.jsonl': 'ndjson',
+    '.csv': 'csv',
+    '.sqlite': 'sqlite',
+    '.db': 'sqlite',
+    '.pbc': 'pbc',
+    '.arrow': 'arrow',
+    '.feather': 'arrow',
+    '.parquet': 'parquet',
+}
+COMPRESSIONS = {
+    '.gz': 'gzip',
+    '.zst': 'zstd',
+}
 
-        Args:
-            None.
-        
-        Returns:
-            None.
 
-        NOTE: This function is useless and haven't affect the code.
-        '''
-        return type(File)
-    
-    def __encoding(self) -> str:
-        '''
-        Encoding file type
+def to_row(item) -> dict:
+    '''
+    Get the fields of an item or a dictionary.
 
-        Args:
-            None
+    Args:
+        item (Item, dict): The item to convert.
+    Raises:
+        FileError: If the item cannot be exported.
+    Returns:
+        dict: The field values by name.
+    '''
+    if isinstance(item, Item):
+        return item.to_dict()
+    if isinstance(item, dict):
+        return item
+    raise FileError(f'Cannot export {type(item).__name__} objects.')
 
-        Returns:
-            Encoding type
-        '''
-        return 'utf-8' | 'ascii' | 'big-5' | 'latin-1'
 
-    def create(self, path: __path, file: ..., filename: str) -> dict:
-        '''
-        Create a file
+def to_json(value: object) -> object:
+    '''Convert the values the json module does not support.'''
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (bytes, bytearray)):
+        return value.hex()
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
 
-        Args:
-            filename (str): Any filename.
-            permission (str)
-        Returns:
-            dict: The json file created.
-        '''
+
+def to_scalar(value: object) -> object:
+    '''Convert a value to a type a CSV cell or a SQLite column can hold.'''
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (list, tuple, dict)):
+        return json.dumps(value, default=to_json)
+    return value
+
+
+def open_stream(path: str, compression: str, overwrite: bool,
+                stream: io.BufferedIOBase = None) -> io.BufferedIOBase:
+    '''
+    Open a binary file for writing, compressed on the fly.
+
+    Args:
+        path (str): The path of the file.
+        compression (str): None, gzip or zstd.
+        overwrite (bool): Replace the file if it exists.
+        stream (BufferedIOBase): A binary stream to write to instead of the file, e.g. stdout.
+    Raises:
+        FileError: If the file cannot be created or the compression is not available.
+    Returns:
+        BufferedIOBase: The stream to write to.
+    '''
+    mode = 'wb' if overwrite else 'xb'
+    try:
+        if compression is None:
+            return stream if stream is not None else open(path, mode)
+        if compression == 'gzip':
+            if stream is not None:
+                return gzip.GzipFile(fileobj=stream, mode='wb')
+            return gzip.open(path, mode)
+        if compression == 'zstd':
+            try:
+                import zstandard  # pylint: disable=import-outside-toplevel
+            except ImportError as exc:
+                raise FileError('zstd compression requires the zstandard package.') from exc
+            if stream is not None:
+                return zstandard.ZstdCompressor().stream_writer(stream, closefd=False)
+            return zstandard.ZstdCompressor().stream_writer(open(path, mode))
+    except OSError as exc:
+        raise FileError(f'Error while creating the file {path}') from exc
+    raise FileError(f'Compression {compression} is not supported.')
+
+
+class TextWriter:
+    '''
+        Base of the text writers, the file is a path or a binary stream.
+        Streams are flushed after every chunk and left open.
+    '''
+
+    # pylint: disable=too-few-public-methods
+    newline = None
+
+    def __init__(self, path: str, compression: str = None, overwrite: bool = False, **kwargs):
+        '''Open the file.'''
+        stream = kwargs.get('stream')
+        self._file = io.TextIOWrapper(
+            open_stream(path, compression, overwrite, stream),
+            encoding='utf-8', newline=self.newline)
+        self.__stream = stream is not None
+        self.__detach = self.__stream and compression is None
+
+    def _flush(self) -> None:
+        '''Flush a chunk to the stream, so readers get the rows as they are produced.'''
+        if self.__stream:
+            self._file.flush()
+
+    def close(self) -> None:
+        '''Flush and close the file, a stream given to the writer is left open.'''
+        if self.__detach:
+            self._file.flush()
+            self._file.detach()
+        else:
+            self._file.close()
+
+
+class NdjsonWriter(TextWriter):
+    '''Writes one JSON object per line.'''
+
+    newline = '\n'
+
+    def write(self, rows: list[dict]) -> None:
+        '''Write a chunk of rows.'''
+        self._file.write(''.join(
+            json.dumps(row, default=to_json, ensure_ascii=False) + '\n' for row in rows))
+        self._flush()
+
+
+class CsvWriter(TextWriter):
+    '''Writes a CSV file with the fields of the first row as header.'''
+
+    newline = ''
+
+    def __init__(self, path: str, compression: str = None, overwrite: bool = False, **kwargs):
+        '''Open the file.'''
+        super().__init__(path, compression, overwrite, **kwargs)
+        self.__writer = None
+
+    def write(self, rows: list[dict]) -> None:
+        '''Write a chunk of rows, the fields missing in the header are ignored.'''
+        if self.__writer is None:
+            self.__writer = csv.DictWriter(self._file, list(rows[0]), extrasaction='ignore')
+            self.__writer.writeheader()
+        self.__writer.writerows(
+            {name: to_scalar(value) for name, value in row.items()} for row in rows)
+        self._flush()
+
+
+class SqliteWriter:
+    '''Writes the rows into a table of a SQLite database, one transaction per chunk.'''
+
+    def __init__(self, path: str, compression: str = None, overwrite: bool = False, **kwargs):
+        '''Create the database.'''
+        if compression is not None:
+            raise FileError('SQLite exports cannot be compressed.')
+        if os.path.exists(path):
+            if not overwrite:
+                raise FileError(f'The file {path} already exists.')
+            os.remove(path)
+        self.__table = kwargs.get('table') or 'items'
+        self.__columns = None
+        self.__insert = None
         try:
-            fileObject = dumps(file, self.__indentation)
-            with open(join(path, filename), self.__create) as file:
-                file.write(fileObject)
-        except Exception as err:
-            raise FileError('Error while creating the file') from err
-    
-    def delete(self, file: str) -> None:
-        '''
-        Delete a file
+            self.__conn = sqlite3.connect(path)
+        except sqlite3.Error as exc:
+            raise FileError(f'Error while creating the file {path}') from exc
+
+    @staticmethod
+    def __quote(name: str) -> str:
+        '''Quote an SQL identifier.'''
+        return '"' + name.replace('"', '""') + '"'
+
+    def write(self, rows: list[dict]) -> None:
+        '''Write a chunk of rows, the fields missing in the table are ignored.'''
+        if self.__columns is None:
+            self.__columns = list(rows[0])
+            columns = ', '.join(self.__quote(column) for column in self.__columns)
+            self.__conn.execute(f'CREATE TABLE {self.__quote(self.__table)} ({columns})')
+            self.__insert = (
+                f'INSERT INTO {self.__quote(self.__table)} VALUES '
+                f'({", ".join("?" for _ in self.__columns)})')
+        with self.__conn:
+            self.__conn.executemany(self.__insert, (
+                [to_scalar(row.get(column)) for column in self.__columns] for row in rows))
+
+    def close(self) -> None:
+        '''Close the database.'''
+        self.__conn.close()
+
+
+WRITERS = {
+    'ndjson': NdjsonWriter,
+    'csv': CsvWriter,
+    'sqlite': SqliteWriter,
+    'pbc': ColumnarWriter,
+    'arrow': ArrowWriter,
+    'parquet': ParquetWriter,
+}
+# Formats that can be written to a stream.
+STREAMS = ('ndjson', 'csv')
+# The default number of items written at once.
+CHUNK_SIZE = 1000
+
+
+class Exporter:
+    '''
+        Streams items to a file in chunks.
 
         Args:
-            filename (str): Any good file name.
-        Returns:
-            None
+            path (str): The path of the file.
+            fmt (str): One of WRITERS or columnar, which is parquet when pyarrow is
+                installed and pbc otherwise. Defaults to the one of the file extension.
+            compression (str): gzip or zstd. Defaults to the one of the file extension.
+            chunk_size (int): The number of items written at once. Defaults to CHUNK_SIZE.
+            overwrite (bool): Replace the file if it exists. Defaults to False.
+            table (str): The table name of SQLite exports. Defaults to items.
+            stream (BufferedIOBase): A binary stream to write to instead of the path, e.g.
+                sys.stdout.buffer. Only ndjson and csv can be streamed.
+    '''
+
+    def __init__(self, path: str, fmt: str = None, compression: str = None, **kwargs):
         '''
-        try:
-            if self.existence(file) == True:
-                remove(file)
-            else:
-                pass
-        except Exception as err:
-            raise FileError('Error while deleting the file') from err
-    
-    def existence(self, filename: str) -> str:
+        Initialize the Exporter instance and open the file.
+
+        Raises:
+            FileError: If the format is unknown or the file cannot be created.
         '''
-        Verify if file exists
+        name, extension = os.path.splitext(path.lower())
+        if extension in COMPRESSIONS:
+            compression = compression or COMPRESSIONS[extension]
+            extension = os.path.splitext(name)[1]
+        fmt = fmt or EXTENSIONS.get(extension)
+        if fmt == 'columnar':
+            fmt = columnar_format()
+        if fmt not in WRITERS:
+            raise FileError(f'Unknown export format for {path}.')
+        if kwargs.get('stream') is not None and fmt not in STREAMS:
+            raise FileError(f'The {fmt} format cannot be written to a stream.')
+        self.path = path
+        self.format = fmt
+        self.chunk_size = kwargs.pop('chunk_size', CHUNK_SIZE)
+        self.count = 0
+        self.__writer = WRITERS[fmt](path, compression=compression, **kwargs)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def write(self, items) -> int:
+        '''
+        Write items, consuming the iterable one chunk at a time.
 
         Args:
-            filename (str): File name.
+            items (iterable of Item or dict): The items to write.
+        Raises:
+            FileError: If an item cannot be exported.
         Returns:
-            str: Message if exists or no.
+            int: The number of items written.
         '''
-        return True if exists(filename) else print(f'{filename} doesnt exists.')
\ No newline at end of file
+        items = iter(items)
+        written = 0
+        while True:
+            chunk = [to_row(item) for item in islice(items, self.chunk_size)]
+            if not chunk:
+                break
+            self.__writer.write(chunk)
+            written += len(chunk)
+        self.count += written
+        return written
+
+    def close(self) -> None:
+        '''Flush and close the file.'''
+        self.__writer.close()
+
+
+def export(items, path: str, **kwargs) -> int:
+    '''
+    Stream items to a file.
+
+    Args:
+        items (iterable of Item or dict): The items to write, e.g. Brinf.iter_history().
+        path (str): The path of the file, the extension selects the format and compression.
+        **kwargs: The options of Exporter.
+    Raises:
+        FileError: If the file cannot be written.
+    Returns:
+        int: The number of items written.
+    '''
+    with Exporter(path, **kwargs) as exporter:
+        return exporter.write(items)
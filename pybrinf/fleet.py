@@ -0,0 +1,245 @@
+'''
+Fleet implementation for PyBrinf.
+This module is used to extract the browsers data of many home directories at once,
+e.g. the mounted disks of several machines.
+Docstrings are written in Google style.
+'''
+
+import os
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from pybrinf.browser import Browser
+from pybrinf.exceptions import BrinfError, BrowserError
+from pybrinf.utilities import Utilities
+
+KINDS = ('history', 'downloads', 'sessions')
+
+
+class FleetResult:
+    '''
+        The data of a single profile of a root.
+
+        Attributes:
+            root (str): The home directory of the profile.
+            browser (str): The full name of the browser.
+            profile (str): The folder name of the profile.
+            items (dict): The extracted items by kind.
+            errors (dict): The error messages by kind, for the kinds that failed.
+            done (int): The profiles of the root extracted so far, this one included.
+            total (int): The profiles found in the root.
+    '''
+
+    # pylint: disable=too-few-public-methods,too-many-instance-attributes
+    def __init__(self, root: str, **kwargs):
+        '''Initialize the FleetResult instance.'''
+        self.root = root
+        self.browser = kwargs.get('browser')
+        self.profile = kwargs.get('profile')
+        self.items = kwargs.get('items', {})
+        self.errors = kwargs.get('errors', {})
+        self.done = kwargs.get('done', 0)
+        self.total = kwargs.get('total', 0)
+
+    def __repr__(self):
+        '''Get the string representation of the result.'''
+        return (f'FleetResult(root={self.root}, browser={self.browser}, '
+                f'profile={self.profile}, progress={self.done}/{self.total})')
+
+    @property
+    def finished(self) -> bool:
+        '''Check if every profile of the root has been extracted.'''
+        return self.done == self.total
+
+
+def detect_system(root: str) -> str:
+    '''
+    Guess the system of a home directory from its folders.
+
+    Args:
+        root (str): The home directory.
+    Returns:
+        str: win32 if the directory has an AppData folder, linux otherwise.
+    '''
+    return 'win32' if os.path.isdir(os.path.join(root, 'AppData')) else 'linux'
+
+
+def scan_root(root: str, os_: str = None, browsers: list[dict] = None) -> list[tuple]:
+    '''
+    Find the browser profiles of a home directory.
+
+    Args:
+        root (str): The home directory.
+        os_ (str): The system of the home directory. Defaults to the detected one.
+        browsers (list of dict): The browser definitions. Defaults to the registered ones.
+    Returns:
+        list[tuple]: The (browser data, profile path) pairs found.
+    '''
+    os_ = os_ or detect_system(root)
+    found = []
+    for data in browsers or Utilities.BROWSERS:
+        if os_ not in data['os_support']:
+            continue
+        browser = Browser(os_, root=root, **data)
+        try:
+            if not browser.installed:
+                continue
+            profiles = browser.profiles()
+        except (BrowserError, KeyError):
+            continue
+        found += [(data, profile.path) for profile in profiles]
+    return found
+
+
+def session_tabs(browser: Browser, profile, directory: str) -> list:
+    '''
+    Get the tabs of the last session of a profile, tagged by profile.
+
+    Args:
+        browser (Browser): The browser of the profile.
+        profile (Profile): The profile.
+        directory (str): The folder name of the profile.
+    Raises:
+        SessionError: If the session cannot be read.
+    Returns:
+        list[SessionTab]: The tabs of the session.
+    '''
+    tabs = browser.session(profile).tabs()
+    for tab in tabs:
+        tab.profile = directory
+    return tabs
+
+
+def extract_profile(root: str, os_: str, found: tuple, *,
+                    kinds: tuple, options: dict) -> tuple[dict, dict]:
+    '''
+    Extract the data of a single profile, runs in the worker processes.
+
+    Args:
+        root (str): The home directory.
+        os_ (str): The system of the home directory.
+        found (tuple): The (browser data, profile path) pair of the profile, see scan_root.
+        kinds (tuple of str): The data to extract, any of KINDS.
+        options (dict): The arguments of the history and downloads methods.
+    Raises:
+        BrowserError: If the browser does not find the profile any more.
+    Returns:
+        tuple[dict, dict]: The items and the error messages by kind.
+    '''
+    data, path = found
+    browser = Browser(os_, root=root, **data)
+    directory = os.path.basename(path)
+    profile = next((item for item in browser.profiles() if item.path == path), None)
+    if profile is None:
+        # Without it the methods would read the default profile instead.
+        raise BrowserError(f'The profile {path} could not be found.')
+    items, errors = {}, {}
+    for kind in kinds:
+        try:
+            if kind == 'sessions':
+                items[kind] = session_tabs(browser, profile, directory)
+            else:
+                items[kind] = getattr(browser, kind)(profile=profile, **options)
+        except Exception as exc:  # pylint: disable=broad-except
+            # A damaged profile must not stop the rest of the fleet.
+            errors[kind] = f'{type(exc).__name__}: {exc}'
+    return items, errors
+
+
+class Fleet:
+    '''
+        Bulk extraction over many home directories.
+        Each root is scanned for browser profiles and every profile is extracted in a
+        bounded process pool, so the throughput scales with the number of cores.
+    '''
+
+    def __init__(self, roots: list[str], os_: str = None, workers: int = None):
+        '''
+        Initialize the Fleet instance.
+
+        Args:
+            roots (list of str): The home directories to process.
+            os_ (str): The system of the home directories. Defaults to detecting it per root.
+            workers (int): The maximum number of processes. Defaults to the number of cores.
+        '''
+        self.roots = list(roots)
+        self.__os = os_
+        self.__workers = workers
+
+    def profiles(self) -> dict[str, list[tuple]]:
+        '''
+        Find the browser profiles of every root, without extracting them.
+
+        Returns:
+            dict: The (browser data, profile path) pairs by root.
+        '''
+        return {root: scan_root(root, self.__os) for root in self.roots}
+
+    def extract(self, kinds: tuple = KINDS, **kwargs):
+        '''
+        Extract the data of every profile of every root.
+        Results are yielded as soon as each profile is done, with the progress of its root.
+
+        Args:
+            kinds (tuple of str): The data to extract, any of KINDS. Defaults to all.
+            **kwargs: The arguments of the history and downloads methods, e.g. limit.
+        Raises:
+            BrinfError: If a data kind is not supported.
+        Yields:
+            FleetResult: The data of a profile.
+        '''
+        unknown = set(kinds) - set(KINDS)
+        if unknown:
+            raise BrinfError(f'Cannot extract {", ".join(sorted(unknown))} from the fleet.')
+        kwargs.pop('profile', None)
+        browsers = list(Utilities.BROWSERS)
+        executor = ProcessPoolExecutor(max_workers=self.__workers)
+        try:
+            pending = {executor.submit(scan_root, root, self.__os, browsers): (root, None)
+                       for root in self.roots}
+            progress = {}
+            while pending:
+                finished = wait(pending, return_when=FIRST_COMPLETED)[0]
+                for future in finished:
+                    root, found = pending.pop(future)
+                    if found is not None:
+                        progress[root][0] += 1
+                        yield self.__result(future, root, found, progress[root], kinds)
+                        continue
+                    try:
+                        profiles = future.result()
+                    except Exception as exc:  # pylint: disable=broad-except
+                        yield FleetResult(root, errors={'scan': f'{type(exc).__name__}: {exc}'})
+                        continue
+                    progress[root] = [0, len(profiles)]
+                    os_ = self.__os or detect_system(root)
+                    for found in profiles:
+                        pending[executor.submit(extract_profile, root, os_, found,
+                                                kinds=tuple(kinds), options=kwargs)] = (root, found)
+                    if not profiles:
+                        yield FleetResult(root)
+        finally:
+            # A consumer that stops early does not wait for the queued profiles.
+            executor.shutdown(cancel_futures=True)
+
+    @staticmethod
+    def __result(future, root: str, found: tuple, progress: list, kinds: tuple) -> FleetResult:
+        '''
+        Build the result of an extracted profile.
+
+        Args:
+            future (Future): The finished extract_profile task.
+            root (str): The home directory of the profile.
+            found (tuple): The (browser data, profile path) pair of the profile.
+            progress (list): The extracted and total profiles of the root.
+            kinds (tuple of str): The extracted data, to report a crashed worker.
+        Returns:
+            FleetResult: The data or the errors of the profile.
+        '''
+        data, path = found
+        try:
+            items, errors = future.result()
+        except Exception as exc:  # pylint: disable=broad-except
+            items, errors = {}, {kind: f'{type(exc).__name__}: {exc}' for kind in kinds}
+        return FleetResult(
+            root, browser=data['fullname'], profile=os.path.basename(path),
+            items=items, errors=errors, done=progress[0], total=progress[1])
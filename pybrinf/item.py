@@ -4,6 +4,8 @@ The Item class is used to store different types of items (Downloads, History, et
 Docstrings are written in Google style.
 '''
 
+import mimetypes
+
 from pybrinf.exceptions import SystemBrinfError
 from pybrinf.utilities import Utilities
 
@@ -13,9 +15,12 @@ if Utilities.system() == 'Windows':
 class Item:
     '''Simulates a simple item.'''
 
+    __slots__ = ('browser', 'profile')
+
     def __init__(self, browser: str):
         '''Initialize the Item instance.'''
         self.browser = browser
+        self.profile = None
 
     def __str__(self):
         '''Get the string representation of the object.'''
@@ -28,9 +33,46 @@ class Item:
     def __eq__(self, other: object) -> bool:
         '''Compare the item with another item.'''
 
+    def to_dict(self) -> dict:
+        '''
+        Get the fields of the item, nested items are converted too.
+
+        Returns:
+            dict: The field values by name.
+        '''
+        data = {}
+        for cls in reversed(type(self).__mro__):
+            for name in getattr(cls, '__slots__', ()):
+                data[name] = getattr(self, name, None)
+        data.update(getattr(self, '__dict__', {}))
+        for name, value in data.items():
+            if isinstance(value, Item):
+                data[name] = value.to_dict()
+            elif isinstance(value, list):
+                data[name] = [item.to_dict() if isinstance(item, Item) else item for item in value]
+        return data
+
+# Names of the download states and danger types of chromium (DownloadState and
+# DownloadDangerType), of the states of the Firefox metaData annotation and of its verdicts.
+DOWNLOAD_STATES = {0: 'in_progress', 1: 'complete', 2: 'cancelled', 3: 'interrupted',
+                   4: 'interrupted'}
+MOZ_DOWNLOAD_STATES = {0: 'in_progress', 1: 'complete', 2: 'interrupted', 3: 'cancelled',
+                       4: 'interrupted', 6: 'blocked', 8: 'blocked'}
+DANGER_TYPES = {0: 'not_dangerous', 1: 'dangerous_file', 2: 'dangerous_url',
+                3: 'dangerous_content', 4: 'maybe_dangerous_content', 5: 'uncommon_content',
+                6: 'user_validated', 7: 'dangerous_host', 8: 'potentially_unwanted',
+                9: 'allowlisted_by_policy'}
+MOZ_DANGER_TYPES = {None: 'not_dangerous', 'MALWARE': 'dangerous_content',
+                    'UNCOMMON': 'uncommon_content', 'POTENTIALLY_UNWANTED': 'potentially_unwanted',
+                    'INSECURE': 'dangerous_url'}
+
 class Downloaded(Item):
-    '''Simulates a downloaded item.'''
+    '''
+        Simulates a downloaded item.
+        The url is the final one of the redirect chain, which is in order from the first url.
+    '''
 
+    # pylint: disable=too-many-instance-attributes
     def __init__(self, *args):
         '''Initialize the Downloaded instance.'''
         super().__init__(args[0])
@@ -38,14 +80,19 @@ class Downloaded(Item):
         self.path = args[2]
         if 'Firefox' in args[0]:
             self.start_time = Utilities.unix_to_date(args[3])
-            self.end_time = Utilities.unix_to_date(args[4])
+            self.end_time = Utilities.unix_to_date(args[4]) if args[4] else None
+            states, dangers = MOZ_DOWNLOAD_STATES, MOZ_DANGER_TYPES
         else:
             self.start_time = Utilities.webkit_to_date(args[3])
-            self.end_time = Utilities.webkit_to_date(args[4])
-        self.end_time = Utilities.webkit_to_date(args[4])
+            self.end_time = Utilities.webkit_to_date(args[4]) if args[4] else None
+            states, dangers = DOWNLOAD_STATES, DANGER_TYPES
         self.tab_url = args[5]
-        self.url = args[6]
-        # self.state = args[7] TODO: Add state
+        self.chain = args[6].split('\n') if args[6] else []
+        self.url = self.chain[-1] if self.chain else None
+        self.state = states.get(args[7], 'unknown')
+        self.danger = dangers.get(args[8], 'unknown')
+        # Firefox does not store the MIME type, it is guessed from the file name.
+        self.mime = args[9] or mimetypes.guess_type(self.path or '')[0]
 
     def __eq__(self, other: object) -> bool:
         '''Compare the downloaded item with another downloaded item.'''
@@ -84,9 +131,70 @@ class History(Item):
         '''Check if the tab is from a specific domain.'''
         return domain in self.url
 
+class Bookmark(Item):
+    '''Simulates a bookmark.'''
+
+    def __init__(self, *args):
+        '''Initialize the Bookmark instance.'''
+        super().__init__(args[0])
+        self.id = args[1]
+        self.guid = args[2]
+        self.url = args[3]
+        self.title = args[4]
+        self.folder = args[5]
+        if 'Firefox' in self.browser:
+            self.added = Utilities.unix_to_date(args[6])
+        else:
+            self.added = Utilities.webkit_to_date(int(args[6] or 0))
+
+    def __eq__(self, other: object) -> bool:
+        '''Compare the bookmark with another bookmark.'''
+        return self.url == other.url and self.folder == other.folder
+
+    def __repr__(self) -> str:
+        return f'<Bookmark {self.folder}/{self.title} {self.url}>'
+
+class SearchTerm(Item):
+    '''Simulates a search term with its aggregates.'''
+
+    def __init__(self, *args):
+        '''Initialize the SearchTerm instance.'''
+        super().__init__(args[0])
+        self.term = args[1]
+        self.count = args[2]
+        if not args[3]:
+            self.last_used = None
+        elif 'Firefox' in self.browser:
+            self.last_used = Utilities.unix_to_date(args[3])
+        else:
+            self.last_used = Utilities.webkit_to_date(args[3])
+        self.period = args[4]
+
+    def __eq__(self, other: object) -> bool:
+        '''Compare the search term with another search term.'''
+        return self.term == other.term and self.period == other.period
+
+    def __repr__(self) -> str:
+        return f'<SearchTerm {self.term!r} count={self.count}>'
+
+class SessionNavigation(Item):
+    '''Simulates a navigation entry of a session tab.'''
+
+    # pylint: disable=too-few-public-methods
+    def __init__(self, *args):
+        '''Initialize the SessionNavigation instance.'''
+        super().__init__(args[0])
+        self.index = args[1]
+        self.url = args[2]
+        self.title = args[3]
+
+    def __repr__(self) -> str:
+        return f'<SessionNavigation {self.index} {self.url}>'
+
 class SessionTab(Item):
     '''Simulates a tab from a session.'''
 
+    # pylint: disable=too-many-instance-attributes
     def __init__(self, *args):
         '''Initialize the Tab instance.'''
         super().__init__(args[0])
@@ -97,6 +205,11 @@ class SessionTab(Item):
         self.pinned = False
         self.closed = False
         self.active = False
+        self.window_id = None
+        self.selected_index = -1
+        self.navigations = []
+        self.last_active_time = None
+        self.close_time = None
 
     def __eq__(self, other: object) -> bool:
         '''Compare the tab with another tab.'''
@@ -107,13 +220,109 @@ class SessionTab(Item):
         '''Check if the tab is active.'''
         return self.active
 
+class SessionWindow(Item):
+    '''Simulates a window from a session.'''
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(self, *args):
+        '''Initialize the SessionWindow instance.'''
+        super().__init__(args[0])
+        self.id = args[1]
+        self.tabs = []
+        self.selected_index = 0
+        self.type = 0
+        self.bounds = None
+        self.show_state = 0
+        self.active = False
+        self.closed = False
+        self.close_time = None
+
+    def __eq__(self, other: object) -> bool:
+        '''Compare the window with another window.'''
+        return self.id == other.id and self.browser == other.browser
+
+    def __repr__(self) -> str:
+        return f'<SessionWindow {self.id} tabs={len(self.tabs)}>'
+
+    @property
+    def selected_tab(self) -> SessionTab:
+        '''Get the selected tab of the window, or None if the window has no tabs.'''
+        if not self.tabs:
+            return None
+        return self.tabs[min(max(self.selected_index, 0), len(self.tabs) - 1)]
+
 class Tab(Item):
-    '''Simulates a tab from devtools.'''
+    '''
+        Simulates a tab from devtools.
+        Only the fields of FIELDS are stored, in slots, so polling many tabs stays cheap.
+
+        Attributes:
+            id (str): The target id.
+            type (str): The target type, e.g. page.
+            title (str): The title of the tab.
+            url (str): The url of the tab.
+            description (str): The description of the target.
+            parent_id (str): The id of the parent target.
+            favicon_url (str): The url of the tab icon.
+            devtools_url (str): The url of the DevTools frontend.
+            websocket_url (str): The url of the target WebSocket.
+
+        The DevTools JSON names (webSocketDebuggerUrl, devtoolsFrontendUrl, ...) of the
+        attributes are kept as read-only aliases.
+    '''
+
+    # DevTools JSON keys by attribute name.
+    FIELDS = {
+        'id': 'id',
+        'type': 'type',
+        'title': 'title',
+        'url': 'url',
+        'description': 'description',
+        'parent_id': 'parentId',
+        'favicon_url': 'faviconUrl',
+        'devtools_url': 'devtoolsFrontendUrl',
+        'websocket_url': 'webSocketDebuggerUrl',
+    }
+    DEFAULT_FIELDS = ('id', 'type', 'title', 'url', 'websocket_url')
+    # Attribute names by DevTools JSON key, for the aliases.
+    ALIASES = {key: name for name, key in FIELDS.items() if key != name}
+
+    __slots__ = tuple(FIELDS)
 
     # pylint: disable=too-few-public-methods
     def __init__(self, browser: str, **kwargs):
+        '''Initialize the Tab instance from the attribute values, missing ones are None.'''
         super().__init__(browser)
-        self.__dict__.update(kwargs)
+        for name in self.__slots__:
+            setattr(self, name, kwargs.get(name))
+
+    @classmethod
+    def from_json(cls, browser: str, data: dict, fields: tuple = DEFAULT_FIELDS) -> 'Tab':
+        '''
+        Create a tab from a target of the DevTools JSON, keeping only some fields.
+
+        Args:
+            browser (str): The full name of the browser.
+            data (dict): The target data.
+            fields (tuple of str): The attributes to keep. Defaults to DEFAULT_FIELDS.
+        Returns:
+            Tab: The tab.
+        '''
+        return cls(browser, **{name: data.get(cls.FIELDS[name]) for name in fields})
+
+    def __getattr__(self, name: str) -> object:
+        '''Get an attribute by its DevTools JSON name, e.g. webSocketDebuggerUrl.'''
+        if name in Tab.ALIASES:
+            return getattr(self, Tab.ALIASES[name])
+        raise AttributeError(f"'Tab' object has no attribute '{name}'")
+
+    def __eq__(self, other: object) -> bool:
+        '''Compare the tab with another tab.'''
+        return isinstance(other, Tab) and self.id == other.id and self.browser == other.browser
+
+    def __hash__(self) -> int:
+        '''Get the hash of the tab.'''
+        return hash((self.browser, self.id))
 
     def __repr__(self) -> str:
         return f'<Tab {self.id} {self.browser}>'
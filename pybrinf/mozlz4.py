@@ -0,0 +1,134 @@
+'''
+mozLz4 implementation for PyBrinf.
+This module reads the mozLz4 files of Firefox (sessionstore.jsonlz4, recovery.jsonlz4, ...):
+a magic header, the decompressed size and a single LZ4 block. The block is decoded in pure
+Python into a buffer of the final size, or by the lz4 package when it is installed.
+Docstrings are written in Google style.
+'''
+
+import struct
+
+from pybrinf.exceptions import ParserError
+
+MAGIC = b'mozLz40\x00'
+SIZE = struct.Struct('<I')
+
+
+def accelerated():
+    '''Get the decompress function of the lz4 package, None if it is not installed.'''
+    try:
+        import lz4.block  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return None
+    return lz4.block.decompress
+
+
+def decompress_block(source: bytes, size: int) -> bytearray:
+    '''
+    Decode an LZ4 block into a preallocated buffer.
+    Literals and non overlapping matches are copied with slices, overlapping matches
+    (a repeated pattern shorter than the match) by repeating the pattern.
+
+    Args:
+        source (bytes): The LZ4 block.
+        size (int): The decompressed size.
+    Raises:
+        ParserError: If the block is corrupted or does not decode to size bytes.
+    Returns:
+        bytearray: The decompressed data.
+    '''
+    # pylint: disable=too-many-branches
+    source = memoryview(source)
+    output = bytearray(size)
+    end = len(source)
+    position = 0
+    written = 0
+    try:
+        while position < end:
+            token = source[position]
+            position += 1
+            length = token >> 4
+            if length == 15:
+                while True:
+                    byte = source[position]
+                    position += 1
+                    length += byte
+                    if byte != 255:
+                        break
+            if length:
+                if written + length > size or position + length > end:
+                    raise ParserError('Invalid LZ4 block. Literals out of bounds')
+                output[written:written + length] = source[position:position + length]
+                position += length
+                written += length
+            if position >= end:
+                # The last sequence only has literals.
+                break
+            offset = source[position] | source[position + 1] << 8
+            position += 2
+            length = (token & 15) + 4
+            if length == 19:
+                while True:
+                    byte = source[position]
+                    position += 1
+                    length += byte
+                    if byte != 255:
+                        break
+            if offset == 0 or offset > written or written + length > size:
+                raise ParserError('Invalid LZ4 block. Match out of bounds')
+            start = written - offset
+            if offset >= length:
+                output[written:written + length] = output[start:start + length]
+            else:
+                pattern = output[start:written]
+                output[written:written + length] = (pattern * (length // offset + 1))[:length]
+            written += length
+    except IndexError as exc:
+        raise ParserError('Invalid LZ4 block. Unexpected end of data') from exc
+    if written != size:
+        raise ParserError(f'Invalid LZ4 block. {written} bytes decoded, {size} expected')
+    return output
+
+
+def decompress(data: bytes) -> bytes:
+    '''
+    Decompress the content of a mozLz4 file.
+
+    Args:
+        data (bytes): The content of the file.
+    Raises:
+        ParserError: If the content is not mozLz4 or is corrupted.
+    Returns:
+        bytes: The decompressed data.
+    '''
+    header = len(MAGIC) + SIZE.size
+    if len(data) < header or data[:len(MAGIC)] != MAGIC:
+        raise ParserError('Invalid mozLz4 file. Magic does not match')
+    size, = SIZE.unpack_from(data, len(MAGIC))
+    block = memoryview(data)[header:]
+    fast = accelerated()
+    if fast is not None:
+        try:
+            return fast(block, uncompressed_size=size)
+        except Exception as exc:  # pylint: disable=broad-except
+            raise ParserError('Invalid mozLz4 file. Corrupted block') from exc
+    return decompress_block(block, size)
+
+
+def read(path: str) -> bytes:
+    '''
+    Read and decompress a mozLz4 file.
+
+    Args:
+        path (str): The path of the file.
+    Raises:
+        ParserError: If the file is not found, not mozLz4 or is corrupted.
+    Returns:
+        bytes: The decompressed data.
+    '''
+    try:
+        with open(path, 'rb') as file:
+            data = file.read()
+    except FileNotFoundError as exc:
+        raise ParserError(f'File {path} not found') from exc
+    return decompress(data)
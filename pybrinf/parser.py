@@ -4,32 +4,32 @@
     Docstrings are written in Google style.
 '''
 
-import os
+import struct
 import _io
 
-from pybrinf.reader import Reader
+from pybrinf.reader import Reader, UINT16, UINT32_PAIR
+from pybrinf.stats import stage
 from pybrinf.exceptions import ParserError
-from pybrinf.commands import (
-    CommandType,
-    Command,
-    CommandTabNavigation,
-    SetSelectedNavigationIndex,
-    TabClosed,
-    SetPinnedState
-)
+from pybrinf.commands import Command, COMMANDS
+
+COMMAND_HEADER = struct.Struct('<HB') # Command size (id included) and command id
 
 class Parser:
     '''Parser class core.'''
     __signature = 0x53534E53 # b'SNSS'
 
-    def __init__(self, file: str):
+    def __init__(self, file: str, table: dict = None, browser: str = None):
         '''
         Initialize the Parser instance
 
         Args:
             file (str): The file to parse
+            table (dict): The command classes by command id. Defaults to the Session commands.
+            browser (str): The browser the file belongs to, used by pybrinf.stats
         '''
         self.__file = file
+        self.__table = COMMANDS if table is None else table
+        self.__browser = browser
 
     def __open(self) -> _io.BufferedReader:
         '''
@@ -45,55 +45,39 @@ class Parser:
         except FileNotFoundError as exc:
             raise ParserError(f'File {self.__file} not found') from exc
 
-    def __close(self, file: _io.BufferedReader):
-        '''
-        Close the file
-
-        Args:
-            file (_io.BufferedReader): The file to close
-        returns:
-            None
+    def __read(self) -> memoryview:
         '''
-        file.close()
+        Read the whole file in a single call
 
-    def __size(self, stream: _io.BufferedReader) -> int:
-        '''
-        Get the stream size
-
-        Args:
-            stream (_io.BufferedReader): The stream to get the size from
+        Raises:
+            ParserError: If the file is not found
         Returns:
-            int: The stream size.
+            memoryview: A view over the file content
         '''
-        stream.seek(0, os.SEEK_END)
-        end = stream.tell()
-        stream.seek(0, os.SEEK_SET)
-        return end
+        with stage(self.__browser, 'read') as timer, self.__open() as stream:
+            data = stream.read()
+            timer.count(bytes=len(data))
+        return memoryview(data)
 
     def __identify_command(self, command_id: int, command_content: bytes) -> Command:
         '''
         Identify the command type from a command id
-        TODO: Implement other command types support.
 
         Args:
             command_id (int): The command id
             command_content (bytes): The command content
+        Raises:
+            ParserError: If the command content is malformed
         Returns:
             Command: A inherited class of Command class
         '''
-        if command_id in CommandType:
-            if command_id == CommandType.UpdateTabNavigation.value:
-                return CommandTabNavigation(command_id, command_content)
-            if command_id == CommandType.SetSelectedNavigationIndex.value:
-                return SetSelectedNavigationIndex(command_id, command_content)
-            if command_id == CommandType.TabClosed.value:
-                return TabClosed(command_id, command_content)
-            if command_id == CommandType.SetPinnedState.value:
-                # Exclude the command if the tab is not pinned
-                cmd = SetPinnedState(command_id, command_content)
-                return cmd if cmd.pinned else None
-            return Command(command_id, command_content)
-        return None
+        command = self.__table.get(command_id)
+        if command is None:
+            return None
+        try:
+            return command(command_id, command_content)
+        except (struct.error, ValueError) as exc:
+            raise ParserError(f'Invalid content for command {command_id}') from exc
 
     def filter_command(self, commands: list, command_id: int) -> list[Command]:
         '''
@@ -107,32 +91,45 @@ class Parser:
         '''
         return [command for command in commands if command.id == command_id]
 
-    @property
-    def commands(self) -> list[Command]:
+    def iterate(self):
         '''
-        Get all commands from a SNSS file
+        Iterate over the commands of a SNSS file.
+        The file is read once and every command content is a view over that buffer.
 
         Raises:
             ParserError: If the file is not a SNSS file or the file is corrupted
-        Returns:
-            list: A list of Command instances
+        Yields:
+            Command: The next Command instance
         '''
-        commands = []
-        stream = self.__open()
-        file_size = self.__size(stream)
-        signature = Reader.uInt32(stream)
-        _ = Reader.uInt32(stream) # Version, not used.
+        buffer = self.__read()
+        end = len(buffer)
+        if end < UINT32_PAIR.size:
+            raise ParserError('Invalid SNSS file. File too small')
+        signature, _ = Reader.unpack(UINT32_PAIR, buffer) # Version, not used.
         if signature != self.__signature:
-            self.__close(stream)
             raise ParserError('Invalid SNSS file. Signature does not match')
-        while file_size - stream.tell() > 0:
-            command_size = Reader.uInt16(stream)
+        offset = UINT32_PAIR.size
+        while end - offset >= COMMAND_HEADER.size:
+            command_size, command_id = Reader.unpack(COMMAND_HEADER, buffer, offset)
             if command_size == 0:
                 raise ParserError('Invalid command size, maybe corrupted file')
-            command_id = Reader.uInt8(stream)
-            command_content = stream.read(command_size - 1)
-            command = self.__identify_command(command_id, command_content)
+            start = offset + COMMAND_HEADER.size
+            offset += UINT16.size + command_size
+            if offset > end:
+                # The browser was writing the last command, ignore it.
+                break
+            command = self.__identify_command(command_id, buffer[start:offset])
             if command:
-                commands.append(command)
-        self.__close(stream)
-        return commands
+                yield command
+
+    @property
+    def commands(self) -> list[Command]:
+        '''
+        Get all commands from a SNSS file
+
+        Raises:
+            ParserError: If the file is not a SNSS file or the file is corrupted
+        Returns:
+            list: A list of Command instances
+        '''
+        return list(self.iterate())
@@ -0,0 +1,197 @@
+'''
+Process implementation for PyBrinf.
+This module is used to inspect the running processes of the system in a single scan.
+Docstrings are written in Google style.
+'''
+
+import os
+import csv
+import subprocess
+
+from pybrinf.exceptions import SystemBrinfError
+from pybrinf.utilities import Utilities
+
+PROC_PATH = '/proc'
+
+
+class ProcessTable:
+    '''
+        Snapshot of the running processes by name.
+        Names are lowercase and include both the short name and the executable name
+        of each process, so 'chrome' and 'google-chrome' style names both match.
+        On Linux the resolved executable path of every process is kept too.
+    '''
+
+    def __init__(self, processes: dict, executables: dict = None):
+        '''
+        Initialize the ProcessTable instance.
+
+        Args:
+            processes (dict): The process ids by process name.
+            executables (dict): The resolved executable paths by process id, when known.
+        '''
+        self.__processes = processes
+        self.__executables = executables or {}
+
+    def __contains__(self, name: str) -> bool:
+        '''Check if a process with the given name is running.'''
+        return name.lower() in self.__processes
+
+    def __iter__(self):
+        '''Iterate over the process names.'''
+        return iter(list(self.__processes))
+
+    def __len__(self) -> int:
+        '''Get the number of process names.'''
+        return len(self.__processes)
+
+    @staticmethod
+    def __executable(entry: str, command: bytes) -> str:
+        '''Get the resolved executable path of a process, None if it is not accessible.'''
+        try:
+            return os.readlink(os.path.join(PROC_PATH, entry, 'exe'))
+        except OSError:
+            pass
+        command = command.decode('utf-8', 'ignore')
+        return os.path.realpath(command) if os.path.isabs(command) else None
+
+    @staticmethod
+    def __linux() -> tuple[dict, dict]:
+        '''
+        Scan /proc once and read the name and executable of every process.
+
+        Returns:
+            tuple[dict, dict]: The process ids by process name and the resolved
+                executable paths by process id.
+        '''
+        processes = {}
+        executables = {}
+        for entry in os.listdir(PROC_PATH):
+            if not entry.isdigit():
+                continue
+            names = set()
+            try:
+                with open(os.path.join(PROC_PATH, entry, 'comm'), 'rb') as file:
+                    names.add(file.read().strip().decode('utf-8', 'ignore').lower())
+                with open(os.path.join(PROC_PATH, entry, 'cmdline'), 'rb') as file:
+                    executable = file.read().split(b'\0', 1)[0]
+                if executable:
+                    names.add(os.path.basename(executable.decode('utf-8', 'ignore')).lower())
+            except OSError:
+                # The process has finished or it is not accessible.
+                continue
+            for name in names:
+                processes.setdefault(name, []).append(int(entry))
+            path = ProcessTable.__executable(entry, executable)
+            if path:
+                executables[int(entry)] = path
+        return processes, executables
+
+    @staticmethod
+    def __win32() -> dict:
+        '''
+        List every process with a single tasklist call.
+
+        Raises:
+            SystemBrinfError: If tasklist cannot be executed.
+        Returns:
+            dict: The process ids by process name.
+        '''
+        try:
+            output = subprocess.check_output(
+                Utilities.LIST_PROCESSES, stderr=subprocess.PIPE).decode(errors='ignore')
+        except (OSError, subprocess.CalledProcessError) as exc:
+            raise SystemBrinfError('Error while listing the processes.') from exc
+        processes = {}
+        for row in csv.reader(output.splitlines()):
+            if len(row) > 1 and row[1].isdigit():
+                processes.setdefault(row[0].lower(), []).append(int(row[1]))
+        return processes
+
+    @classmethod
+    def snapshot(cls, os_: str = None) -> 'ProcessTable':
+        '''
+        Take a snapshot of the running processes.
+
+        Args:
+            os_ (str): The system name. Defaults to the current system.
+        Raises:
+            SystemBrinfError: If the system is not supported.
+        Returns:
+            ProcessTable: The running processes.
+        '''
+        os_ = os_ or Utilities.system()
+        if os_ == 'linux':
+            return cls(*cls.__linux())
+        if os_ == 'win32':
+            return cls(cls.__win32())
+        raise SystemBrinfError(f'System {os_} is not supported.')
+
+    def pids(self, names: list, folders: list = None) -> list[int]:
+        '''
+        Get the process ids of any of the given process names.
+
+        Args:
+            names (list of str): The process names to look for.
+            folders (list of str): The install folders of the program, see install_folders.
+                When some processes run from them, the ones whose resolved executable is
+                outside are ignored, e.g. another chromium build with the same name.
+                Defaults to any.
+        Returns:
+            list[int]: The sorted process ids.
+        '''
+        pids = set()
+        for name in names:
+            pids.update(self.__processes.get(name.lower(), []))
+        if folders:
+            # A launcher script may run a binary of another folder, e.g. /usr/bin/firefox
+            # runs /usr/lib/firefox/firefox, so the name matches are kept if none is inside.
+            inside = {pid for pid in pids if self.__inside(self.__executables.get(pid), folders)}
+            pids = inside or pids
+        return sorted(pids)
+
+    @staticmethod
+    def __inside(path: str, folders: list) -> bool:
+        '''Check if an executable path is unknown or inside any of the folders.'''
+        if path is None:
+            return True
+        return any(path.startswith(os.path.join(folder, '')) for folder in folders)
+
+
+def process_names(os_: str, name: str, process: str, app_path: str) -> list[str]:
+    '''
+    Get the process names a browser can run with.
+
+    Args:
+        os_ (str): The system name.
+        name (str): The name of the browser.
+        process (str): The process name of the browser.
+        app_path (str): The path of the browser executable.
+    Returns:
+        list[str]: The candidate process names.
+    '''
+    names = [process]
+    if os_ == 'linux':
+        # The launcher script and the real binary usually have different names.
+        names += [os.path.basename(app_path), name]
+    return list(dict.fromkeys(name.lower() for name in names))
+
+
+def install_folders(os_: str, app_path: str) -> list[str]:
+    '''
+    Get the folders the processes of a program run from, to tell it apart from other
+    programs with the same process name.
+
+    Args:
+        os_ (str): The system name.
+        app_path (str): The path of the program executable or launcher.
+    Returns:
+        list[str]: The folder of the resolved executable on Linux when it exists, e.g.
+            /usr/bin/google-chrome links into /opt/google/chrome where chrome runs.
+            The folder of a launcher script is not the one of the binary it runs, so it
+            only chooses between processes of the same name. Empty otherwise, which
+            matches by name only.
+    '''
+    if os_ != 'linux' or not app_path or not os.path.isfile(app_path):
+        return []
+    return [os.path.dirname(os.path.realpath(app_path))]
@@ -0,0 +1,129 @@
+'''
+Profile implementation for PyBrinf.
+This module is used to discover the profiles of a browser.
+Docstrings are written in Google style.
+'''
+
+import os
+import json
+import configparser
+
+from pybrinf.exceptions import BrowserError
+
+# Files that identify a chromium profile folder when Local State is not available.
+CHROMIUM_PROFILE_FILES = ('History', 'Preferences')
+
+
+class Profile:
+    '''
+        Profile class core.
+
+        Attributes:
+            browser (str): The full name of the browser.
+            name (str): The display name of the profile.
+            directory (str): The folder name of the profile.
+            path (str): The full path of the profile.
+            default (bool): Whether the profile is the default one.
+    '''
+
+    # pylint: disable=too-few-public-methods
+    def __init__(self, browser: str, name: str, path: str, default: bool = False):
+        '''Initialize the Profile instance.'''
+        self.browser = browser
+        self.name = name
+        self.path = os.path.normpath(path)
+        self.directory = os.path.basename(self.path)
+        self.default = default
+
+    def __str__(self):
+        '''Get the string representation of the profile.'''
+        return f'Profile(name={self.name}, directory={self.directory})'
+
+    def __repr__(self):
+        '''Get the string representation of the profile.'''
+        return self.__str__()
+
+    def __eq__(self, other: object) -> bool:
+        '''Compare the profile with another profile.'''
+        return isinstance(other, Profile) and self.path == other.path
+
+    def __hash__(self) -> int:
+        '''Get the hash of the profile.'''
+        return hash(self.path)
+
+
+def chromium_profiles(user_data: str, browser: str) -> list[Profile]:
+    '''
+    Get the profiles of a chromium based browser from its Local State file.
+    If Local State is missing, the profile folders are detected from their files.
+
+    Args:
+        user_data (str): The path of the browser user data folder.
+        browser (str): The full name of the browser.
+    Raises:
+        BrowserError: If the Local State file is corrupted.
+    Returns:
+        list[Profile]: The profiles found, the default one first.
+    '''
+    profiles = []
+    state = os.path.join(user_data, 'Local State')
+    if os.path.isfile(state):
+        try:
+            with open(state, 'r', encoding='utf-8') as file:
+                info = json.load(file).get('profile', {})
+        except (OSError, ValueError) as exc:
+            raise BrowserError('Error while reading the Local State file.') from exc
+        last_used = info.get('last_used', 'Default')
+        for directory, data in info.get('info_cache', {}).items():
+            path = os.path.join(user_data, directory)
+            if os.path.isdir(path):
+                profiles.append(Profile(
+                    browser, data.get('name', directory), path, directory == last_used))
+    if not profiles and os.path.isdir(user_data):
+        for directory in sorted(os.listdir(user_data)):
+            path = os.path.join(user_data, directory)
+            if any(os.path.exists(os.path.join(path, file)) for file in CHROMIUM_PROFILE_FILES):
+                profiles.append(Profile(browser, directory, path, directory == 'Default'))
+    if not profiles and any(
+            os.path.exists(os.path.join(user_data, file)) for file in CHROMIUM_PROFILE_FILES):
+        # Some browsers (e.g. Opera) keep the profile in the user data folder itself.
+        profiles.append(Profile(browser, os.path.basename(user_data), user_data, True))
+    if profiles and not any(profile.default for profile in profiles):
+        profiles[0].default = True
+    return sorted(profiles, key=lambda profile: not profile.default)
+
+
+def firefox_profiles(root: str, browser: str) -> list[Profile]:
+    '''
+    Get the profiles of a firefox based browser from its profiles.ini file.
+
+    Args:
+        root (str): The path of the folder that contains profiles.ini.
+        browser (str): The full name of the browser.
+    Raises:
+        BrowserError: If the profiles.ini file cannot be read.
+    Returns:
+        list[Profile]: The profiles found, the default one first.
+    '''
+    parser = configparser.ConfigParser(interpolation=None)
+    try:
+        with open(os.path.join(root, 'profiles.ini'), 'r', encoding='utf-8') as file:
+            parser.read_file(file)
+    except (OSError, configparser.Error) as exc:
+        raise BrowserError('Error while reading the profiles.ini file.') from exc
+    # Since Firefox 67 each installation has its own default profile.
+    installs = {parser[section].get('Default') for section in parser.sections()
+                if section.startswith('Install')}
+    profiles = []
+    for section in parser.sections():
+        if not section.startswith('Profile') or 'Path' not in parser[section]:
+            continue
+        data = parser[section]
+        path = data['Path']
+        if data.get('IsRelative', '1') == '1':
+            path = os.path.join(root, os.path.normpath(path))
+        default = data['Path'] in installs if installs else data.get('Default') == '1'
+        profiles.append(Profile(browser, data.get('Name', section), path, default))
+    if profiles and not any(profile.default for profile in profiles):
+        profiles[0].default = True
+    return sorted(profiles, key=lambda profile: not profile.default)
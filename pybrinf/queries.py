@@ -14,18 +14,105 @@ from moz_places
 ORDER BY last_visit_date DESC
 '''
 
+# One row per download, the redirect chain is aggregated in chain_index order
+# (the last url is the final one), separated by newlines. The order of an aggregate
+# input is not guaranteed, so the urls are joined by a window ordered by chain_index.
 DOWNLOAD_QUERY = '''
-SELECT total_bytes, current_path, start_time, end_time, tab_url, url
+SELECT total_bytes, current_path, start_time, end_time, tab_url, chains.urls,
+state, danger_type, mime_type
 FROM downloads
-LEFT JOIN downloads_url_chains
-ON downloads.id = downloads_url_chains.id
+LEFT JOIN (
+    SELECT DISTINCT id, group_concat(url, char(10)) OVER (
+        PARTITION BY id ORDER BY chain_index
+        ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING) AS urls
+    FROM downloads_url_chains
+) AS chains
+ON downloads.id = chains.id
 ORDER BY start_time DESC
 '''
 
+# One row per download destination, with the state, end time (milliseconds), size and
+# reputation verdict of its metaData annotation decoded by SQLite. Invalid JSON is skipped.
 MOZ_DOWNLOAD_QUERY = '''
-SELECT 0 as total_bytes, content as current_path, dateAdded as start_time,
-lastModified as end_time, url, url as tab_url
-FROM moz_annos, moz_places
-WHERE moz_annos.place_id == moz_places.id
+WITH metadata(place_id, data) AS (
+    SELECT place_id, content FROM moz_annos
+    WHERE anno_attribute_id = (
+        SELECT id FROM moz_anno_attributes WHERE name = 'downloads/metaData')
+    AND json_valid(content)
+)
+SELECT COALESCE(json_extract(data, '$.fileSize'), 0) AS total_bytes,
+destination.content AS current_path, destination.dateAdded AS start_time,
+COALESCE(json_extract(data, '$.endTime') * 1000, destination.lastModified) AS end_time,
+url AS tab_url, url, json_extract(data, '$.state') AS state,
+json_extract(data, '$.reputationCheckVerdict') AS danger_type, NULL AS mime_type
+FROM moz_annos AS destination
+JOIN moz_places ON destination.place_id = moz_places.id
+LEFT JOIN metadata ON metadata.place_id = destination.place_id
+WHERE destination.anno_attribute_id = (
+    SELECT id FROM moz_anno_attributes WHERE name = 'downloads/destinationFileURI')
 ORDER BY start_time DESC
 '''
+
+# Bookmarks with the path of their folder, the folder tree is walked by SQLite.
+MOZ_BOOKMARK_QUERY = '''
+WITH RECURSIVE folders(id, path) AS (
+    SELECT id, '' FROM moz_bookmarks WHERE parent = 0
+    UNION ALL
+    SELECT moz_bookmarks.id, CASE WHEN folders.path = '' THEN moz_bookmarks.title
+        ELSE folders.path || '/' || moz_bookmarks.title END
+    FROM moz_bookmarks JOIN folders ON moz_bookmarks.parent = folders.id
+    WHERE moz_bookmarks.type = 2
+)
+SELECT moz_bookmarks.id, moz_bookmarks.guid, moz_places.url, moz_bookmarks.title,
+folders.path, moz_bookmarks.dateAdded
+FROM moz_bookmarks
+JOIN folders ON moz_bookmarks.parent = folders.id
+JOIN moz_places ON moz_bookmarks.fk = moz_places.id
+WHERE moz_bookmarks.type = 1
+ORDER BY folders.path, moz_bookmarks.position
+'''
+
+# Searches as (term, uses, time) rows, {where} filters them by time.
+# Chromium counts every visit of a search results page, Firefox the decaying use count
+# of what was typed in the address bar before picking a page.
+SEARCH_QUERY = '''
+WITH searches AS (
+    SELECT keyword_search_terms.normalized_term AS term, 1 AS uses, visits.visit_time AS time
+    FROM keyword_search_terms
+    JOIN visits ON visits.url = keyword_search_terms.url_id
+    {where}
+)'''
+MOZ_SEARCH_QUERY = '''
+WITH searches AS (
+    SELECT lower(moz_inputhistory.input) AS term, moz_inputhistory.use_count AS uses,
+    moz_places.last_visit_date AS time
+    FROM moz_inputhistory
+    JOIN moz_places ON moz_places.id = moz_inputhistory.place_id
+    {where}
+)'''
+
+# Aggregates of the searches over all time, most used first.
+SEARCH_TOTALS = '''
+SELECT term, SUM(uses) AS count, MAX(time) AS last_used, NULL AS period
+FROM searches
+GROUP BY term
+ORDER BY count DESC, last_used DESC
+'''
+
+# Top terms of every period, {period} is the SQL date of the period start of a search.
+SEARCH_PERIODS = ''',
+periods AS (
+    SELECT {period} AS period, term, SUM(uses) AS count, MAX(time) AS last_used
+    FROM searches
+    GROUP BY 1, 2
+),
+ranked AS (
+    SELECT term, count, last_used, period,
+    ROW_NUMBER() OVER (PARTITION BY period ORDER BY count DESC, last_used DESC) AS rank
+    FROM periods
+)
+SELECT term, count, last_used, period
+FROM ranked
+WHERE rank <= {top}
+ORDER BY period DESC, rank
+'''
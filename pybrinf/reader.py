@@ -6,9 +6,45 @@
 import struct
 import _io
 
+# Precompiled little endian layouts, shared by the Reader and the SNSS commands.
+UINT8 = struct.Struct('<B')
+UINT16 = struct.Struct('<H')
+UINT32 = struct.Struct('<I')
+INT32 = struct.Struct('<i')
+INT64 = struct.Struct('<q')
+UINT32_PAIR = struct.Struct('<II')
+UINT32_TRIPLE = struct.Struct('<III')
+UINT32_BOOL = struct.Struct('<IB')
+UINT32_INT64 = struct.Struct('<I4xq') # 64-bit values are aligned to 8 bytes
+UINT32_PAIR_INT64 = struct.Struct('<IIq')
+WINDOW_BOUNDS = struct.Struct('<IiiiiI')
+
 class Reader:
     '''Reader class core.'''
-    __endianess = '<' # Little endian
+
+    @staticmethod
+    def int64(stream: _io.BufferedReader) -> int:
+        '''
+        Read a 64-bit signed integer
+
+        Args:
+            stream (_io.BufferedReader): The stream to read from
+        Returns:
+            int: The read 64-bit signed integer
+        '''
+        return INT64.unpack(stream.read(8))[0]
+
+    @staticmethod
+    def int32(stream: _io.BufferedReader) -> int:
+        '''
+        Read a 32-bit signed integer
+
+        Args:
+            stream (_io.BufferedReader): The stream to read from
+        Returns:
+            int: The read 32-bit signed integer
+        '''
+        return INT32.unpack(stream.read(4))[0]
 
     @staticmethod
     def uInt32(stream: _io.BufferedReader) -> int:
@@ -20,7 +56,7 @@ class Reader:
         Returns:
             int: The read 16-bit unsigned integer
         '''
-        return struct.unpack(Reader.__endianess + 'I', stream.read(4))[0]
+        return UINT32.unpack(stream.read(4))[0]
 
     @staticmethod
     def uInt16(stream: _io.BufferedReader) -> int:
@@ -32,7 +68,7 @@ class Reader:
         Returns:
             int: The read 16-bit unsigned integer
         '''
-        return struct.unpack(Reader.__endianess + 'H', stream.read(2))[0]
+        return UINT16.unpack(stream.read(2))[0]
 
     @staticmethod
     def uInt8(stream: _io.BufferedReader) -> int:
@@ -44,12 +80,40 @@ class Reader:
         Returns:
             int: The read integer
         '''
-        return struct.unpack(Reader.__endianess + 'B', stream.read(1))[0]
+        return UINT8.unpack(stream.read(1))[0]
+
+    @staticmethod
+    def uInt32_at(buffer: memoryview, offset: int) -> int:
+        '''
+        Read a 32-bit unsigned integer from a buffer without copying it
+
+        Args:
+            buffer (memoryview): The buffer to read from
+            offset (int): The position of the integer in the buffer
+        Returns:
+            int: The read 32-bit unsigned integer
+        '''
+        return UINT32.unpack_from(buffer, offset)[0]
+
+    @staticmethod
+    def unpack(layout: struct.Struct, buffer: memoryview, offset: int = 0) -> tuple:
+        '''
+        Read several fields at once from a buffer without copying it
+
+        Args:
+            layout (struct.Struct): The precompiled layout of the fields
+            buffer (memoryview): The buffer to read from
+            offset (int): The position of the first field in the buffer
+        Returns:
+            tuple: The read fields
+        '''
+        return layout.unpack_from(buffer, offset)
 
     @staticmethod
     def string(stream: _io.BufferedReader) -> str:
         '''
-        Read a string
+        Read a pickle string, the data is padded to a multiple of 4 bytes
+        Source: base/pickle.cc
 
         Args:
             stream (_io.BufferedReader): The stream to read from
@@ -57,14 +121,16 @@ class Reader:
             str: The read string
         '''
         length = Reader.uInt32(stream)
-        return stream.read(length).decode('utf-8', errors='ignore')
+        data = stream.read(length)
+        stream.read(-length % 4)
+        return data.decode('utf-8', errors='ignore')
 
     @staticmethod
     def string16(stream: _io.BufferedReader) -> str:
         '''
-        Read a string with 16-bit length
-        Source: lemnos/chrome-session-dump
-        TODO: Finish this :p
+        Read a pickle UTF-16 string, the length is the number of 16-bit characters
+        and the data is padded to a multiple of 4 bytes
+        Source: base/pickle.cc
 
         Args:
             stream (_io.BufferedReader): The stream to read from
@@ -72,7 +138,42 @@ class Reader:
             str: The read string
         '''
         length = Reader.uInt32(stream) * 2
-        if length % 4 != 0:
-            length += 4 - (length % 4)
-            return stream.read(length).decode('utf-8', errors='ignore')
-        return 'undefined'
+        data = stream.read(length)
+        stream.read(-length % 4)
+        return data.decode('utf-16-le', errors='ignore')
+
+    @staticmethod
+    def string_at(buffer: memoryview, offset: int) -> tuple[str, int]:
+        '''
+        Read a pickle string from a buffer without copying it
+
+        Args:
+            buffer (memoryview): The buffer to read from
+            offset (int): The position of the string length in the buffer
+        Returns:
+            tuple: The read string and the aligned offset after it
+        '''
+        length = Reader.uInt32_at(buffer, offset)
+        offset += 4
+        end = offset + length
+        if end > len(buffer):
+            raise ValueError('String length exceeds the buffer size')
+        return str(buffer[offset:end], 'utf-8', 'ignore'), end + (-length % 4)
+
+    @staticmethod
+    def string16_at(buffer: memoryview, offset: int) -> tuple[str, int]:
+        '''
+        Read a pickle UTF-16 string from a buffer without copying it
+
+        Args:
+            buffer (memoryview): The buffer to read from
+            offset (int): The position of the string length in the buffer
+        Returns:
+            tuple: The read string and the aligned offset after it
+        '''
+        length = Reader.uInt32_at(buffer, offset) * 2
+        offset += 4
+        end = offset + length
+        if end > len(buffer):
+            raise ValueError('String length exceeds the buffer size')
+        return str(buffer[offset:end], 'utf-16-le', 'ignore'), end + (-length % 4)
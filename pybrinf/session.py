@@ -1,34 +1,162 @@
 '''
     Browser session implementation for PyBrinf.
-    This module is used to get session information of a browser.
+    This module is used to get session information of a browser, from the SNSS files of
+    chromium based browsers or the sessionstore files of Firefox.
     Docstrings are written in Google style.
 '''
 
 import os
+import copy
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
 
+from pybrinf import sessionstore
 from pybrinf.parser import Parser
-from pybrinf.exceptions import SessionError
-from pybrinf.item import SessionTab
-from pybrinf.commands import CommandType
+from pybrinf.stats import stage
+from pybrinf.exceptions import ParserError, SessionError
+from pybrinf.item import SessionNavigation, SessionTab, SessionWindow
+from pybrinf.commands import CommandType, RestoreCommandType, RESTORE_COMMANDS
+from pybrinf.utilities import Utilities
+
+
+class SessionCache:
+    '''
+        Bounded LRU cache of parsed Session and Tabs files shared by all Session instances.
+        Entries are keyed by the file identity (path, inode, size and mtime), so a file
+        that is rewritten by the browser is parsed again.
+        get returns copies of the cached windows and tabs, so callers can change them.
+    '''
+
+    def __init__(self, size: int = 32):
+        '''
+        Initialize the SessionCache instance.
+
+        Args:
+            size (int): The maximum number of parsed files to keep. Defaults to 32.
+        '''
+        self.__size = size
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def __len__(self) -> int:
+        '''Get the number of cached files.'''
+        return len(self.__entries)
+
+    @staticmethod
+    def key(path: str, browser: str) -> tuple:
+        '''
+        Get the cache key of a file.
+
+        Args:
+            path (str): The path of the file.
+            browser (str): The browser name assigned to the items.
+        Raises:
+            SessionError: If the file does not exist.
+        Returns:
+            tuple: The file identity and the browser name.
+        '''
+        try:
+            stat = os.stat(path)
+        except OSError as exc:
+            raise SessionError(f'Session file {path} not found') from exc
+        return (os.path.abspath(path), stat.st_ino, stat.st_size, stat.st_mtime_ns, browser)
+
+    def lookup(self, key: tuple) -> tuple:
+        '''
+        Get a parsed file from the cache.
+
+        Args:
+            key (tuple): The cache key of the file.
+        Returns:
+            tuple: The windows and tabs of the file or None if it is not cached.
+        '''
+        with self.__lock:
+            model = self.__entries.get(key)
+            if model is not None:
+                self.__entries.move_to_end(key)
+            return model
+
+    def store(self, key: tuple, model: tuple) -> None:
+        '''
+        Store a parsed file in the cache, evicting the least recently used ones.
+
+        Args:
+            key (tuple): The cache key of the file.
+            model (tuple): The windows and tabs of the file.
+        '''
+        with self.__lock:
+            self.__entries[key] = model
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__size:
+                self.__entries.popitem(last=False)
+
+    def get(self, path: str, browser: str) -> tuple:
+        '''
+        Get a parsed file, parsing it only if it is not cached or it has changed.
+
+        Args:
+            path (str): The path of the Session or Tabs file.
+            browser (str): The browser name assigned to the items.
+        Raises:
+            SessionError: If the file cannot be parsed.
+        Returns:
+            tuple: Copies of the windows and tabs of the file.
+        '''
+        key = self.key(path, browser)
+        model = self.lookup(key)
+        if model is None:
+            model = parse_file(path, browser)
+            self.store(key, model)
+        return copy_model(model)
+
+    def resize(self, size: int) -> None:
+        '''
+        Change the maximum number of parsed files to keep.
+
+        Args:
+            size (int): The new maximum size.
+        '''
+        with self.__lock:
+            self.__size = size
+            while len(self.__entries) > self.__size:
+                self.__entries.popitem(last=False)
+
+    def clear(self) -> None:
+        '''Remove all the cached files.'''
+        with self.__lock:
+            self.__entries.clear()
+
+
+CACHE = SessionCache()
 
 
 class Session:
     '''Session class core.'''
 
+    # The folder of the session files inside the profile.
+    FOLDER = 'Sessions'
+
     def __init__(self, path: str, browser: str):
         '''
         Initialize the Session instance.
 
         Args:
-            path (str): The path of the Session folder.
+            path (str): The path of the profile.
         Raises:
             SessionError: If the path is not a valid Session folder.
         '''
-        self.__path = os.path.join(path, 'Sessions')
+        self.__path = os.path.join(path, self.FOLDER)
         self.browser = browser
         if not self.__exists:
             raise SessionError('Sessions folder not found')
 
+    @property
+    def path(self) -> str:
+        '''Get the path of the folder of the session files.'''
+        return self.__path
+
     @property
     def __exists(self) -> bool:
         '''
@@ -57,6 +185,18 @@ class Session:
         sessions = sorted(sessions, key=lambda x: x[1], reverse=True)
         return '_'.join(sessions[0])
 
+    @property
+    def files(self) -> list[str]:
+        '''
+        Get all the Session and Tabs files, newest first
+
+        Returns:
+            list[str]: The Session and Tabs filenames.
+        '''
+        files = [file for file in os.listdir(self.__path)
+                 if file.startswith(('Session_', 'Tabs_'))]
+        return sorted(files, key=lambda x: x.split('_', 1)[1], reverse=True)
+
     @property
     def filename(self) -> str:
         '''
@@ -67,72 +207,444 @@ class Session:
         '''
         return self.__last
 
-    def __parse_tabs(self, *args) -> list[SessionTab]:
+    def __build(self) -> tuple[list[SessionWindow], list[SessionTab]]:
         '''
-        Parse the tab from the UpdateTabNavigation commands and return a list of Tab objects.
-        More friendly to use than the CommandTabNavigation object.
+        Build the window, tab and navigation model from the last Session file in one pass.
 
-        Args:
-            tab_navigations (list[UpdateTabNavigation]): UpdateTabNavigation commands.
-            pinned_states (list[SetPinnedState]): SetPinnedState commands.
-            selected_tab (SetSelectedNavigationIndex): SetSelectedNavigationIndex command.
         Returns:
-            Tab: The parsed tabs.
-        '''
-        tabs = []
-        tab_navigations = args[0]
-        pinned_states = args[1]
-        selected_tab = args[2]
-        for command in tab_navigations:
-            tab = SessionTab(self.browser, command.tab_id,
-                      command.index, command.url, command.title)
-            for pinned_state in pinned_states:
-                tab.pinned = pinned_state.tab_id == command.tab_id
-            tab.active = tab.id == selected_tab.tab_id
-            tabs.append(tab)
-        return tabs
-
-    def __remove_repeated_tabs(self, tabs: list[SessionTab]) -> list[SessionTab]:
+            tuple: The windows and all the tabs (closed ones included) of the session.
         '''
-        Remove repeated tabs from the list of tabs
+        file_path = os.path.join(self.__path, self.filename)
+        return CACHE.get(file_path, self.browser)
 
-        Args:
-            tabs (list[Tab]): The tabs to remove the repeated tabs.
+    def windows(self) -> list[SessionWindow]:
+        '''
+        Get all windows from the last Session file
 
         Returns:
-            list[Tab]: The tabs without repeated tabs.
+            list[SessionWindow]: The windows with their open tabs ordered by index.
         '''
-        new_tabs = []
-        for tab in tabs:
-            if tab.id not in [new_tab.id for new_tab in new_tabs]:
-                new_tabs.append(tab)
-        return new_tabs
+        windows, _ = self.__build()
+        return windows
 
     def tabs(self) -> list[SessionTab]:
         '''
         Get all tabs from the last Session file
 
         Returns:
-            list[CommandTabNavigation]: All updated tabs from the last Session file.
-        '''
-        file_path = os.path.join(self.__path, self.__last)
-        parser = Parser(file_path)
-        commands = parser.commands
-        tab_navs = parser.filter_command(
-            commands, CommandType.UpdateTabNavigation.value)
-        pinned_states = parser.filter_command(
-            commands, CommandType.SetPinnedState.value)
-        selected_nav = parser.filter_command(
-            commands, CommandType.SetSelectedNavigationIndex.value)
-        tabs = self.__parse_tabs(tab_navs, pinned_states, selected_nav[-1])
-        return self.__remove_repeated_tabs(tabs)
+            list[SessionTab]: All tabs from the last Session file, closed ones included.
+        '''
+        _, tabs = self.__build()
+        return tabs
 
     @property
     def current_tab(self) -> SessionTab:
         '''
         Get the current tab from the last Session file
 
+        Raises:
+            SessionError: If the session has no active tab.
         Returns:
             Tab: The current tab from the last Session file.
         '''
-        return [tab for tab in self.tabs() if tab.active][0]
+        for window in self.windows():
+            if window.active:
+                return window.selected_tab
+        raise SessionError('No active tab found')
+
+    def all_sessions(
+            self, workers: int = None) -> tuple[dict[str, list[SessionTab]], list[SessionTab]]:
+        '''
+        Parse every session file of the profile using a process pool.
+        Files that are already in the session cache are not parsed again.
+
+        Args:
+            workers (int): The maximum number of processes. Defaults to the number of CPUs.
+        Raises:
+            SessionError: If a file cannot be parsed.
+        Returns:
+            tuple: The tabs of each file by filename and the recently closed tabs
+                of all the files merged, most recently closed first.
+        '''
+        files = self.files
+        keys = [CACHE.key(os.path.join(self.__path, file), self.browser) for file in files]
+        results = [CACHE.lookup(key) for key in keys]
+        missing = [position for position, model in enumerate(results) if model is None]
+        paths = [os.path.join(self.__path, files[position]) for position in missing]
+        for position, model in zip(missing, parse_files(paths, self.browser, workers)):
+            CACHE.store(keys[position], model)
+            results[position] = model
+        sessions = {}
+        closed = {}
+        for file, model in zip(files, results):
+            _, tabs = copy_model(model)
+            sessions[file] = tabs
+            for tab in tabs:
+                if tab.closed:
+                    closed.setdefault((tab.url, tab.close_time), tab)
+        closed = sorted(closed.values(), key=lambda tab: tab.close_time or datetime.min,
+                        reverse=True)
+        return sessions, closed
+
+
+class FirefoxSession(Session):
+    '''
+        Session of a Firefox profile.
+        The session is read from sessionstore-backups/recovery.jsonlz4 while Firefox runs
+        and from sessionstore.jsonlz4 after it is closed, the newest one is the last session.
+    '''
+
+    FOLDER = ''
+    FILES = (
+        'sessionstore.jsonlz4',
+        'sessionstore-backups/recovery.jsonlz4',
+        'sessionstore-backups/recovery.baklz4',
+        'sessionstore-backups/previous.jsonlz4',
+    )
+
+    @property
+    def files(self) -> list[str]:
+        '''
+        Get the session files of the profile, newest first.
+
+        Returns:
+            list[str]: The paths of the session files relative to the profile.
+        '''
+        backups = os.path.join(self.path, 'sessionstore-backups')
+        names = list(self.FILES)
+        if os.path.isdir(backups):
+            names += sorted(f'sessionstore-backups/{file}' for file in os.listdir(backups)
+                            if file.startswith('upgrade.jsonlz4-'))
+        found = []
+        for name in names:
+            try:
+                found.append((os.stat(os.path.join(self.path, name)).st_mtime_ns, name))
+            except OSError:
+                continue
+        # Stable sort, the order of FILES breaks the ties.
+        return [name for _, name in sorted(found, key=lambda item: item[0], reverse=True)]
+
+    @property
+    def filename(self) -> str:
+        '''
+        Get the last session file.
+
+        Raises:
+            SessionError: If the profile has no session file.
+        Returns:
+            str: The path of the file relative to the profile.
+        '''
+        files = self.files
+        if not files:
+            raise SessionError('No session files found')
+        return files[0]
+
+
+def parse_file(path: str, browser: str) -> tuple[list[SessionWindow], list[SessionTab]]:
+    '''
+    Parse a Session, Tabs or Firefox session file into the window and tab model.
+    This function is used as the process pool worker of Session.all_sessions.
+
+    Args:
+        path (str): The path of the session file.
+        browser (str): The browser name to assign to the items.
+    Raises:
+        SessionError: If the file cannot be parsed.
+    Returns:
+        tuple: The windows and all the tabs of the file.
+    '''
+    try:
+        with stage(browser, 'parse') as timer:
+            if path.endswith(('jsonlz4', 'baklz4')) or '.jsonlz4-' in path:
+                windows, tabs = sessionstore.parse(path, browser)
+            elif os.path.basename(path).startswith('Tabs_'):
+                windows = []
+                tabs = build_restore(Parser(path, RESTORE_COMMANDS, browser).iterate(), browser)
+            else:
+                windows, tabs = build(Parser(path, browser=browser).iterate(), browser)
+            timer.count(objects=len(windows) + len(tabs))
+        return windows, tabs
+    except (ParserError, OSError) as exc:
+        raise SessionError(f'Cannot parse the session file {path}') from exc
+
+
+# The commands that change a window, prune the navigations of a tab or change a tab.
+WINDOW_COMMANDS = (
+    CommandType.SetSelectedTabInIndex.value,
+    CommandType.SetWindowType.value,
+    CommandType.SetWindowBounds.value,
+    CommandType.WindowClosed.value,
+    CommandType.SetActiveWindow.value,
+)
+PRUNE_COMMANDS = (
+    CommandType.TabNavigationPathPrunedFromBack.value,
+    CommandType.TabNavigationPathPrunedFromFront.value,
+    CommandType.TabNavigationPathPruned.value,
+)
+
+
+def copy_model(model: tuple) -> tuple[list[SessionWindow], list[SessionTab]]:
+    '''
+    Copy the windows and tabs of a cached file, the navigations are still shared.
+
+    Args:
+        model (tuple): The cached windows and tabs of a file.
+    Returns:
+        tuple: Shallow copies of the windows and tabs, the windows hold the copied tabs.
+    '''
+    windows, tabs = model
+    copies = {}
+    for tab in tabs:
+        copies[id(tab)] = copy.copy(tab)
+        copies[id(tab)].navigations = list(tab.navigations)
+    result = []
+    for window in windows:
+        result.append(copy.copy(window))
+        result[-1].tabs = [copies.get(id(tab)) or copy.copy(tab) for tab in window.tabs]
+    return result, [copies[id(tab)] for tab in tabs]
+
+
+class SessionModel:
+    '''
+        The windows, tabs and navigations of a Session file while its commands are applied.
+        Mirrors the way Chromium restores a session, see:
+        https://source.chromium.org/chromium/chromium/src/+/main:components/sessions/core/session_service_commands.cc
+    '''
+
+    def __init__(self, browser: str):
+        '''
+        Initialize the SessionModel instance.
+
+        Args:
+            browser (str): The browser name to assign to the items.
+        '''
+        self.browser = browser
+        self.windows = {}
+        self.tabs = {}
+        self.navigations = {}
+        self.active_window = None
+
+    def tab(self, tab_id: int) -> SessionTab:
+        '''Get a tab of the model, creating it if needed.'''
+        if tab_id not in self.tabs:
+            self.tabs[tab_id] = SessionTab(self.browser, tab_id, 0, '', '')
+            self.navigations[tab_id] = {}
+        return self.tabs[tab_id]
+
+    def window(self, window_id: int) -> SessionWindow:
+        '''Get a window of the model, creating it if needed.'''
+        if window_id not in self.windows:
+            self.windows[window_id] = SessionWindow(self.browser, window_id)
+        return self.windows[window_id]
+
+    def apply(self, command) -> None:
+        '''
+        Apply a command to the model, unknown commands are ignored.
+
+        Args:
+            command (Command): The command of the Session file.
+        '''
+        if command.id in WINDOW_COMMANDS:
+            self.apply_window(command)
+        elif command.id in PRUNE_COMMANDS:
+            self.prune(command)
+        else:
+            self.apply_tab(command)
+
+    def apply_window(self, command) -> None:
+        '''Apply a command that changes a window.'''
+        kind = command.id
+        if kind == CommandType.SetActiveWindow.value:
+            self.active_window = command.window_id
+            return
+        window = self.window(command.window_id)
+        if kind == CommandType.SetSelectedTabInIndex.value:
+            window.selected_index = command.index
+        elif kind == CommandType.SetWindowType.value:
+            window.type = command.type
+        elif kind == CommandType.SetWindowBounds.value:
+            window.bounds = (command.x, command.y, command.width, command.height)
+            window.show_state = command.show_state
+        elif kind == CommandType.WindowClosed.value:
+            window.closed = True
+            window.close_time = Utilities.webkit_to_date(command.close_time)
+
+    def apply_tab(self, command) -> None:
+        '''Apply a command that changes a tab or adds a navigation.'''
+        kind = command.id
+        if kind == CommandType.UpdateTabNavigation.value:
+            self.tab(command.tab_id)
+            self.navigations[command.tab_id][command.index] = SessionNavigation(
+                self.browser, command.index, command.url, command.title)
+        elif kind == CommandType.SetTabWindow.value:
+            self.tab(command.tab_id).window_id = command.window_id
+            self.window(command.window_id)
+        elif kind == CommandType.SetTabIndexInWindow.value:
+            self.tab(command.tab_id).index = command.index
+        elif kind == CommandType.SetSelectedNavigationIndex.value:
+            self.tab(command.tab_id).selected_index = command.index
+        elif kind == CommandType.SetPinnedState.value:
+            self.tab(command.tab_id).pinned = bool(command.pinned)
+        elif kind == CommandType.TabClosed.value:
+            tab = self.tab(command.tab_id)
+            tab.closed = True
+            tab.close_time = Utilities.webkit_to_date(command.close_time)
+        elif kind == CommandType.LastActiveTime.value:
+            self.tab(command.tab_id).last_active_time = command.last_active_time
+
+    def prune(self, command) -> None:
+        '''Apply a command that removes navigations of a tab.'''
+        tab = self.tab(command.tab_id)
+        entries = self.navigations[command.tab_id]
+        if command.id == CommandType.TabNavigationPathPrunedFromBack.value:
+            for index in [index for index in entries if index >= command.index]:
+                del entries[index]
+        elif command.id == CommandType.TabNavigationPathPrunedFromFront.value:
+            prune_navigations(tab, entries, 0, command.count)
+        else:
+            prune_navigations(tab, entries, command.index, command.count)
+
+    def assemble(self) -> tuple[list[SessionWindow], list[SessionTab]]:
+        '''
+        Attach the tabs with navigations to their windows and set the active window and tab.
+
+        Returns:
+            tuple: The windows and all the tabs (closed ones included) of the session.
+        '''
+        windows = self.windows
+        result = []
+        for tab_id, tab in self.tabs.items():
+            if not set_navigations(tab, self.navigations[tab_id]):
+                continue
+            result.append(tab)
+            if not tab.closed and tab.window_id in windows:
+                windows[tab.window_id].tabs.append(tab)
+        for window in windows.values():
+            window.tabs.sort(key=lambda tab: tab.index)
+        active_window = self.active_window
+        if active_window not in windows:
+            active_window = next((window.id for window in windows.values()
+                                  if not window.closed and window.tabs), None)
+        if active_window is not None:
+            window = windows[active_window]
+            window.active = True
+            if window.selected_tab:
+                window.selected_tab.active = True
+        order = {window_id: position for position, window_id in enumerate(windows)}
+        result.sort(key=lambda tab: (tab.closed, order.get(tab.window_id, len(order)), tab.index))
+        return list(windows.values()), result
+
+
+def build(commands, browser: str) -> tuple[list[SessionWindow], list[SessionTab]]:
+    '''
+    Build the window, tab and navigation model from SNSS commands in one pass.
+
+    Args:
+        commands (iterable[Command]): The commands of a Session file in order.
+        browser (str): The browser name to assign to the items.
+    Returns:
+        tuple: The windows and all the tabs (closed ones included) of the session.
+    '''
+    model = SessionModel(browser)
+    for command in commands:
+        model.apply(command)
+    return model.assemble()
+
+
+def set_navigations(tab: SessionTab, entries: dict) -> bool:
+    '''
+    Set the ordered navigations of a tab and its url and title from the selected one.
+
+    Args:
+        tab (SessionTab): The tab to update.
+        entries (dict): The navigations of the tab by index.
+    Returns:
+        bool: False if the tab has no navigations, True otherwise.
+    '''
+    if not entries:
+        return False
+    tab.navigations = [entries[index] for index in sorted(entries)]
+    selected = entries.get(tab.selected_index, tab.navigations[-1])
+    tab.url = selected.url
+    tab.title = selected.title
+    return True
+
+
+def prune_navigations(tab: SessionTab, entries: dict, index: int, count: int) -> None:
+    '''
+    Remove count navigations starting at index and shift the following ones.
+
+    Args:
+        tab (SessionTab): The tab owning the navigations.
+        entries (dict): The navigations of the tab by index.
+        index (int): The first navigation index to remove.
+        count (int): The number of navigations to remove.
+    '''
+    pruned = {}
+    for position, navigation in entries.items():
+        if position < index:
+            pruned[position] = navigation
+        elif position >= index + count:
+            navigation.index = position - count
+            pruned[position - count] = navigation
+    entries.clear()
+    entries.update(pruned)
+    if tab.selected_index >= index + count:
+        tab.selected_index -= count
+    elif tab.selected_index >= index:
+        # Like Chromium, the selection moves to the navigation before the pruned ones.
+        tab.selected_index = max(index - 1, 0)
+
+
+def parse_files(paths: list[str], browser: str, workers: int = None) -> list[tuple]:
+    '''
+    Parse session files, with a process pool if there are several of them.
+
+    Args:
+        paths (list[str]): The paths of the session files.
+        browser (str): The browser name to assign to the items.
+        workers (int): The maximum number of processes, 1 parses in this process.
+            Defaults to the number of CPUs.
+    Raises:
+        SessionError: If a file cannot be parsed.
+    Returns:
+        list[tuple]: The windows and tabs of each file, in the order of paths.
+    '''
+    browsers = [browser] * len(paths)
+    if workers == 1 or len(paths) < 2:
+        return list(map(parse_file, paths, browsers))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(parse_file, paths, browsers))
+
+
+def build_restore(commands, browser: str) -> list[SessionTab]:
+    '''
+    Build the recently closed tabs from the commands of a Tabs file in one pass.
+
+    Args:
+        commands (iterable[Command]): The commands of a Tabs file in order.
+        browser (str): The browser name to assign to the items.
+    Returns:
+        list[SessionTab]: The closed tabs that were not restored, most recently closed first.
+    '''
+    tabs = {}
+    navigations = {}
+    for command in commands:
+        if command.id == RestoreCommandType.RestoredEntry.value:
+            tabs.pop(command.tab_id, None)
+            navigations.pop(command.tab_id, None)
+            continue
+        if command.tab_id not in tabs:
+            tab = SessionTab(browser, command.tab_id, 0, '', '')
+            tab.closed = True
+            tabs[command.tab_id] = tab
+            navigations[command.tab_id] = {}
+        if command.id == RestoreCommandType.SelectedNavigationInTab.value:
+            tab = tabs[command.tab_id]
+            tab.selected_index = command.index
+            tab.close_time = Utilities.webkit_to_date(command.close_time)
+        elif command.id == RestoreCommandType.UpdateTabNavigation.value:
+            navigations[command.tab_id][command.index] = SessionNavigation(
+                browser, command.index, command.url, command.title)
+    result = [tab for tab_id, tab in tabs.items() if set_navigations(tab, navigations[tab_id])]
+    return sorted(result, key=lambda tab: tab.close_time or datetime.min, reverse=True)
@@ -0,0 +1,120 @@
+'''
+Sessionstore implementation for PyBrinf.
+This module builds the window, tab and navigation model of Firefox session files
+(sessionstore.jsonlz4 and the ones of sessionstore-backups), the same model
+the SNSS files of chromium based browsers are built into.
+Docstrings are written in Google style.
+'''
+
+import json
+
+from pybrinf import mozlz4
+from pybrinf.exceptions import ParserError
+from pybrinf.item import SessionNavigation, SessionTab, SessionWindow
+from pybrinf.utilities import Utilities
+
+
+def to_date(milliseconds: int):
+    '''Convert a Firefox session timestamp (unix milliseconds) to a datetime, None if missing.'''
+    if not milliseconds:
+        return None
+    return Utilities.unix_to_date(int(milliseconds) * 1000)
+
+
+def build_tab(data: dict, browser: str, tab_id: int, index: int) -> SessionTab:
+    '''
+    Build a tab and its navigations from its session data.
+
+    Args:
+        data (dict): The tab data, with its entries and 1-based selected index.
+        browser (str): The browser name to assign to the items.
+        tab_id (int): The id of the tab, Firefox session files have none.
+        index (int): The position of the tab in its window.
+    Returns:
+        SessionTab: The tab, None if it has no navigations.
+    '''
+    entries = data.get('entries') or []
+    if not entries:
+        return None
+    tab = SessionTab(browser, tab_id, index, '', '')
+    tab.navigations = [
+        SessionNavigation(browser, position, entry.get('url', ''),
+                          entry.get('title') or entry.get('url', ''))
+        for position, entry in enumerate(entries)]
+    tab.selected_index = min(max(int(data.get('index') or len(entries)) - 1, 0), len(entries) - 1)
+    selected = tab.navigations[tab.selected_index]
+    tab.url = selected.url
+    tab.title = selected.title
+    tab.pinned = bool(data.get('pinned'))
+    tab.last_active_time = to_date(data.get('lastAccessed'))
+    return tab
+
+
+def build(state: dict, browser: str) -> tuple[list[SessionWindow], list[SessionTab]]:
+    '''
+    Build the window, tab and navigation model from the state of a Firefox session file.
+
+    Args:
+        state (dict): The decoded session file.
+        browser (str): The browser name to assign to the items.
+    Returns:
+        tuple: The windows (closed ones included) and all the tabs (closed ones included)
+            of the session, open tabs first.
+    '''
+    windows = []
+    tabs = []
+    closed = []
+    sources = [(data, False) for data in state.get('windows') or []]
+    sources += [(data, True) for data in state.get('_closedWindows') or []]
+    for position, (data, window_closed) in enumerate(sources):
+        window = SessionWindow(browser, position + 1)
+        window.selected_index = int(data.get('selected') or 1) - 1
+        window.closed = window_closed
+        window.close_time = to_date(data.get('closedAt'))
+        for index, tab_data in enumerate(data.get('tabs') or []):
+            tab = build_tab(tab_data, browser, len(tabs) + len(closed) + 1, index)
+            if tab is None:
+                continue
+            tab.window_id = window.id
+            window.tabs.append(tab)
+            tabs.append(tab)
+        for closed_data in data.get('_closedTabs') or []:
+            tab = build_tab(closed_data.get('state') or {}, browser,
+                            len(tabs) + len(closed) + 1, closed_data.get('pos', 0))
+            if tab is None:
+                continue
+            tab.window_id = window.id
+            tab.closed = True
+            tab.close_time = to_date(closed_data.get('closedAt'))
+            closed.append(tab)
+        windows.append(window)
+    selected = int(state.get('selectedWindow') or 0) - 1
+    if not 0 <= selected < len(windows) or windows[selected].closed or not windows[selected].tabs:
+        selected = next((position for position, window in enumerate(windows)
+                         if not window.closed and window.tabs), None)
+    if selected is not None:
+        window = windows[selected]
+        window.active = True
+        window.selected_tab.active = True
+    return windows, tabs + closed
+
+
+def parse(path: str, browser: str) -> tuple[list[SessionWindow], list[SessionTab]]:
+    '''
+    Parse a Firefox session file into the window and tab model.
+
+    Args:
+        path (str): The path of the jsonlz4 or baklz4 file.
+        browser (str): The browser name to assign to the items.
+    Raises:
+        ParserError: If the file is not found, not mozLz4 or not a session file.
+    Returns:
+        tuple: The windows and all the tabs of the file.
+    '''
+    try:
+        state = json.loads(mozlz4.read(path))
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ParserError(f'Invalid session file {path}') from exc
+    if not isinstance(state, dict):
+        raise ParserError(f'Invalid session file {path}')
+    return build(state, browser)
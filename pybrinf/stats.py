@@ -0,0 +1,195 @@
+'''
+Stats implementation for PyBrinf.
+This module records the time and the counters of every stage of an extraction (copy,
+connect, query, build, parse, merge, ...) per browser. Recording is enabled by
+entering a Stats object and only applies to the current context, so it costs a
+single context variable lookup per stage when disabled. Thread pools of pybrinf
+(Browser.extract, Brinf.all_tabs) record into the Stats of the caller, process pools
+(Session.all_sessions, Fleet) do not.
+Docstrings are written in Google style.
+
+Example:
+    with Stats() as stats:
+        brinf.history()
+    print(stats.report())
+'''
+
+import time
+import threading
+import contextvars
+import functools
+
+CURRENT = contextvars.ContextVar('pybrinf_stats', default=None)
+
+
+class Stats:
+    '''
+        Recorder of the wall time and the counters of every stage by browser.
+        Counters are bytes (copied or read), rows (fetched) and objects (built).
+
+        Args:
+            callback (callable): A function called with (browser, stage, seconds, counters)
+                every time a stage finishes. Defaults to None.
+    '''
+
+    def __init__(self, callback=None):
+        '''Initialize the Stats instance.'''
+        self.callback = callback
+        self.__stages = {}
+        self.__lock = threading.Lock()
+        self.__tokens = []
+
+    def __enter__(self):
+        '''Start recording in the current context.'''
+        self.__tokens.append(CURRENT.set(self))
+        return self
+
+    def __exit__(self, *args):
+        '''Stop recording in the current context.'''
+        CURRENT.reset(self.__tokens.pop())
+
+    def add(self, browser: str, name: str, seconds: float = 0.0, **counters) -> None:
+        '''
+        Record a run of a stage.
+
+        Args:
+            browser (str): The browser the stage ran for, None if it is not specific.
+            name (str): The name of the stage.
+            seconds (float): The wall time of the run.
+            **counters: The counters of the run, e.g. rows=100.
+        '''
+        with self.__lock:
+            entry = self.__stages.setdefault((browser, name), {'calls': 0, 'seconds': 0.0})
+            entry['calls'] += 1
+            entry['seconds'] += seconds
+            for counter, value in counters.items():
+                entry[counter] = entry.get(counter, 0) + value
+        if self.callback is not None:
+            self.callback(browser, name, seconds, counters)
+
+    @property
+    def stages(self) -> dict[tuple, dict]:
+        '''Get the totals of every stage by (browser, stage).'''
+        with self.__lock:
+            return {key: dict(entry) for key, entry in self.__stages.items()}
+
+    def total(self, name: str = None, counter: str = 'seconds') -> float:
+        '''
+        Get the total of a counter over every browser.
+
+        Args:
+            name (str): The stage to sum. Defaults to all the stages.
+            counter (str): The counter to sum. Defaults to seconds.
+        Returns:
+            float: The total.
+        '''
+        return sum(entry.get(counter, 0) for (_, stage_name), entry in self.stages.items()
+                   if name is None or stage_name == name)
+
+    def clear(self) -> None:
+        '''Forget every recorded stage.'''
+        with self.__lock:
+            self.__stages.clear()
+
+    def report(self) -> str:
+        '''
+        Get the recorded stages as a table.
+
+        Returns:
+            str: One line per browser and stage.
+        '''
+        lines = [f'{"browser":<20} {"stage":<10} {"calls":>6} {"seconds":>10} '
+                 f'{"bytes":>12} {"rows":>10} {"objects":>10}']
+        for (browser, name), entry in sorted(self.stages.items(), key=lambda item: (
+                item[0][0] or '', item[0][1])):
+            lines.append(
+                f'{browser or "-":<20} {name:<10} {entry["calls"]:>6} {entry["seconds"]:>10.4f} '
+                f'{entry.get("bytes", 0):>12} {entry.get("rows", 0):>10} '
+                f'{entry.get("objects", 0):>10}')
+        return '\n'.join(lines)
+
+
+class Stage:
+    '''Times a stage and collects its counters, see stage.'''
+
+    __slots__ = ('__stats', '__browser', '__name', '__counters', '__start')
+
+    def __init__(self, stats: Stats, browser: str, name: str):
+        '''Initialize the Stage instance.'''
+        self.__stats = stats
+        self.__browser = browser
+        self.__name = name
+        self.__counters = {}
+        self.__start = 0.0
+
+    def __enter__(self):
+        self.__start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        self.__stats.add(self.__browser, self.__name,
+                         time.perf_counter() - self.__start, **self.__counters)
+
+    def count(self, **counters) -> None:
+        '''Add to the counters of the stage, e.g. count(rows=100).'''
+        for name, value in counters.items():
+            self.__counters[name] = self.__counters.get(name, 0) + value
+
+
+class NullStage:
+    '''Stage used when recording is disabled, every method does nothing.'''
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def count(self, **counters) -> None:
+        '''Ignore the counters.'''
+
+
+NULL_STAGE = NullStage()
+
+
+def current() -> Stats:
+    '''Get the Stats recording in the current context, None if recording is disabled.'''
+    return CURRENT.get()
+
+
+def stage(browser: str, name: str):
+    '''
+    Time a stage in a with block, if recording is enabled.
+
+    Args:
+        browser (str): The browser the stage runs for, None if it is not specific.
+        name (str): The name of the stage.
+    Returns:
+        Stage: The stage, use its count method to add counters.
+    '''
+    stats = CURRENT.get()
+    if stats is None:
+        return NULL_STAGE
+    return Stage(stats, browser, name)
+
+
+def bind(function):
+    '''
+    Bind a function to the current context, so the stages it runs in a thread pool
+    are recorded by the Stats of the caller.
+
+    Args:
+        function (callable): The function to bind.
+    Returns:
+        callable: The bound function.
+    '''
+    if CURRENT.get() is None:
+        return function
+    context = contextvars.copy_context()
+
+    @functools.wraps(function)
+    def bound(*args, **kwargs):
+        return context.copy().run(function, *args, **kwargs)
+    return bound
@@ -0,0 +1,550 @@
+'''
+Testing implementation for PyBrinf.
+This module writes complete synthetic browser profiles (History, places.sqlite,
+Bookmarks, Local State, profiles.ini, SNSS and sessionstore files) of any size, so PyBrinf can be
+tested and benchmarked with no browser installed. Point Browser or Brinf to the
+generated home directory with their root argument.
+Docstrings are written in Google style.
+'''
+
+import os
+import json
+import struct
+import hashlib
+import sqlite3
+
+from pybrinf.browsers import REGISTRY
+from pybrinf.commands import CommandType
+from pybrinf.exceptions import BrowserError
+from pybrinf.utilities import Utilities
+
+HOSTS = 500
+# 2023-01-01 in webkit (since 1601) and unix (since 1970) microseconds.
+WEBKIT_START = 13317724800000000
+UNIX_START = 1672531200000000
+SNSS_HEADER = b'SNSS' + struct.pack('<I', 3)
+COMMAND_HEADER = struct.Struct('<HB')
+
+
+def url(index: int) -> str:
+    '''Get the synthetic url of a row.'''
+    return f'https://site{index % HOSTS}.example.com/page/{index}'
+
+
+def search_term(index: int) -> str:
+    '''Get the synthetic search term of a row, term N is searched in every 40th row from 2N.'''
+    return f'term {index // 2 % 20}'
+
+
+def bulk(path: str, script: str, tables: dict) -> None:
+    '''
+    Create a SQLite database and fill its tables in a single transaction.
+
+    Args:
+        path (str): The path of the database, replaced if it exists.
+        script (str): The schema.
+        tables (dict): The rows (iterable of tuples) by insert statement.
+    '''
+    if os.path.exists(path):
+        os.remove(path)
+    conn = sqlite3.connect(path)
+    conn.execute('PRAGMA journal_mode = OFF')
+    conn.execute('PRAGMA synchronous = OFF')
+    conn.executescript(script)
+    with conn:
+        for insert, rows in tables.items():
+            conn.executemany(insert, rows)
+    conn.close()
+
+
+def chromium_history(path: str, rows: int, downloads: int = None) -> None:
+    '''
+    Write a Chromium History database with urls, visits, downloads and search terms.
+
+    Args:
+        path (str): The path of the database.
+        rows (int): The number of urls, each one with a visit.
+        downloads (int): The number of downloads. Defaults to a tenth of the rows.
+    '''
+    downloads = rows // 10 if downloads is None else downloads
+    bulk(path, '''
+        CREATE TABLE urls (id INTEGER PRIMARY KEY, url LONGVARCHAR, title LONGVARCHAR,
+            visit_count INTEGER DEFAULT 0 NOT NULL, typed_count INTEGER DEFAULT 0 NOT NULL,
+            last_visit_time INTEGER NOT NULL, hidden INTEGER DEFAULT 0 NOT NULL);
+        CREATE TABLE visits (id INTEGER PRIMARY KEY, url INTEGER NOT NULL,
+            visit_time INTEGER NOT NULL, from_visit INTEGER, transition INTEGER DEFAULT 0 NOT NULL,
+            segment_id INTEGER, visit_duration INTEGER DEFAULT 0 NOT NULL);
+        CREATE TABLE downloads (id INTEGER PRIMARY KEY, guid VARCHAR NOT NULL,
+            current_path LONGVARCHAR NOT NULL, target_path LONGVARCHAR NOT NULL,
+            start_time INTEGER NOT NULL, received_bytes INTEGER NOT NULL,
+            total_bytes INTEGER NOT NULL, state INTEGER NOT NULL, danger_type INTEGER NOT NULL,
+            interrupt_reason INTEGER NOT NULL, end_time INTEGER NOT NULL, opened INTEGER NOT NULL,
+            referrer VARCHAR NOT NULL, tab_url VARCHAR NOT NULL, mime_type VARCHAR(255) NOT NULL);
+        CREATE TABLE downloads_url_chains (id INTEGER NOT NULL, chain_index INTEGER NOT NULL,
+            url LONGVARCHAR NOT NULL, PRIMARY KEY (id, chain_index));
+        CREATE TABLE keyword_search_terms (keyword_id INTEGER NOT NULL, url_id INTEGER NOT NULL,
+            term LONGVARCHAR NOT NULL, normalized_term LONGVARCHAR NOT NULL);
+    ''', {
+        'INSERT INTO urls VALUES (?, ?, ?, ?, 0, ?, 0)': (
+            (index + 1, url(index), f'Page {index}', index % 20 + 1,
+             WEBKIT_START + index * 1000000) for index in range(rows)),
+        'INSERT INTO visits VALUES (?, ?, ?, 0, 805306368, 0, 0)': (
+            (index + 1, index + 1, WEBKIT_START + index * 1000000) for index in range(rows)),
+        'INSERT INTO downloads VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 0, ?, 0, ?, ?, ?)': (
+            (index + 1, f'guid-{index}', f'/home/user/Downloads/file{index}.zip',
+             f'/home/user/Downloads/file{index}.zip', WEBKIT_START + index * 1000000,
+             1024 * index, 1024 * index, *download_state(index),
+             WEBKIT_START + index * 1000000 + 5000000,
+             url(index), url(index), 'application/zip') for index in range(downloads)),
+        # The final url, and a redirect before it for the even downloads.
+        'INSERT INTO downloads_url_chains VALUES (?, ?, ?)': (
+            (index + 1, index % 2 == 0, url(index) + '.zip') for index in range(downloads)),
+        'INSERT INTO downloads_url_chains VALUES (?, 0, ?)': (
+            (index + 1, url(index)) for index in range(0, downloads, 2)),
+        'INSERT INTO keyword_search_terms VALUES (2, ?, ?, ?)': (
+            (index + 1, search_term(index).title(), search_term(index))
+            for index in range(0, rows, 2)),
+    })
+
+
+def download_state(index: int) -> tuple[int, int]:
+    '''Get the synthetic chromium (state, danger type) of a download, one in five is interrupted.'''
+    return (4, 3) if index % 5 == 4 else (1, 0)
+
+
+def bookmark_folder(index: int) -> tuple[int, int]:
+    '''Get the synthetic (folder, subfolder) of a bookmark, every fifth one is in no subfolder.'''
+    return index % 10, -1 if index % 5 == 0 else index % 3
+
+
+def firefox_places(path: str, rows: int, downloads: int = None, bookmarks: int = None) -> None:
+    '''
+    Write a Firefox places.sqlite database with places, visits, download annotations,
+    address bar inputs and bookmarks.
+
+    Args:
+        path (str): The path of the database.
+        rows (int): The number of places, each one with a visit.
+        downloads (int): The number of downloads. Defaults to a tenth of the rows.
+        bookmarks (int): The number of bookmarks, see bookmark_folder.
+            Defaults to a tenth of the rows.
+    '''
+    downloads = rows // 10 if downloads is None else downloads
+    bookmarks = rows // 10 if bookmarks is None else bookmarks
+    # The roots (1 to 5), the folders of the toolbar (6 to 15) and their subfolders.
+    folders = [(1, 2, 0, 0, 'root________', ''), (2, 2, 1, 0, 'menu________', 'menu'),
+               (3, 2, 1, 1, 'toolbar_____', 'toolbar'), (4, 2, 1, 2, 'unfiled_____', 'unfiled'),
+               (5, 2, 1, 3, 'mobile______', 'mobile')]
+    folders += [(6 + index, 2, 3, index, f'folder{index:06d}', f'Folder {index}')
+                for index in range(10)]
+    folders += [(16 + index * 3 + sub, 2, 6 + index, 1000 + sub, f'sub{index:03d}{sub:05d}',
+                 f'Sub {sub}') for index in range(10) for sub in range(3)]
+
+    def parent(index: int) -> int:
+        top, sub = bookmark_folder(index)
+        return 6 + top if sub < 0 else 16 + top * 3 + sub
+    bulk(path, '''
+        CREATE TABLE moz_places (id INTEGER PRIMARY KEY, url LONGVARCHAR, title LONGVARCHAR,
+            rev_host LONGVARCHAR, visit_count INTEGER DEFAULT 0, hidden INTEGER DEFAULT 0 NOT NULL,
+            typed INTEGER DEFAULT 0 NOT NULL, frecency INTEGER DEFAULT -1 NOT NULL,
+            last_visit_date INTEGER, guid TEXT, url_hash INTEGER DEFAULT 0 NOT NULL);
+        CREATE TABLE moz_historyvisits (id INTEGER PRIMARY KEY, from_visit INTEGER,
+            place_id INTEGER, visit_date INTEGER, visit_type INTEGER, session INTEGER);
+        CREATE TABLE moz_anno_attributes (id INTEGER PRIMARY KEY, name VARCHAR(32) UNIQUE NOT NULL);
+        CREATE TABLE moz_annos (id INTEGER PRIMARY KEY, place_id INTEGER NOT NULL,
+            anno_attribute_id INTEGER, content LONGVARCHAR, flags INTEGER DEFAULT 0,
+            expiration INTEGER DEFAULT 0, type INTEGER DEFAULT 0, dateAdded INTEGER DEFAULT 0,
+            lastModified INTEGER DEFAULT 0);
+        CREATE TABLE moz_inputhistory (place_id INTEGER NOT NULL, input LONGVARCHAR NOT NULL,
+            use_count INTEGER, PRIMARY KEY (place_id, input));
+        CREATE TABLE moz_bookmarks (id INTEGER PRIMARY KEY, type INTEGER, fk INTEGER DEFAULT NULL,
+            parent INTEGER, position INTEGER, title LONGVARCHAR, dateAdded INTEGER,
+            lastModified INTEGER, guid TEXT);
+    ''', {
+        'INSERT INTO moz_places VALUES (?, ?, ?, ?, ?, 0, 0, 100, ?, ?, 0)': (
+            (index + 1, url(index), f'Page {index}',
+             f'site{index % HOSTS}.example.com'[::-1] + '.', index % 20 + 1,
+             UNIX_START + index * 1000000, f'guid{index:08d}') for index in range(rows)),
+        'INSERT INTO moz_historyvisits VALUES (?, 0, ?, ?, 1, 0)': (
+            (index + 1, index + 1, UNIX_START + index * 1000000) for index in range(rows)),
+        'INSERT INTO moz_anno_attributes VALUES (?, ?)': [
+            (1, 'downloads/destinationFileURI'), (2, 'downloads/metaData')],
+        'INSERT INTO moz_annos VALUES (?, ?, 1, ?, 0, 4, 3, ?, ?)': (
+            (index + 1, index + 1, f'file:///home/user/Downloads/file{index}.zip',
+             UNIX_START + index * 1000000, UNIX_START + index * 1000000 + 5000000)
+            for index in range(downloads)),
+        'INSERT INTO moz_annos VALUES (?, ?, 2, ?, 0, 4, 3, ?, ?)': (
+            (downloads + index + 1, index + 1, json.dumps({
+                'state': 1 if index % 5 != 4 else 8, 'deleted': False, 'fileSize': 1024 * index,
+                'endTime': (UNIX_START + index * 1000000 + 5000000) // 1000,
+                **({'reputationCheckVerdict': 'MALWARE'} if index % 5 == 4 else {})}),
+             UNIX_START + index * 1000000, UNIX_START + index * 1000000 + 5000000)
+            for index in range(downloads)),
+        'INSERT INTO moz_inputhistory VALUES (?, ?, 1.0)': (
+            (index + 1, search_term(index)) for index in range(0, rows, 2)),
+        'INSERT INTO moz_bookmarks VALUES (?, ?, NULL, ?, ?, ?, ?, ?, ?)': [
+            (id_, kind, parent_id, position, title, UNIX_START, UNIX_START, guid)
+            for id_, kind, parent_id, position, guid, title in folders],
+        'INSERT INTO moz_bookmarks VALUES (?, 1, ?, ?, ?, ?, ?, ?, ?)': (
+            (100 + index, index % max(rows, 1) + 1, parent(index), index, f'Bookmark {index}',
+             UNIX_START + index * 1000000, UNIX_START + index * 1000000, f'bm{index:010d}')
+            for index in range(bookmarks)),
+    })
+
+
+def chromium_bookmarks(path: str, bookmarks: int) -> None:
+    '''
+    Write a Chromium Bookmarks file, the bookmarks are in folders of the bookmarks bar.
+
+    Args:
+        path (str): The path of the file.
+        bookmarks (int): The number of bookmarks, see bookmark_folder.
+    '''
+    def node(id_: int, name: str, children: list = None, address: str = None) -> dict:
+        data = {'date_added': str(WEBKIT_START + id_ * 1000000), 'guid': f'guid-{id_}',
+                'id': str(id_), 'name': name}
+        if address is None:
+            data.update(children=children, date_modified='0', type='folder')
+        else:
+            data.update(type='url', url=address)
+        return data
+
+    folders = [node(10 + index, f'Folder {index}', [
+        node(100 + index * 3 + sub, f'Sub {sub}', []) for sub in range(3)])
+        for index in range(10)]
+    for index in range(bookmarks):
+        top, sub = bookmark_folder(index)
+        children = folders[top]['children']
+        if sub >= 0:
+            children = children[sub]['children']
+        children.append(node(1000 + index, f'Bookmark {index}', address=url(index)))
+    roots = {
+        'bookmark_bar': node(1, 'Bookmarks bar', folders),
+        'other': node(2, 'Other bookmarks', []),
+        'synced': node(3, 'Mobile bookmarks', []),
+    }
+    checksum = hashlib.md5(json.dumps(roots, sort_keys=True).encode('utf-8')).hexdigest()
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump({'checksum': checksum, 'roots': roots, 'version': 1}, file, indent=3)
+
+
+def lz4_length(output: bytearray, value: int) -> None:
+    '''Append the extra bytes of an LZ4 literal or match length of 15 or more.'''
+    value -= 15
+    while value >= 255:
+        output.append(255)
+        value -= 255
+    output.append(value)
+
+
+def lz4_block(data: bytes) -> bytes:
+    '''
+    Compress data as an LZ4 block with a greedy matcher, matches may overlap.
+
+    Args:
+        data (bytes): The data to compress.
+    Returns:
+        bytes: The LZ4 block.
+    '''
+    output = bytearray()
+    table = {}
+    anchor = position = 0
+    end = len(data)
+
+    def sequence(literals: bytes, offset: int = 0, length: int = 0) -> None:
+        token = min(len(literals), 15) << 4 | (min(length - 4, 15) if offset else 0)
+        output.append(token)
+        if len(literals) >= 15:
+            lz4_length(output, len(literals))
+        output.extend(literals)
+        if offset:
+            output.extend(struct.pack('<H', offset))
+            if length - 4 >= 15:
+                lz4_length(output, length - 4)
+
+    # The last match starts 12 bytes before the end and the last 5 bytes are literals.
+    while position < end - 12:
+        key = data[position:position + 4]
+        candidate = table.get(key)
+        table[key] = position
+        if candidate is None or position - candidate > 65535:
+            position += 1
+            continue
+        length = 4
+        while position + length < end - 5 and data[candidate + length] == data[position + length]:
+            length += 1
+        sequence(data[anchor:position], position - candidate, length)
+        position += length
+        anchor = position
+    sequence(data[anchor:])
+    return bytes(output)
+
+
+def mozlz4(path: str, data: bytes) -> None:
+    '''Write a Firefox mozLz4 file.'''
+    with open(path, 'wb') as file:
+        file.write(b'mozLz40\x00' + struct.pack('<I', len(data)) + lz4_block(data))
+
+
+def firefox_session(path: str, tabs: int, windows: int = 1, navigations: int = 3,
+                    closed: int = 0) -> None:
+    '''
+    Write a Firefox sessionstore file (mozLz4 JSON).
+
+    Args:
+        path (str): The path of the file.
+        tabs (int): The number of open tabs, spread over the windows.
+        windows (int): The number of windows. Defaults to 1.
+        navigations (int): The navigation entries of each tab. Defaults to 3.
+        closed (int): The recently closed tabs of the first window. Defaults to 0.
+    '''
+    def tab(number: int) -> dict:
+        return {
+            'entries': [{'url': url(number * navigations + entry),
+                         'title': f'Page {number} {entry}'} for entry in range(navigations)],
+            'index': navigations,
+            'lastAccessed': UNIX_START // 1000 + number * 1000,
+            'pinned': number == 0,
+        }
+
+    state = {'windows': [], 'selectedWindow': 1, '_closedWindows': []}
+    per_window = max(-(-tabs // windows), 1)
+    for window in range(windows):
+        numbers = range(window * per_window, min((window + 1) * per_window, tabs))
+        state['windows'].append({'tabs': [tab(number) for number in numbers], 'selected': 1,
+                                 '_closedTabs': []})
+    state['windows'][0]['_closedTabs'] = [
+        {'state': tab(tabs + number), 'closedAt': UNIX_START // 1000 + number * 1000, 'pos': 0}
+        for number in range(closed)]
+    mozlz4(path, json.dumps(state).encode('utf-8'))
+
+
+def local_state(user_data: str, profiles: list[str]) -> None:
+    '''
+    Write the Local State file of a chromium user data folder, the first profile is the last used.
+
+    Args:
+        user_data (str): The user data folder.
+        profiles (list of str): The folder names of the profiles.
+    '''
+    state = {'profile': {
+        'last_used': profiles[0],
+        'info_cache': {profile: {'name': f'Person {index + 1}'}
+                       for index, profile in enumerate(profiles)},
+    }}
+    with open(os.path.join(user_data, 'Local State'), 'w', encoding='utf-8') as file:
+        json.dump(state, file)
+
+
+def profiles_ini(folder: str, profiles: list[str]) -> None:
+    '''
+    Write the profiles.ini file of a firefox folder, the first profile is the default one.
+
+    Args:
+        folder (str): The folder of the profiles.
+        profiles (list of str): The folder names of the profiles.
+    '''
+    lines = ['[Install4F96D1932A9F858E]', f'Default={profiles[0]}', 'Locked=1', '']
+    for index, profile in enumerate(profiles):
+        lines += [f'[Profile{index}]', f'Name={profile.split(".")[-1]}', 'IsRelative=1',
+                  f'Path={profile}', '']
+    lines += ['[General]', 'StartWithLastProfile=1', 'Version=2', '']
+    with open(os.path.join(folder, 'profiles.ini'), 'w', encoding='utf-8') as file:
+        file.write('\n'.join(lines))
+
+
+def pickle_string(value: str, wide: bool = False) -> bytes:
+    '''Encode a pickle aligned string (or string16 if wide).'''
+    data = value.encode('utf-16-le' if wide else 'utf-8')
+    data = struct.pack('<I', len(data) // 2 if wide else len(data)) + data
+    return data + b'\x00' * (-len(data) % 4)
+
+
+class SnssWriter:
+    '''
+        Buffered writer of SNSS session files.
+        Commands are written through a large buffer, so files with many thousands of
+        tabs are written with a few system calls.
+    '''
+
+    def __init__(self, path: str, buffer_size: int = 1 << 20):
+        '''
+        Create the file and write the SNSS header.
+
+        Args:
+            path (str): The path of the file.
+            buffer_size (int): The size of the write buffer. Defaults to 1 MiB.
+        '''
+        self.__file = open(path, 'wb', buffering=buffer_size)
+        self.__file.write(SNSS_HEADER)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def command(self, kind: int, payload: bytes) -> None:
+        '''
+        Write a raw command.
+
+        Args:
+            kind (int): The command id.
+            payload (bytes): The command content.
+        '''
+        self.__file.write(COMMAND_HEADER.pack(len(payload) + 1, int(kind)))
+        self.__file.write(payload)
+
+    def navigation(self, tab_id: int, index: int, address: str, title: str,
+                   kind: int = CommandType.UpdateTabNavigation.value) -> None:
+        '''Write a navigation entry of a tab.'''
+        body = (struct.pack('<ii', tab_id, index) + pickle_string(address)
+                + pickle_string(title, True))
+        self.command(kind, struct.pack('<I', len(body)) + body)
+
+    def tab(self, window_id: int, tab_id: int, index: int, navigations: list[tuple],
+            **kwargs) -> None:
+        '''
+        Write a tab with its window, index and navigation entries.
+
+        Args:
+            window_id (int): The id of the window.
+            tab_id (int): The id of the tab.
+            index (int): The position of the tab in the window.
+            navigations (list of tuple): The (url, title) navigation entries.
+            selected (int): The selected navigation. Defaults to the last one.
+            pinned (bool): Whether the tab is pinned. Defaults to False.
+        '''
+        self.command(CommandType.SetTabWindow.value, struct.pack('<ii', window_id, tab_id))
+        self.command(CommandType.SetTabIndexInWindow.value, struct.pack('<ii', tab_id, index))
+        for position, (address, title) in enumerate(navigations):
+            self.navigation(tab_id, position, address, title)
+        selected = kwargs.get('selected', len(navigations) - 1)
+        self.command(CommandType.SetSelectedNavigationIndex.value,
+                     struct.pack('<ii', tab_id, selected))
+        if kwargs.get('pinned'):
+            self.command(CommandType.SetPinnedState.value, struct.pack('<iB3x', tab_id, 1))
+
+    def selected_tab(self, window_id: int, index: int) -> None:
+        '''Write the selected tab of a window.'''
+        self.command(CommandType.SetSelectedTabInIndex.value, struct.pack('<ii', window_id, index))
+
+    def active_window(self, window_id: int) -> None:
+        '''Write the active window.'''
+        self.command(CommandType.SetActiveWindow.value, struct.pack('<i', window_id))
+
+    def close(self) -> None:
+        '''Flush and close the file.'''
+        self.__file.close()
+
+
+def snss_session(path: str, tabs: int, windows: int = 1, navigations: int = 3) -> None:
+    '''
+    Write a SNSS Session file.
+
+    Args:
+        path (str): The path of the file.
+        tabs (int): The number of tabs, spread over the windows.
+        windows (int): The number of windows. Defaults to 1.
+        navigations (int): The navigation entries of each tab. Defaults to 3.
+    '''
+    with SnssWriter(path) as writer:
+        for tab in range(tabs):
+            entries = [(url(tab * navigations + index), f'Page {tab} {index}')
+                       for index in range(navigations)]
+            writer.tab(tab % windows + 1, tab + 1, tab // windows, entries)
+        for window in range(windows):
+            writer.selected_tab(window + 1, 0)
+        writer.active_window(1)
+
+
+def data_folder(root: str, name: str, os_: str = 'linux') -> str:
+    '''
+    Get the folder a browser keeps its data in, inside a home directory.
+
+    Args:
+        root (str): The home directory.
+        name (str): The name of a registered browser.
+        os_ (str): The system of the home directory. Defaults to linux.
+    Raises:
+        BrowserError: If the browser is not registered or not supported in the system.
+    Returns:
+        str: The user data folder (chromium) or the profiles folder (firefox).
+    '''
+    data = REGISTRY.get(name)
+    if data is None or os_ not in data['os_support']:
+        raise BrowserError(f'The browser {name} is not supported in {os_}.')
+    base, path = data['local_path'][os_].split('/', 1)
+    folder = os.path.normpath(os.path.join(root, Utilities.ROOT_FOLDERS[base], path))
+    if data['chromium'] and os.path.basename(folder) == 'Default':
+        folder = os.path.dirname(folder)
+    return folder
+
+
+def browser_profiles(root: str, name: str, os_: str = 'linux', **kwargs) -> list[str]:
+    '''
+    Write the profiles of a browser inside a home directory.
+
+    Args:
+        root (str): The home directory.
+        name (str): The name of a registered browser.
+        os_ (str): The system of the home directory. Defaults to linux.
+        profiles (int): The number of profiles. Defaults to 1.
+        rows (int): The history rows of each profile. Defaults to 1000.
+        downloads (int): The downloads of each profile. Defaults to a tenth of the rows.
+        bookmarks (int): The bookmarks of each profile. Defaults to a tenth of the rows.
+        tabs (int): The tabs of the session of each profile. Defaults to 100.
+    Raises:
+        BrowserError: If the browser is not registered or not supported in the system.
+    Returns:
+        list[str]: The paths of the profiles, the default one first.
+    '''
+    folder = data_folder(root, name, os_)
+    data = REGISTRY.get(name)
+    count = kwargs.get('profiles', 1)
+    rows = kwargs.get('rows', 1000)
+    downloads = kwargs.get('downloads')
+    bookmarks = kwargs.get('bookmarks')
+    bookmarks = rows // 10 if bookmarks is None else bookmarks
+    tabs = kwargs.get('tabs', 100)
+    if data['chromium']:
+        names = ['Default'] + [f'Profile {index}' for index in range(1, count)]
+    else:
+        names = [f'profile{index:04d}.default-release' for index in range(count)]
+    paths = [os.path.join(folder, profile) for profile in names]
+    for path in paths:
+        os.makedirs(path, exist_ok=True)
+        if data['chromium']:
+            chromium_history(os.path.join(path, 'History'), rows, downloads)
+            chromium_bookmarks(os.path.join(path, 'Bookmarks'), bookmarks)
+            os.makedirs(os.path.join(path, 'Sessions'), exist_ok=True)
+            snss_session(os.path.join(path, 'Sessions', f'Session_{WEBKIT_START}'),
+                         tabs, windows=max(tabs // 100, 1))
+        else:
+            firefox_places(os.path.join(path, 'places.sqlite'), rows, downloads, bookmarks)
+            os.makedirs(os.path.join(path, 'sessionstore-backups'), exist_ok=True)
+            firefox_session(os.path.join(path, 'sessionstore-backups', 'recovery.jsonlz4'),
+                            tabs, windows=max(tabs // 100, 1))
+    if data['chromium']:
+        local_state(folder, names)
+    else:
+        profiles_ini(folder, names)
+    return paths
+
+
+def make_home(root: str, browsers: tuple = ('chrome', 'firefox'), os_: str = 'linux',
+              **kwargs) -> dict[str, list[str]]:
+    '''
+    Write a home directory with synthetic profiles of several browsers.
+
+    Args:
+        root (str): The home directory.
+        browsers (tuple of str): The names of the browsers. Defaults to chrome and firefox.
+        os_ (str): The system of the home directory. Defaults to linux.
+        **kwargs: The options of browser_profiles.
+    Raises:
+        BrowserError: If a browser is not registered or not supported in the system.
+    Returns:
+        dict: The paths of the profiles by browser name.
+    '''
+    return {name: browser_profiles(root, name, os_, **kwargs) for name in browsers}
@@ -4,13 +4,19 @@ TODO: Add linux and macos complete support.
 '''
 
 import sys
-from datetime import datetime, timedelta
+import socket
+from datetime import datetime, timedelta, timezone
 from pybrinf.exceptions import BrowserError
-from pybrinf.browsers import BROWSERS
+from pybrinf.browsers import BROWSERS, REGISTRY
 from pybrinf.queries import (
     DOWNLOAD_QUERY,
+    MOZ_BOOKMARK_QUERY,
     MOZ_DOWNLOAD_QUERY,
+    MOZ_SEARCH_QUERY,
     MOZ_WEBSITE_QUERY,
+    SEARCH_PERIODS,
+    SEARCH_QUERY,
+    SEARCH_TOTALS,
     WEBSITE_QUERY,
 )
 
@@ -19,15 +25,33 @@ class Utilities:
     '''Utilities class for PyBrinf.'''
 
     BROWSERS = BROWSERS
+    REGISTRY = REGISTRY
     SUPPORTED_SYSTEMS = ['win32', 'linux']
-    SUPPORTED_BROWSERS = ['chrome', 'edge', 'yandex',
-                          'firefox', 'opera', 'brave', 'vivaldi']
     DEFAULT_BROWSER_KEY = \
         'Software\\Microsoft\\Windows\\Shell\\Associations\\UrlAssociations\\http\\UserChoice'
 
     LINUX_DEFAULT_BROWSER = 'xdg-settings get default-web-browser'.split()
+    # mimeapps.list files by precedence and the keys that name the web browser.
+    LINUX_MIMEAPPS = [
+        '{config}/mimeapps.list',
+        '~/.local/share/applications/mimeapps.list',
+        '/usr/share/applications/mimeapps.list',
+    ]
+    LINUX_MIMEAPPS_KEYS = ['x-scheme-handler/http', 'x-scheme-handler/https', 'text/html']
+    # Folders of the environment variables of the browsers data, relative to a home directory.
+    ROOT_FOLDERS = {
+        'HOME': '',
+        'APPDATA': 'AppData/Roaming',
+        'LOCALAPPDATA': 'AppData/Local',
+    }
+    # SQL dates of the start of a search period (Monday for weeks) from unix seconds.
+    SEARCH_PERIODS = {
+        'day': "date({seconds}, 'unixepoch')",
+        'week': "date({seconds}, 'unixepoch', '-6 days', 'weekday 1')",
+    }
     KILL_PROCESS = 'taskkill /f /im {}'
     SEARCH_PROCESS = 'WMIC PROCESS WHERE "name=\'{}\'" GET ExecutablePath'
+    LIST_PROCESSES = 'tasklist /fo csv /nh'.split()
     SEARCH_TITLE = 'tasklist /fi "imagename eq {}" /fo list /v'
 
     @staticmethod
@@ -40,6 +64,18 @@ class Utilities:
         '''
         return sys.platform
 
+    @staticmethod
+    def free_port() -> int:
+        '''
+        Get a free TCP port of the local machine.
+
+        Returns:
+            int: The port number.
+        '''
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.bind(('127.0.0.1', 0))
+            return sock.getsockname()[1]
+
     @staticmethod
     def set_filter(query: str, **kwargs) -> str:
         '''
@@ -56,6 +92,24 @@ class Utilities:
         query += f' OFFSET {kwargs["offset"] if kwargs.get("offset") else 0}'
         return query
 
+    @staticmethod
+    def since_filter(query: str, column: str, chromium: bool, since: datetime) -> str:
+        '''
+        Keep the rows of a query from a date, the filter is added before the ORDER BY clause.
+
+        Args:
+            query (str): The query to filter.
+            column (str): The timestamp column, webkit for chromium and unix microseconds otherwise.
+            chromium (bool): If the browser is chromium based.
+            since (datetime): The oldest date to keep, naive dates are UTC.
+        Returns:
+            str: The filtered query.
+        '''
+        value = Utilities.date_to_webkit(since) if chromium else Utilities.date_to_unix(since)
+        head, order = query.rsplit('ORDER BY', 1)
+        keyword = 'AND' if 'WHERE' in head else 'WHERE'
+        return f'{head}{keyword} {column} >= {value}\nORDER BY{order}'
+
     @staticmethod
     def website_query(chromium: bool, **kwargs) -> str:
         '''
@@ -65,11 +119,15 @@ class Utilities:
             chromium (bool): If the browser is chromium based.
             limit (int): The limit of the items to get.
             offset (int): The offset of the items to get.
+            since (datetime): The oldest visit to get.
 
         Returns:
             str: The history query.
         '''
         query = WEBSITE_QUERY if chromium else MOZ_WEBSITE_QUERY
+        if kwargs.get('since') is not None:
+            column = 'last_visit_time' if chromium else 'last_visit_date'
+            query = Utilities.since_filter(query, column, chromium, kwargs['since'])
         return Utilities.set_filter(query, **kwargs)
 
     @staticmethod
@@ -81,10 +139,66 @@ class Utilities:
             chromium (bool): If the browser is chromium based.
             limit (int): The limit of the items to get.
             offset (int): The offset of the items to get.
+            since (datetime): The oldest download start to get.
         Returns:
             str: The query for downloads.
         '''
         query = DOWNLOAD_QUERY if chromium else MOZ_DOWNLOAD_QUERY
+        if kwargs.get('since') is not None:
+            column = 'start_time' if chromium else 'destination.dateAdded'
+            query = Utilities.since_filter(query, column, chromium, kwargs['since'])
+        return Utilities.set_filter(query, **kwargs)
+
+    @staticmethod
+    def bookmark_query(**kwargs) -> str:
+        '''
+        Get the query for Firefox bookmarks.
+
+        Args:
+            limit (int): The limit of the items to get.
+            offset (int): The offset of the items to get.
+        Returns:
+            str: The query for bookmarks.
+        '''
+        return Utilities.set_filter(MOZ_BOOKMARK_QUERY, **kwargs)
+
+    @staticmethod
+    def search_query(chromium: bool, **kwargs) -> str:
+        '''
+        Get the query of the search terms aggregates, computed by SQLite.
+
+        Args:
+            chromium (bool): If the browser is chromium based.
+            period (str): None for totals over all time, day or week for the top terms
+                of every period.
+            top (int): The number of terms to get, of every period if there is one.
+                Defaults to all the terms, or 10 by period.
+            since (datetime): The oldest search to count.
+            limit (int): The limit of the rows to get.
+            offset (int): The offset of the rows to get.
+        Raises:
+            BrowserError: If the period is unknown.
+        Returns:
+            str: The query of the (term, count, last used, period) rows.
+        '''
+        period = kwargs.get('period')
+        if period is not None and period not in Utilities.SEARCH_PERIODS:
+            raise BrowserError(f'Unknown search period {period}.')
+        where = ''
+        if kwargs.get('since') is not None:
+            column = 'visits.visit_time' if chromium else 'moz_places.last_visit_date'
+            since = kwargs['since']
+            value = Utilities.date_to_webkit(since) if chromium else Utilities.date_to_unix(since)
+            where = f'WHERE {column} >= {value}'
+        query = (SEARCH_QUERY if chromium else MOZ_SEARCH_QUERY).format(where=where)
+        if period is None:
+            if kwargs.get('top'):
+                kwargs['limit'] = min(kwargs['top'], kwargs.get('limit') or kwargs['top'])
+            return Utilities.set_filter(query + SEARCH_TOTALS, **kwargs)
+        seconds = 'time / 1000000 - 11644473600' if chromium else 'time / 1000000'
+        query += SEARCH_PERIODS.format(
+            period=Utilities.SEARCH_PERIODS[period].format(seconds=seconds),
+            top=int(kwargs.get('top') or 10))
         return Utilities.set_filter(query, **kwargs)
 
     @staticmethod
@@ -94,13 +208,15 @@ class Utilities:
 
         Args:
             name (str): The name of the browser.
+        Raises:
+            BrowserError: If the browser is not supported.
         Returns:
             dict: The data of the browser.
         '''
-        for browser in BROWSERS:
-            if browser['name'].lower() == name.lower():
-                return browser
-        raise BrowserError('The browser is not supported.')
+        browser = REGISTRY.get(name)
+        if browser is None:
+            raise BrowserError('The browser is not supported.')
+        return browser
 
     @staticmethod
     def date_to_int(date: datetime) -> int:
@@ -130,6 +246,33 @@ class Utilities:
         delta = timedelta(microseconds=webkit)
         return epoch_start + delta
 
+    @staticmethod
+    def date_to_webkit(date: datetime) -> int:
+        '''
+        Convert a datetime object to a webkit timestamp.
+
+        Args:
+            date (datetime): The datetime object to convert, naive ones are UTC.
+        Returns:
+            int: The microseconds since 1601-01-01.
+        '''
+        if date.tzinfo is not None:
+            date = date.astimezone(timezone.utc).replace(tzinfo=None)
+        delta = date - datetime(1601, 1, 1)
+        return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+    @staticmethod
+    def date_to_unix(date: datetime) -> int:
+        '''
+        Convert a datetime object to a unix timestamp in microseconds.
+
+        Args:
+            date (datetime): The datetime object to convert, naive ones are UTC.
+        Returns:
+            int: The microseconds since 1970-01-01.
+        '''
+        return Utilities.date_to_webkit(date) - Utilities.date_to_webkit(datetime(1970, 1, 1))
+
     @staticmethod
     def unix_to_date(unix: int) -> datetime:
         '''
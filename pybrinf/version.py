@@ -0,0 +1,127 @@
+'''
+Version implementation for PyBrinf.
+This module is used to read the version of a browser from its files, without running it.
+Docstrings are written in Google style.
+'''
+
+import os
+import re
+import threading
+import configparser
+from collections import OrderedDict
+
+VERSION_PATTERN = re.compile(r'^\d+(\.\d+)+')
+
+# Versions by (app path, app mtime, data path), shared by all the browsers. Bounded LRU,
+# every update of a browser adds a key.
+CACHE = OrderedDict()
+CACHE_SIZE = 64
+LOCK = threading.Lock()
+
+
+def read_ini(path: str, section: str, option: str) -> str:
+    '''
+    Read an option of an ini file.
+
+    Args:
+        path (str): The path of the ini file.
+        section (str): The section of the option.
+        option (str): The option to read.
+    Returns:
+        str: The value or None if the file or the option does not exist.
+    '''
+    parser = configparser.ConfigParser(interpolation=None)
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            parser.read_file(file)
+    except (OSError, configparser.Error):
+        return None
+    return parser.get(section, option, fallback=None)
+
+
+def chromium_version(app_path: str, user_data: str) -> str:
+    '''
+    Read the version of a chromium based browser.
+    Uses the Last Version file of the user data folder or the version folder
+    next to the executable (Windows installations).
+
+    Args:
+        app_path (str): The path of the browser executable.
+        user_data (str): The path of the browser user data folder.
+    Returns:
+        str: The version or None if it could not be found.
+    '''
+    if user_data:
+        try:
+            with open(os.path.join(user_data, 'Last Version'), 'r', encoding='utf-8') as file:
+                version = file.read().strip()
+            if VERSION_PATTERN.match(version):
+                return version
+        except OSError:
+            pass
+    folder = os.path.dirname(os.path.realpath(app_path))
+    try:
+        versions = [file for file in os.listdir(folder) if VERSION_PATTERN.match(file)]
+    except OSError:
+        return None
+    if not versions:
+        return None
+    return max(versions, key=lambda version: tuple(int(part) for part in version.split('.')))
+
+
+def firefox_version(app_path: str, profile: str) -> str:
+    '''
+    Read the version of a firefox based browser.
+    Uses the application.ini file next to the executable or the compatibility.ini
+    file of the profile.
+
+    Args:
+        app_path (str): The path of the browser executable.
+        profile (str): The path of the browser default profile.
+    Returns:
+        str: The version or None if it could not be found.
+    '''
+    application = os.path.join(os.path.dirname(os.path.realpath(app_path)), 'application.ini')
+    version = read_ini(application, 'App', 'Version')
+    if version:
+        return version
+    if profile:
+        # LastVersion looks like 115.0.2_20230726201356/20230726201356
+        version = read_ini(os.path.join(profile, 'compatibility.ini'),
+                           'Compatibility', 'LastVersion')
+        if version:
+            return version.split('_', 1)[0]
+    return None
+
+
+def disk_version(app_path: str, chromium: bool, data_path: str) -> str:
+    '''
+    Read the version of a browser from its files, caching it by app path and mtime.
+
+    Args:
+        app_path (str): The path of the browser executable.
+        chromium (bool): Whether the browser is a chromium based browser.
+        data_path (str): The user data folder (chromium) or the default profile (firefox).
+    Returns:
+        str: The version or None if it could not be found.
+    '''
+    try:
+        mtime = os.stat(app_path).st_mtime_ns
+    except OSError:
+        return None
+    key = (app_path, mtime, data_path)
+    with LOCK:
+        if key in CACHE:
+            CACHE.move_to_end(key)
+            return CACHE[key]
+    if chromium:
+        version = chromium_version(app_path, data_path)
+    else:
+        version = firefox_version(app_path, data_path)
+    if version:
+        with LOCK:
+            CACHE[key] = version
+            CACHE.move_to_end(key)
+            while len(CACHE) > CACHE_SIZE:
+                CACHE.popitem(last=False)
+    return version
@@ -0,0 +1,37 @@
+import io
+import os
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from benchmarks import run
+
+'''Smoke tests for the benchmarks suite.'''
+
+class TestBenchmarks(unittest.TestCase):
+
+    def test_run_and_compare(self):
+        '''> Should run every benchmark on small fixtures and compare with a saved baseline.'''
+        with tempfile.TemporaryDirectory() as folder:
+            baseline = os.path.join(folder, 'baseline.json')
+            with redirect_stdout(io.StringIO()):
+                code = run.main(['--rows', '200', '--tabs', '20', '--repeat', '1', '--save', baseline])
+            self.assertEqual(code, 0)
+            with open(baseline, 'r', encoding='utf-8') as file:
+                results = json.load(file)['results']
+            self.assertEqual(results['chrome_history']['items'], 200)
+            self.assertEqual(results['brinf_history']['items'], 400)
+            self.assertEqual(results['session_tabs']['items'], 20)
+            for result in results.values():
+                result['throughput'] *= 1000
+            with open(baseline, 'w', encoding='utf-8') as file:
+                json.dump({'results': results}, file)
+            output = io.StringIO()
+            with redirect_stdout(output):
+                code = run.main(['--rows', '200', '--tabs', '20', '--repeat', '1',
+                                 '--only', 'parser_commands', '--baseline', baseline, '--check'])
+            self.assertEqual(code, 1)
+            self.assertIn('REGRESSION', output.getvalue())
+
+if __name__ == '__main__':
+    unittest.main()
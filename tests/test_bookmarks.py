@@ -0,0 +1,76 @@
+import os
+import json
+import tempfile
+import unittest
+from pybrinf.browser import Browser
+from pybrinf.bookmarks import CACHE, flatten
+from pybrinf.stats import Stats
+from pybrinf.testing import make_home
+from pybrinf.utilities import Utilities
+
+'''All tests for the bookmarks.'''
+
+class TestBookmarks(unittest.TestCase):
+
+    def setUp(self):
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        self.root = folder.name
+        self.profiles = make_home(self.root, rows=100, bookmarks=40)
+        self.chrome = Browser('linux', root=self.root, **Utilities.get_browser_data('chrome'))
+        self.firefox = Browser('linux', root=self.root, **Utilities.get_browser_data('firefox'))
+        CACHE.clear()
+
+    def test_chromium(self):
+        '''> Should flatten the Bookmarks file with the folder path of every bookmark.'''
+        bookmarks = self.chrome.bookmarks()
+        self.assertEqual(len(bookmarks), 40)
+        folders = {bookmark.folder for bookmark in bookmarks}
+        self.assertIn('Bookmarks bar/Folder 0', folders)
+        self.assertIn('Bookmarks bar/Folder 1/Sub 1', folders)
+        self.assertEqual(bookmarks[0].profile, 'Default')
+        self.assertEqual(len(self.chrome.bookmarks(limit=5, offset=38)), 2)
+
+    def test_firefox(self):
+        '''> Should read the bookmarks of places.sqlite with their folder path.'''
+        bookmarks = self.firefox.bookmarks()
+        self.assertEqual(len(bookmarks), 40)
+        self.assertIn('toolbar/Folder 1/Sub 1', {bookmark.folder for bookmark in bookmarks})
+        self.assertEqual([bookmark.title for bookmark in self.firefox.bookmarks(limit=2)],
+                         [bookmarks[0].title, bookmarks[1].title])
+
+    def test_cache(self):
+        '''> Should parse the file again only when its checksum changes.'''
+        path = os.path.join(self.profiles['chrome'][0], 'Bookmarks')
+        with Stats() as stats:
+            self.chrome.bookmarks()
+            self.chrome.bookmarks()
+            # Rewritten with the same content, the checksum is the same.
+            with open(path, 'rb') as file:
+                data = file.read()
+            with open(path, 'wb') as file:
+                file.write(data + b'\n')
+            self.assertEqual(len(self.chrome.bookmarks()), 40)
+            self.assertEqual(stats.stages[('Google Chrome', 'parse')]['calls'], 1)
+            content = json.loads(data)
+            content['checksum'] = '0' * 32
+            content['roots']['other']['children'].append(
+                {'id': '9', 'name': 'New', 'type': 'url', 'url': 'https://new.example.com/'})
+            with open(path, 'w', encoding='utf-8') as file:
+                json.dump(content, file)
+            self.assertEqual(len(self.chrome.bookmarks()), 41)
+            self.assertEqual(stats.stages[('Google Chrome', 'parse')]['calls'], 2)
+
+    def test_deep_tree(self):
+        '''> Should flatten a tree deeper than the recursion limit.'''
+        root = node = {'name': 'Bookmarks bar', 'type': 'folder', 'children': []}
+        for depth in range(5000):
+            child = {'name': str(depth), 'type': 'folder', 'children': []}
+            node['children'] = [{'id': str(depth), 'name': 'B', 'type': 'url', 'url': 'x'}, child]
+            node = child
+        rows = flatten({'bookmark_bar': root})
+        self.assertEqual(len(rows), 5000)
+        self.assertEqual(rows[2][4], 'Bookmarks bar/0/1')
+
+if __name__ == '__main__':
+    unittest.main()
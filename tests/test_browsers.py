@@ -0,0 +1,68 @@
+import os
+import json
+import tempfile
+import unittest
+from pybrinf.browsers import BROWSERS, Registry
+from pybrinf.exceptions import BrowserError
+
+'''All tests for the browsers registry.'''
+
+class TestRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = Registry([dict(data) for data in BROWSERS])
+
+    def test_get_browser(self):
+        '''> Should find a browser by name, ignoring the case.'''
+        self.assertEqual(self.registry.get('CHROME')['name'], 'Chrome')
+        self.assertIsNone(self.registry.get('chrofox'))
+        self.assertIn('firefox', self.registry)
+
+    def test_get_browser_by_progid(self):
+        '''> Should find a browser by progid, ignoring the installation suffix.'''
+        self.assertEqual(self.registry.by_progid('ChromeHTML')['name'], 'Chrome')
+        self.assertEqual(self.registry.by_progid('FirefoxURL-308046B0AF4A39CB')['name'], 'Firefox')
+        self.assertEqual(self.registry.by_progid('MSEdgeHTM')['name'], 'Edge')
+
+    def test_get_browser_by_process_and_desktop(self):
+        '''> Should find a browser by process name and desktop file.'''
+        self.assertEqual(self.registry.by_process('chrome.exe')['name'], 'Chrome')
+        self.assertEqual(self.registry.by_process('google-chrome-stable')['name'], 'Chrome')
+        self.assertEqual(self.registry.by_desktop('google-chrome.desktop')['name'], 'Chrome')
+        self.assertEqual(self.registry.by_desktop('firefox.desktop')['name'], 'Firefox')
+
+    def test_register_browser(self):
+        '''> Should register a browser extending another one.'''
+        data = self.registry.register({
+            'name': 'Chromium',
+            'extends': 'Chrome',
+            'fullname': 'Chromium',
+            'process': {'linux': 'chromium'},
+            'local_path': {'linux': 'HOME/.config/chromium/Default'},
+        })
+        self.assertIs(self.registry.get('chromium'), data)
+        self.assertEqual(data['process'], {'win32': 'chrome.exe', 'linux': 'chromium'})
+        self.assertEqual(self.registry.by_process('chromium')['name'], 'Chromium')
+        self.assertEqual(self.registry.by_process('chrome.exe')['name'], 'Chrome')
+        with self.assertRaises(BrowserError):
+            self.registry.register(data)
+        self.registry.unregister('chromium')
+        self.assertNotIn('chromium', self.registry)
+
+    def test_register_invalid_browser(self):
+        '''> Should raise a BrowserError for an incomplete definition.'''
+        with self.assertRaises(BrowserError):
+            self.registry.register({'name': 'Broken'})
+
+    def test_load_browsers(self):
+        '''> Should register the browsers of a JSON file.'''
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'browsers.json')
+            with open(path, 'w', encoding='utf-8') as file:
+                json.dump({'browsers': [{'name': 'Thorium', 'extends': 'Chrome'}]}, file)
+            self.registry.load(path)
+        self.assertEqual(self.registry.get('thorium')['fullname'], 'Google Chrome')
+        self.assertEqual(len(self.registry), len(BROWSERS) + 1)
+
+if __name__ == '__main__':
+    unittest.main()
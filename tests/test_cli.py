@@ -0,0 +1,90 @@
+import io
+import os
+import csv
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+from pybrinf.cli import main, merged
+from pybrinf.testing import make_home
+
+'''All tests for the command line interface.'''
+
+class TestCli(unittest.TestCase):
+
+    def setUp(self):
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        self.root = folder.name
+        make_home(self.root, profiles=2, rows=20, downloads=3, tabs=5)
+
+    def run_cli(self, *argv) -> tuple[int, str]:
+        output = io.BytesIO()
+        code = main(list(argv) + ['--root', self.root], output)
+        return code, output.getvalue().decode('utf-8')
+
+    def test_history(self):
+        '''> Should stream the history of every profile as NDJSON, with limit and since.'''
+        code, text = self.run_cli('history')
+        self.assertEqual(code, 0)
+        rows = [json.loads(line) for line in text.splitlines()]
+        self.assertEqual(len(rows), 80)
+        self.assertEqual({row['profile'] for row in rows if row['browser'] == 'Google Chrome'},
+                         {'Default', 'Profile 1'})
+        _, text = self.run_cli('history', '--limit', '5', '--workers', '4')
+        self.assertEqual(len(text.splitlines()), 5)
+        _, text = self.run_cli('history', '--browser', 'chrome', '--since', '2023-01-09T08:00:15')
+        self.assertEqual(len(text.splitlines()), 2 * 5)
+        _, text = self.run_cli('history', '--browser', 'firefox', '--since', '2023-01-01T00:00:15')
+        self.assertEqual(len(text.splitlines()), 2 * 5)
+
+    def test_downloads_csv(self):
+        '''> Should write the downloads of a browser and profile as CSV.'''
+        code, text = self.run_cli('downloads', '--format', 'csv', '--browser', 'chrome',
+                                  '--profile', 'Profile 1')
+        self.assertEqual(code, 0)
+        rows = list(csv.DictReader(io.StringIO(text)))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual({row['profile'] for row in rows}, {'Profile 1'})
+
+    def test_search_terms(self):
+        '''> Should write the top search terms of every week.'''
+        code, text = self.run_cli('search_terms', '--browser', 'chrome', '--profile', 'Default',
+                                  '--period', 'week', '--top', '2')
+        self.assertEqual(code, 0)
+        rows = [json.loads(line) for line in text.splitlines()]
+        self.assertEqual([row['term'] for row in rows], ['term 9', 'term 8'])
+        self.assertEqual({row['period'] for row in rows}, {'2023-01-09'})
+
+    def test_sessions_and_export(self):
+        '''> Should write the session tabs and export items to a file.'''
+        _, text = self.run_cli('sessions', '--workers', '1')
+        rows = [json.loads(line) for line in text.splitlines()]
+        self.assertEqual(len(rows), 20)
+        files = {row['browser']: row['file'] for row in rows}
+        self.assertTrue(files['Google Chrome'].startswith('Session_'))
+        self.assertEqual(files['Mozilla Firefox'], 'sessionstore-backups/recovery.jsonlz4')
+        path = os.path.join(self.root, 'history.csv.gz')
+        code, _ = self.run_cli('export', 'history', path, '--browser', 'firefox')
+        self.assertEqual(code, 0)
+        self.assertTrue(os.path.getsize(path) > 0)
+
+    def test_errors(self):
+        '''> Should report an unsupported browser on stderr with exit code 1.'''
+        stderr = io.StringIO()
+        with redirect_stderr(stderr):
+            code, text = self.run_cli('history', '--browser', 'netscape')
+        self.assertEqual(code, 1)
+        self.assertEqual(text, '')
+        self.assertIn('netscape', stderr.getvalue())
+
+    def test_merged_stops_early(self):
+        '''> Should stop the workers when the reader stops.'''
+        sources = [lambda: iter(range(100000)) for _ in range(4)]
+        items = merged(sources, workers=2)
+        self.assertEqual(len([item for _, item in zip(range(10), items)]), 10)
+        items.close()
+        self.assertEqual(sum(1 for _ in merged(sources, workers=3)), 400000)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from pybrinf.columnar import read_columnar, has_pyarrow, columnar_format
+from pybrinf.file import export
+from pybrinf.item import History
+from pybrinf.exceptions import FileError
+
+'''All tests for Columnar module.'''
+
+def websites(count: int):
+    '''Generate history items from a few hosts.'''
+    for index in range(count):
+        yield History('Google Chrome', f'https://site{index % 3}.com/{index}', f'Site {index}',
+                      index, 13300000000000000 + index)
+
+class TestColumnar(unittest.TestCase):
+
+    def setUp(self):
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        self.folder = folder.name
+
+    def test_export_pbc(self):
+        '''> Should write record batches with dictionary hosts and int64 timestamps.'''
+        path = os.path.join(self.folder, 'history.pbc')
+        self.assertEqual(export(websites(25), path, chunk_size=10), 25)
+        batches = list(read_columnar(path))
+        self.assertEqual([len(batch['url']) for batch in batches], [10, 10, 5])
+        first = batches[0]
+        self.assertEqual(first['host'][:4], ['site0.com', 'site1.com', 'site2.com', 'site0.com'])
+        self.assertEqual(first['visit_count'][:3], [0, 1, 2])
+        self.assertEqual(first['profile'][0], None)
+        self.assertIsInstance(first['last_visit'][1], datetime)
+        self.assertEqual(first['last_visit'][1], list(websites(2))[1].last_visit)
+
+    def test_export_late_values(self):
+        '''> Should type a column by its first value even if the first chunks have none.'''
+        rows = [{'url': f'https://site.com/{index}',
+                 'end_time': datetime(2024, 1, 1, index) if index > 3 else None}
+                for index in range(8)]
+        path = os.path.join(self.folder, 'downloads.pbc')
+        export(rows, path, chunk_size=3)
+        batches = list(read_columnar(path))
+        self.assertEqual(batches[0]['end_time'], [None] * 3)
+        self.assertEqual(batches[1]['end_time'], [None, datetime(2024, 1, 1, 4),
+                                                  datetime(2024, 1, 1, 5)])
+        self.assertEqual(batches[2]['end_time'][1], datetime(2024, 1, 1, 7))
+
+    @unittest.skipUnless(has_pyarrow(), 'pyarrow is not installed')
+    def test_export_arrow_late_values(self):
+        '''> Should keep the Arrow chunks until every column has a value to type it.'''
+        import pyarrow
+        rows = [{'url': f'https://site.com/{index}', 'profile': None,
+                 'end_time': datetime(2024, 1, 1, index) if index > 3 else None}
+                for index in range(8)]
+        path = os.path.join(self.folder, 'downloads.arrow')
+        export(rows, path, chunk_size=3)
+        table = pyarrow.ipc.open_file(path).read_all()
+        self.assertEqual(table.num_rows, 8)
+        self.assertEqual(table.schema.field('end_time').type, pyarrow.timestamp('us'))
+        self.assertEqual(table.column('end_time')[7].as_py(), datetime(2024, 1, 1, 7))
+        self.assertEqual(table.column('profile').null_count, 8)
+
+    def test_read_invalid_file(self):
+        '''> Should raise a FileError for a file of another format.'''
+        path = os.path.join(self.folder, 'history.ndjson')
+        export(websites(1), path)
+        with self.assertRaises(FileError):
+            list(read_columnar(path))
+
+    def test_arrow_compression(self):
+        '''> Should reject the compressions Arrow IPC files do not support before writing.'''
+        path = os.path.join(self.folder, 'history.arrow')
+        with self.assertRaisesRegex(FileError, 'lz4, zstd'):
+            export(websites(1), path, compression='gzip')
+        with self.assertRaisesRegex(FileError, 'lz4, zstd'):
+            export(websites(1), path + '.gz')
+        self.assertFalse(os.path.exists(path))
+
+    def test_columnar_format(self):
+        '''> Should pick parquet only when pyarrow is available.'''
+        self.assertEqual(columnar_format(), 'parquet' if has_pyarrow() else 'pbc')
+
+    @unittest.skipUnless(has_pyarrow(), 'pyarrow is not installed')
+    def test_export_parquet(self):
+        '''> Should write a Parquet file with dictionary encoded hosts.'''
+        import pyarrow.parquet
+        path = os.path.join(self.folder, 'history.parquet')
+        export(websites(25), path, chunk_size=10)
+        table = pyarrow.parquet.read_table(path)
+        self.assertEqual(table.num_rows, 25)
+        self.assertEqual(table.column('host')[0].as_py(), 'site0.com')
+
+if __name__ == '__main__':
+    unittest.main()
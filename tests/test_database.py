@@ -0,0 +1,52 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+from pybrinf.database import Database
+from pybrinf.exceptions import DatabaseError
+
+'''All tests for Database module.'''
+
+class TestDatabase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'History')
+        self.copies = os.path.join(self.directory.name, 'copies')
+        os.mkdir(self.copies)
+        conn = sqlite3.connect(self.path)
+        conn.execute('CREATE TABLE urls (id)')
+        conn.commit()
+        conn.close()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_remove_copy(self):
+        '''> Should remove the temporary copy when the database is closed.'''
+        database = Database(self.path, bypass=True, to=self.copies)
+        self.assertEqual(len(os.listdir(self.copies)), 1)
+        database.connect()
+        self.assertEqual(database.execute('SELECT id FROM urls'), [])
+        database.close()
+        self.assertEqual(os.listdir(self.copies), [])
+        self.assertTrue(os.path.isfile(self.path))
+
+    def test_remove_copy_on_error(self):
+        '''> Should remove the temporary copy when the connection fails.'''
+        database = Database(self.path, bypass=True, to=self.copies)
+        with mock.patch('sqlite3.connect', side_effect=sqlite3.OperationalError('locked')):
+            with self.assertRaises(DatabaseError):
+                database.connect()
+        self.assertEqual(os.listdir(self.copies), [])
+
+    def test_keep_original(self):
+        '''> Should not remove the database when it is read without a copy.'''
+        database = Database(self.path)
+        database.connect()
+        database.close()
+        self.assertTrue(os.path.isfile(self.path))
+
+if __name__ == '__main__':
+    unittest.main()
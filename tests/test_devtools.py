@@ -0,0 +1,223 @@
+import os
+import json
+import time
+import base64
+import struct
+import hashlib
+import threading
+import unittest
+from unittest import mock
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pybrinf.__main__ import Brinf
+from pybrinf.browser import Browser
+from pybrinf.browsers import Registry
+from pybrinf.devtools import DevTools, WEBSOCKET_GUID
+from pybrinf.exceptions import BrowserError
+from pybrinf.utilities import Utilities
+
+'''All tests for DevTools module, using a local stand-in of the DevTools endpoint.'''
+
+TARGETS = [
+    {'id': 'A', 'type': 'page', 'title': 'One', 'url': 'http://one.com',
+     'faviconUrl': 'http://one.com/favicon.ico', 'devtoolsFrontendUrl': '/devtools/A'},
+    {'id': 'B', 'type': 'service_worker', 'title': 'Worker', 'url': 'http://one.com/sw.js'},
+]
+
+def frame(message: dict) -> bytes:
+    '''Encode an unmasked server text frame.'''
+    payload = json.dumps(message).encode()
+    if len(payload) < 126:
+        return struct.pack('!BB', 0x81, len(payload)) + payload
+    return struct.pack('!BBH', 0x81, 126, len(payload)) + payload
+
+class Handler(BaseHTTPRequestHandler):
+    '''Stand-in of the browser DevTools HTTP and WebSocket endpoints.'''
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if self.path == '/devtools/browser/test':
+            return self.websocket()
+        port = self.server.server_address[1]
+        routes = {
+            '/json/list': TARGETS,
+            '/json/version': {'Browser': 'Test/1.0',
+                              'webSocketDebuggerUrl': f'ws://127.0.0.1:{port}/devtools/browser/test'},
+        }
+        body = json.dumps(routes.get(self.path, {})).encode()
+        self.send_response(200 if self.path in routes else 404)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        return None
+
+    def websocket(self):
+        key = self.headers['Sec-WebSocket-Key']
+        accept = base64.b64encode(hashlib.sha1((key + WEBSOCKET_GUID).encode()).digest())
+        self.send_response(101)
+        self.send_header('Upgrade', 'websocket')
+        self.send_header('Connection', 'Upgrade')
+        self.send_header('Sec-WebSocket-Accept', accept.decode())
+        self.end_headers()
+        self.wfile.flush()
+        first, second = self.rfile.read(2)
+        mask = self.rfile.read(4)
+        payload = bytes(byte ^ mask[i % 4] for i, byte in enumerate(self.rfile.read(second & 0x7F)))
+        request = json.loads(payload)
+        self.wfile.write(frame({'id': request['id'], 'result': {}}))
+        self.wfile.write(frame({'method': 'Target.targetCreated', 'params': {'targetInfo': {
+            'targetId': 'C', 'type': 'page', 'title': 'Two', 'url': 'http://two.com'}}}))
+        self.wfile.write(frame({'method': 'Target.targetDestroyed', 'params': {'targetId': 'A'}}))
+        self.wfile.flush()
+        self.rfile.read(2)
+        self.close_connection = True
+
+class TestDevTools(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.connections = 0
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.client = DevTools('127.0.0.1', self.server.server_address[1])
+
+    def tearDown(self):
+        self.client.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_get_targets(self):
+        '''> Should reuse a single keep-alive connection for every request.'''
+        for _ in range(3):
+            targets = self.client.targets()
+        self.assertEqual([target['id'] for target in targets], ['A', 'B'])
+        self.assertEqual(self.client.version()['Browser'], 'Test/1.0')
+        self.assertEqual(self.server.connections, 1)
+
+    def test_watch_targets(self):
+        '''> Should keep the live table updated from the pushed target events.'''
+        events = []
+        self.client.subscribe(lambda event, target: events.append((event, target['id'])))
+        self.client.watch()
+        deadline = time.monotonic() + 5
+        while len(events) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(events, [('Target.targetCreated', 'C'), ('Target.targetDestroyed', 'A')])
+        self.assertEqual(sorted(target['id'] for target in self.client.targets()), ['B', 'C'])
+        port = self.server.server_address[1]
+        created = next(target for target in self.client.targets() if target['id'] == 'C')
+        self.assertEqual(created['webSocketDebuggerUrl'],
+                         f'ws://127.0.0.1:{port}/devtools/page/C')
+
+    def test_failing_listener(self):
+        '''> Should keep watching and calling the other listeners when a listener raises.'''
+        events = []
+
+        def failing(event, target):
+            raise RuntimeError(event)
+        self.client.subscribe(failing)
+        self.client.subscribe(lambda event, target: events.append(target['id']))
+        with self.assertLogs('pybrinf.devtools', 'ERROR'):
+            self.client.watch()
+            deadline = time.monotonic() + 5
+            while len(events) < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        self.assertEqual(events, ['C', 'A'])
+        self.assertTrue(self.client.watching)
+        self.assertEqual(sorted(target['id'] for target in self.client.targets()), ['B', 'C'])
+
+class TestDevToolsBrowsers(unittest.TestCase):
+
+    def setUp(self):
+        self.servers = []
+        self.browsers = []
+        for name in ('One', 'Two'):
+            server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+            server.connections = 0
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            self.servers.append(server)
+            browser = Browser('linux', name=name, fullname=name, chromium=True,
+                              app_path={'linux': 'HOME' + os.path.abspath(__file__)},
+                              local_path={'linux': 'HOME/.config/test'},
+                              process={'linux': 'test'}, port=server.server_address[1])
+            browser.dev_tools = True
+            self.browsers.append(browser)
+
+    def tearDown(self):
+        for browser in self.browsers:
+            browser.devtools().close()
+        for server in self.servers:
+            server.shutdown()
+            server.server_close()
+
+    def test_get_tabs_from_port(self):
+        '''> Should read the tabs from the configured port.'''
+        tabs = self.browsers[0].tabs()
+        self.assertEqual([tab.id for tab in tabs], ['A'])
+        self.assertEqual(self.browsers[0].devtools().port, self.servers[0].server_address[1])
+
+    def test_tabs_timeout(self):
+        '''> Should use the timeout of a call only for that call.'''
+        client = self.browsers[0].devtools()
+        self.assertEqual([tab.id for tab in self.browsers[0].tabs(timeout=1)], ['A'])
+        self.assertEqual(client.timeout, 5.0)
+        self.assertIs(self.browsers[0].devtools(), client)
+
+    def test_select_tab_fields(self):
+        '''> Should keep only the selected tab fields.'''
+        tab = self.browsers[0].tabs()[0]
+        self.assertFalse(hasattr(tab, '__dict__'))
+        self.assertEqual((tab.title, tab.favicon_url), ('One', None))
+        tab = self.browsers[0].tabs(fields=('id', 'favicon_url'))[0]
+        self.assertEqual((tab.title, tab.favicon_url), (None, 'http://one.com/favicon.ico'))
+        with self.assertRaises(BrowserError):
+            self.browsers[0].tabs(fields=('faviconUrl',))
+
+    def test_tab_aliases(self):
+        '''> Should read the fields by their DevTools JSON names too.'''
+        tab = self.browsers[0].tabs(fields=('id', 'favicon_url', 'websocket_url'))[0]
+        self.assertEqual(tab.faviconUrl, 'http://one.com/favicon.ico')
+        self.assertEqual(tab.webSocketDebuggerUrl, tab.websocket_url)
+        self.assertIsNone(tab.devtoolsFrontendUrl)
+        with self.assertRaises(AttributeError):
+            tab.webSocketDebuggerUrl = 'ws://other'
+        with self.assertRaises(AttributeError):
+            tab.unknown
+
+    def test_get_all_tabs(self):
+        '''> Should merge the tabs of every dev tools browser.'''
+        brinf = Brinf()
+        brinf._Brinf__initialize = True
+        with mock.patch.object(Brinf, 'installed_browsers', return_value=self.browsers):
+            tabs = brinf.all_tabs(timeout=5)
+        self.assertEqual(sorted(tab.browser for tab in tabs), ['One', 'Two'])
+
+    def test_get_all_tabs_of_configured_browser(self):
+        '''> Should use the dev tools settings of the browser returned by Brinf.browser.'''
+        definitions = [{'name': name, 'fullname': name, 'chromium': True,
+                        'app_path': {'linux': 'HOME' + os.path.abspath(__file__)},
+                        'local_path': {'linux': 'HOME/.config/test'},
+                        'process': {'linux': 'test'}, 'os_support': ['linux']}
+                       for name in ('One', 'Two')]
+        for name, value in (('BROWSERS', definitions), ('REGISTRY', Registry(definitions))):
+            patcher = mock.patch.object(Utilities, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        brinf = Brinf()
+        brinf._Brinf__initialize = True
+        browser = brinf.browser('one')
+        browser.dev_tools = True
+        browser.port = self.servers[0].server_address[1]
+        self.addCleanup(lambda: browser.devtools().close())
+        self.assertIs(brinf.browser('One'), browser)
+        tabs = brinf.all_tabs(timeout=5)
+        self.assertEqual([(tab.browser, tab.id) for tab in tabs], [('One', 'A')])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import os
+import unittest
+from unittest import mock
+from pybrinf.discovery import Discovery
+from pybrinf.utilities import Utilities
+
+'''All tests for Discovery module.'''
+
+BROWSER = {
+    'name': 'Test',
+    'fullname': 'Test Browser',
+    'process': {'linux': 'test', 'win32': 'test.exe'},
+    'progid': 'TestHTML',
+    'chromium': True,
+    'app_path': {'linux': 'HOME' + os.path.abspath(__file__), 'win32': 'HOME/test.exe'},
+    'local_path': {'linux': 'HOME/.config/test/Default', 'win32': 'HOME/test'},
+    'os_support': ['linux']
+}
+
+MISSING = dict(BROWSER, name='Missing', app_path={'linux': 'HOME/missing/browser'})
+
+class TestDiscovery(unittest.TestCase):
+
+    def setUp(self):
+        patcher = mock.patch.object(Utilities, 'BROWSERS', [BROWSER, MISSING])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.discovery = Discovery('linux', ttl=None)
+
+    def test_get_installations(self):
+        '''> Should return only the installed browsers with their resolved data.'''
+        installations = self.discovery.installations()
+        self.assertEqual([item.browser.name for item in installations], ['Test'])
+        self.assertEqual(installations[0].app_path, os.path.abspath(__file__))
+
+    def test_installations_are_cached(self):
+        '''> Should not probe the system again until refresh is called.'''
+        browser = self.discovery.browsers()[0]
+        with mock.patch('os.path.exists') as exists:
+            self.assertIs(self.discovery.browsers()[0], browser)
+            self.assertIs(self.discovery.find('test'), browser)
+            self.assertTrue(browser.installed)
+            exists.assert_not_called()
+        self.discovery.refresh()
+        self.assertIsNot(self.discovery.browsers()[0], browser)
+
+    def test_installations_expire(self):
+        '''> Should probe the system again when the time to live expires.'''
+        discovery = Discovery('linux', ttl=0)
+        browser = discovery.browsers()[0]
+        self.assertIsNone(discovery.find('test'))
+        self.assertIsNot(discovery.browsers()[0], browser)
+
+if __name__ == '__main__':
+    unittest.main()
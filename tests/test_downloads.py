@@ -0,0 +1,71 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime
+from pybrinf.browser import Browser
+from pybrinf.testing import make_home
+from pybrinf.utilities import Utilities
+
+'''All tests for the downloads of chromium based browsers and Firefox.'''
+
+class TestDownloads(unittest.TestCase):
+
+    def setUp(self):
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        self.root = folder.name
+        self.profiles = make_home(self.root, rows=50, downloads=10)
+        self.chrome = Browser('linux', root=self.root, **Utilities.get_browser_data('chrome'))
+        self.firefox = Browser('linux', root=self.root, **Utilities.get_browser_data('firefox'))
+
+    def test_chromium(self):
+        '''> Should get one download for each redirect chain, with its state and danger type.'''
+        downloads = self.chrome.downloads()
+        self.assertEqual(len(downloads), 10)
+        download = downloads[-1]
+        self.assertEqual(download.chain, ['https://site0.example.com/page/0',
+                                          'https://site0.example.com/page/0.zip'])
+        self.assertEqual(download.url, 'https://site0.example.com/page/0.zip')
+        self.assertEqual((download.state, download.danger, download.mime),
+                         ('complete', 'not_dangerous', 'application/zip'))
+        self.assertEqual(download.end_time, datetime(2023, 1, 9, 8, 0, 5))
+        self.assertEqual(downloads[-5].state, 'interrupted')
+        self.assertEqual(downloads[-5].danger, 'dangerous_content')
+        self.assertEqual(len(self.chrome.downloads(since=datetime(2023, 1, 9, 8, 0, 5))), 5)
+
+    def test_chromium_chain_order(self):
+        '''> Should join the redirect chain in chain_index order whatever the row order.'''
+        conn = sqlite3.connect(os.path.join(self.profiles['chrome'][0], 'History'))
+        conn.execute('DELETE FROM downloads_url_chains WHERE id = 1')
+        conn.executemany('INSERT INTO downloads_url_chains VALUES (1, ?, ?)',
+                         [(2, 'https://c.com'), (0, 'https://a.com'), (1, 'https://b.com')])
+        conn.commit()
+        conn.close()
+        download = self.chrome.downloads()[-1]
+        self.assertEqual(download.chain, ['https://a.com', 'https://b.com', 'https://c.com'])
+        self.assertEqual(download.url, 'https://c.com')
+
+    def test_firefox(self):
+        '''> Should decode the metadata of the Firefox downloads, invalid or missing metadata included.'''
+        downloads = self.firefox.downloads()
+        self.assertEqual(len(downloads), 10)
+        download = downloads[-2]
+        self.assertEqual((download.bytes, download.state, download.danger, download.mime),
+                         (1024, 'complete', 'not_dangerous', 'application/zip'))
+        self.assertEqual(download.end_time, datetime(2023, 1, 1, 0, 0, 6))
+        self.assertEqual(download.chain, ['https://site1.example.com/page/1'])
+        self.assertEqual((downloads[-5].state, downloads[-5].danger), ('blocked', 'dangerous_content'))
+        conn = sqlite3.connect(os.path.join(self.profiles['firefox'][0], 'places.sqlite'))
+        with conn:
+            conn.execute("UPDATE moz_annos SET content = 'invalid' WHERE id = 12")
+            conn.execute('DELETE FROM moz_annos WHERE id = 13')
+        conn.close()
+        downloads = self.firefox.downloads()
+        self.assertEqual(len(downloads), 10)
+        self.assertEqual([(download.bytes, download.state) for download in downloads[-3:-1]],
+                         [(0, 'unknown'), (0, 'unknown')])
+        self.assertEqual(downloads[-2].end_time, datetime(2023, 1, 1, 0, 0, 6))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import csv
+import gzip
+import json
+import sqlite3
+import tempfile
+import unittest
+from pybrinf.file import Exporter, export
+from pybrinf.item import History, Tab
+from pybrinf.exceptions import FileError
+
+'''All tests for File module.'''
+
+def websites(count: int):
+    '''Generate history items without keeping them in memory.'''
+    for index in range(count):
+        yield History('Google Chrome', f'https://site{index}.com', f'Site {index}', index, 13300000000000000)
+
+class TestExport(unittest.TestCase):
+
+    def setUp(self):
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        self.folder = folder.name
+
+    def test_export_ndjson_gzip(self):
+        '''> Should stream the items as compressed JSON lines.'''
+        path = os.path.join(self.folder, 'history.ndjson.gz')
+        self.assertEqual(export(websites(2500), path, chunk_size=1000), 2500)
+        with gzip.open(path, 'rt', encoding='utf-8') as file:
+            rows = [json.loads(line) for line in file]
+        self.assertEqual(len(rows), 2500)
+        self.assertEqual(rows[1]['url'], 'https://site1.com')
+        self.assertTrue(rows[0]['last_visit'].startswith('2022-'))
+
+    def test_export_csv(self):
+        '''> Should write a CSV file with a header.'''
+        path = os.path.join(self.folder, 'tabs.csv')
+        with Exporter(path) as exporter:
+            exporter.write([Tab('Google Chrome', id='A', url='https://one.com')])
+            exporter.write([{'browser': 'Google Chrome', 'id': 'B', 'extra': 1}])
+        with open(path, 'r', encoding='utf-8', newline='') as file:
+            rows = list(csv.DictReader(file))
+        self.assertEqual([row['id'] for row in rows], ['A', 'B'])
+        self.assertEqual(rows[1]['url'], '')
+
+    def test_export_sqlite(self):
+        '''> Should write the items into a SQLite table.'''
+        path = os.path.join(self.folder, 'history.sqlite')
+        export(websites(10), path, table='history')
+        conn = sqlite3.connect(path)
+        rows = conn.execute('SELECT url, visit_count FROM history ORDER BY visit_count').fetchall()
+        conn.close()
+        self.assertEqual(len(rows), 10)
+        self.assertEqual(rows[2], ('https://site2.com', 2))
+
+    def test_export_existing_file(self):
+        '''> Should not replace an existing file unless asked to.'''
+        path = os.path.join(self.folder, 'history.ndjson')
+        export(websites(1), path)
+        with self.assertRaises(FileError):
+            export(websites(1), path)
+        self.assertEqual(export(websites(3), path, overwrite=True), 3)
+
+    def test_export_unknown_format(self):
+        '''> Should raise a FileError for an unknown format.'''
+        with self.assertRaises(FileError):
+            export(websites(1), os.path.join(self.folder, 'history.txt'))
+
+if __name__ == '__main__':
+    unittest.main()
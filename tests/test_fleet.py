@@ -0,0 +1,113 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+from concurrent.futures import ProcessPoolExecutor
+from pybrinf.fleet import Fleet, scan_root, detect_system, extract_profile
+from pybrinf.exceptions import BrinfError, BrowserError
+from pybrinf.session import CACHE
+from pybrinf.testing import make_home
+from pybrinf.utilities import Utilities
+
+'''All tests for Fleet module.'''
+
+def chrome_profile(root: str, directory: str, urls: list) -> None:
+    '''Create a chrome profile with a minimal History database.'''
+    path = os.path.join(root, '.config', 'google-chrome', directory)
+    os.makedirs(path)
+    conn = sqlite3.connect(os.path.join(path, 'History'))
+    conn.execute('CREATE TABLE urls (url, title, visit_count, last_visit_time)')
+    conn.execute('CREATE TABLE downloads (id, total_bytes, current_path, start_time, end_time, tab_url)')
+    conn.execute('CREATE TABLE downloads_url_chains (id, url)')
+    conn.executemany('INSERT INTO urls VALUES (?, ?, 1, 13300000000000000)',
+                     [(url, url) for url in urls])
+    conn.commit()
+    conn.close()
+
+class TestFleet(unittest.TestCase):
+
+    def setUp(self):
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        self.first = os.path.join(folder.name, 'first')
+        self.second = os.path.join(folder.name, 'second')
+        self.empty = os.path.join(folder.name, 'empty')
+        chrome_profile(self.first, 'Default', ['https://one.com', 'https://two.com'])
+        chrome_profile(self.first, 'Profile 1', ['https://three.com'])
+        chrome_profile(self.second, 'Default', ['https://four.com'])
+        os.makedirs(self.empty)
+
+    def test_scan_root(self):
+        '''> Should find every browser profile of a root.'''
+        self.assertEqual(detect_system(self.first), 'linux')
+        found = scan_root(self.first, 'linux')
+        self.assertEqual(sorted(os.path.basename(path) for _, path in found),
+                         ['Default', 'Profile 1'])
+        self.assertEqual(scan_root(self.empty, 'linux'), [])
+
+    def test_extract(self):
+        '''> Should stream the data of every profile with the progress of its root.'''
+        fleet = Fleet([self.first, self.second, self.empty], os_='linux', workers=2)
+        results = list(fleet.extract(kinds=('history',)))
+        urls = {}
+        for result in results:
+            self.assertEqual(result.errors, {})
+            for item in result.items.get('history', []):
+                urls[item.url] = (result.root, item.profile)
+        self.assertEqual(urls['https://three.com'], (self.first, 'Profile 1'))
+        self.assertEqual(urls['https://four.com'], (self.second, 'Default'))
+        self.assertEqual(len(urls), 4)
+        first = [result for result in results if result.root == self.first]
+        self.assertEqual(sorted(result.done for result in first), [1, 2])
+        self.assertTrue(all(result.finished for result in results if result.root == self.empty))
+
+    def test_sessions_do_not_change_the_cache(self):
+        '''> Should set the profile of the session tabs without changing the cached ones.'''
+        root = os.path.join(os.path.dirname(self.first), 'home')
+        path = make_home(root, browsers=('chrome',), rows=10, tabs=5)['chrome'][0]
+        data = Utilities.get_browser_data('chrome')
+        items, errors = extract_profile(root, 'linux', (data, path), kinds=('sessions',), options={})
+        self.assertEqual(errors, {})
+        self.assertEqual({tab.profile for tab in items['sessions']}, {'Default'})
+        items, _ = extract_profile(root, 'linux', (data, path), kinds=('sessions',), options={})
+        self.assertEqual(len(items['sessions']), 5)
+        file = max(os.listdir(os.path.join(path, 'Sessions')))
+        key = CACHE.key(os.path.join(path, 'Sessions', file), data['fullname'])
+        _, tabs = CACHE.lookup(key)
+        self.assertEqual({tab.profile for tab in tabs}, {None})
+
+    def test_firefox_sessions(self):
+        '''> Should extract the sessionstore tabs of the Firefox profiles.'''
+        root = os.path.join(os.path.dirname(self.first), 'home')
+        path = make_home(root, browsers=('firefox',), rows=10, tabs=5)['firefox'][0]
+        data = Utilities.get_browser_data('firefox')
+        items, errors = extract_profile(root, 'linux', (data, path), kinds=('sessions',), options={})
+        self.assertEqual(errors, {})
+        self.assertEqual(len(items['sessions']), 5)
+        self.assertEqual({tab.profile for tab in items['sessions']}, {os.path.basename(path)})
+
+    def test_extract_missing_profile(self):
+        '''> Should not read the default profile for a profile that is not found.'''
+        data = Utilities.get_browser_data('chrome')
+        missing = os.path.join(self.first, '.config', 'google-chrome', 'Profile 9')
+        with self.assertRaises(BrowserError):
+            extract_profile(self.first, 'linux', (data, missing), kinds=('history',), options={})
+
+    def test_extract_stopped(self):
+        '''> Should cancel the queued profiles when the consumer stops early.'''
+        fleet = Fleet([self.first, self.second], os_='linux', workers=1)
+        with mock.patch.object(ProcessPoolExecutor, 'shutdown', autospec=True,
+                               side_effect=ProcessPoolExecutor.shutdown) as shutdown:
+            results = fleet.extract(kinds=('history',))
+            next(results)
+            results.close()
+        shutdown.assert_called_once_with(mock.ANY, cancel_futures=True)
+
+    def test_extract_unknown_kind(self):
+        '''> Should raise a BrinfError for an unsupported data kind.'''
+        with self.assertRaises(BrinfError):
+            next(Fleet([self.first]).extract(kinds=('cookies',)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,9 @@
+import os
+import sys
+import tempfile
 import unittest
+import subprocess
+from unittest import mock
 from datetime import datetime
 from pybrinf.__main__ import Brinf
 from pybrinf.browser import Browser
@@ -78,7 +83,28 @@ class TestBrinf(unittest.TestCase):
         self.assertIsInstance(downloads, list)
         self.assertIsInstance(downloads[0], Downloaded)
     
-    
+
+class TestStartup(unittest.TestCase):
+
+    def test_lazy_import(self):
+        '''> Should not import the browser modules until they are used.'''
+        code = ('import sys, pybrinf; loaded = "pybrinf.browser" in sys.modules; '
+                'pybrinf.Brinf; print(loaded, "pybrinf.browser" in sys.modules)')
+        output = subprocess.check_output([sys.executable, '-c', code]).decode().strip()
+        self.assertEqual(output, 'False True')
+
+    @unittest.skipUnless(sys.platform == 'linux', 'mimeapps.list is only used on Linux')
+    def test_default_browser_from_mimeapps(self):
+        '''> Should read the default browser from mimeapps.list without xdg-settings.'''
+        with tempfile.TemporaryDirectory() as config:
+            with open(os.path.join(config, 'mimeapps.list'), 'w', encoding='utf-8') as file:
+                file.write('[Default Applications]\nx-scheme-handler/http=firefox.desktop;\n')
+            with mock.patch.dict(os.environ, {'XDG_CONFIG_HOME': config}), \
+                    mock.patch('subprocess.Popen') as popen:
+                brinf = Brinf()
+                brinf.init()
+                self.assertEqual(brinf.default_browser.name, 'Firefox')
+                popen.assert_not_called()
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
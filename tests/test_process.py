@@ -0,0 +1,89 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from pybrinf import process
+from pybrinf.__main__ import Brinf
+from pybrinf.browser import Browser
+from pybrinf.process import ProcessTable, install_folders, process_names
+from pybrinf.utilities import Utilities
+
+'''All tests for Process module.'''
+
+class TestProcess(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        for pid, comm, cmdline in [('10', 'chrome', b'/opt/google/chrome/chrome\0--type=gpu\0'),
+                                   ('11', 'firefox', b'/usr/lib/firefox/firefox\0'),
+                                   ('12', 'bash', b'bash\0'),
+                                   ('13', 'chrome', b'/home/dev/chromium/out/chrome\0')]:
+            os.mkdir(os.path.join(self.directory.name, pid))
+            with open(os.path.join(self.directory.name, pid, 'comm'), 'w') as file:
+                file.write(comm + '\n')
+            with open(os.path.join(self.directory.name, pid, 'cmdline'), 'wb') as file:
+                file.write(cmdline)
+        os.mkdir(os.path.join(self.directory.name, 'self'))
+        patcher = mock.patch.object(process, 'PROC_PATH', self.directory.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_snapshot(self):
+        '''> Should read every process of /proc once.'''
+        table = ProcessTable.snapshot('linux')
+        self.assertIn('chrome', table)
+        self.assertNotIn('self', table)
+        self.assertEqual(table.pids(['firefox']), [11])
+
+    def test_get_browser_pids(self):
+        '''> Should match the browser by any of its process names.'''
+        table = ProcessTable.snapshot('linux')
+        names = process_names('linux', 'Chrome', 'google-chrome', '/usr/bin/google-chrome-stable')
+        self.assertEqual(table.pids(names), [10, 13])
+        self.assertEqual(table.pids(['opera']), [])
+
+    def test_get_browser_pids_by_path(self):
+        '''> Should ignore the processes with the same name running from another folder.'''
+        table = ProcessTable.snapshot('linux')
+        folder = os.path.join(self.directory.name, 'opt', 'google', 'chrome')
+        os.makedirs(folder)
+        with open(os.path.join(folder, 'google-chrome'), 'w') as file:
+            file.write('#!/bin/sh\n')
+        launcher = os.path.join(self.directory.name, 'launcher')
+        os.symlink(os.path.join(folder, 'google-chrome'), launcher)
+        folders = install_folders('linux', launcher)
+        self.assertEqual(folders, [os.path.realpath(folder)])
+        self.assertEqual(table.pids(['chrome'], ['/opt/google/chrome']), [10])
+        self.assertEqual(install_folders('linux', '/not/installed'), [])
+        self.assertEqual(install_folders('win32', __file__), [])
+
+    def test_get_browser_pids_by_script(self):
+        '''> Should keep the name matches if a launcher script runs a binary of another folder.'''
+        table = ProcessTable({'firefox': [11]}, {11: '/usr/lib/firefox/firefox'})
+        folder = os.path.join(self.directory.name, 'usr', 'bin')
+        os.makedirs(folder)
+        script = os.path.join(folder, 'firefox')
+        with open(script, 'w') as file:
+            file.write('#!/bin/sh\nexec /usr/lib/firefox/firefox "$@"\n')
+        folders = install_folders('linux', script)
+        self.assertEqual(folders, [os.path.realpath(folder)])
+        self.assertEqual(table.pids(['firefox'], folders), [11])
+        browser = Browser('linux', **Utilities.get_browser_data('firefox'))
+        browser.set_app_path(script)
+        self.assertEqual(browser.pids(table), [11])
+
+    def test_running_browsers(self):
+        '''> Should find the running browsers from the process index of the registry.'''
+        table = ProcessTable({'chrome': [10, 13], 'firefox': [11], 'bash': [12]},
+                             {10: '/opt/google/chrome/chrome', 11: '/usr/lib/firefox/firefox'})
+        brinf = Brinf()
+        brinf._Brinf__initialize = True
+        with mock.patch.object(ProcessTable, 'snapshot', return_value=table):
+            running = brinf.running_browsers()
+        self.assertEqual(running, {'Chrome': [10, 13], 'Firefox': [11]})
+
+if __name__ == '__main__':
+    unittest.main()
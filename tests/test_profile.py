@@ -0,0 +1,91 @@
+import os
+import json
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+from pybrinf.browser import Browser
+from pybrinf.profile import chromium_profiles, firefox_profiles
+
+'''All tests for Profile module.'''
+
+PROFILES_INI = '''[Install4F96D1932A9F858E]
+Default=Profiles/work.default-release
+Locked=1
+
+[Profile1]
+Name=default
+IsRelative=1
+Path=Profiles/abcd.default
+
+[Profile0]
+Name=work
+IsRelative=1
+Path=Profiles/work.default-release
+Default=1
+
+[General]
+StartWithLastProfile=1
+Version=2
+'''
+
+def create_history(path: str, url: str) -> None:
+    '''Create a minimal chromium History database.'''
+    os.makedirs(path, exist_ok=True)
+    conn = sqlite3.connect(os.path.join(path, 'History'))
+    conn.execute('CREATE TABLE urls (url, title, visit_count, last_visit_time)')
+    conn.execute('INSERT INTO urls VALUES (?, ?, 1, 13300000000000000)', (url, url))
+    conn.commit()
+    conn.close()
+
+class TestProfile(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = self.directory.name
+        create_history(os.path.join(self.root, 'Default'), 'http://default.com')
+        create_history(os.path.join(self.root, 'Profile 1'), 'http://work.com')
+        state = {'profile': {'last_used': 'Profile 1', 'info_cache': {
+            'Default': {'name': 'Person 1'}, 'Profile 1': {'name': 'Work'}}}}
+        with open(os.path.join(self.root, 'Local State'), 'w', encoding='utf-8') as file:
+            json.dump(state, file)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_get_chromium_profiles(self):
+        '''> Should return the profiles of Local State, the last used first.'''
+        profiles = chromium_profiles(self.root, 'Test')
+        self.assertEqual([profile.name for profile in profiles], ['Work', 'Person 1'])
+        self.assertTrue(profiles[0].default)
+
+    def test_get_chromium_profiles_without_state(self):
+        '''> Should detect the profile folders when Local State is missing.'''
+        os.remove(os.path.join(self.root, 'Local State'))
+        profiles = chromium_profiles(self.root, 'Test')
+        self.assertEqual([profile.directory for profile in profiles], ['Default', 'Profile 1'])
+
+    def test_get_firefox_profiles(self):
+        '''> Should return every profile of profiles.ini, the install default first.'''
+        with open(os.path.join(self.root, 'profiles.ini'), 'w', encoding='utf-8') as file:
+            file.write(PROFILES_INI)
+        profiles = firefox_profiles(self.root, 'Test')
+        self.assertEqual([profile.name for profile in profiles], ['work', 'default'])
+        self.assertEqual(profiles[0].path,
+                         os.path.join(self.root, 'Profiles', 'work.default-release'))
+
+    def test_extract_all_profiles(self):
+        '''> Should extract the history of every profile tagged by profile.'''
+        patcher = mock.patch.dict(os.environ, {'PYBRINF_TEST_ROOT': self.root})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        browser = Browser('linux', name='Test', fullname='Test', chromium=True,
+                          app_path={'linux': 'HOME' + os.path.abspath(__file__)},
+                          local_path={'linux': 'PYBRINF_TEST_ROOT/Default'},
+                          process={'linux': 'test'})
+        history = browser.extract('history')
+        tags = sorted((item.profile, item.url) for item in history)
+        self.assertEqual(tags, [('Default', 'http://default.com'), ('Profile 1', 'http://work.com')])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime
+from pybrinf.browser import Browser
+from pybrinf.exceptions import BrowserError
+from pybrinf.testing import make_home
+from pybrinf.utilities import Utilities
+
+'''All tests for the search terms aggregates.'''
+
+class TestSearchTerms(unittest.TestCase):
+
+    def setUp(self):
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        self.root = folder.name
+        self.profiles = make_home(self.root, rows=400)
+        self.chrome = Browser('linux', root=self.root, **Utilities.get_browser_data('chrome'))
+        self.firefox = Browser('linux', root=self.root, **Utilities.get_browser_data('firefox'))
+
+    def test_totals(self):
+        '''> Should count the searches of every term, most used and most recent first.'''
+        for browser in (self.chrome, self.firefox):
+            terms = browser.search_terms()
+            self.assertEqual(len(terms), 20)
+            self.assertEqual([term.term for term in terms[:2]], ['term 19', 'term 18'])
+            self.assertEqual(terms[0].count, 10)
+            self.assertIsNone(terms[0].period)
+            self.assertEqual(len(browser.search_terms(top=3)), 3)
+        terms = self.chrome.search_terms(since=datetime(2023, 1, 9, 8, 6))
+        self.assertEqual(sum(term.count for term in terms), 20)
+
+    def test_periods(self):
+        '''> Should get the top terms of every day and week.'''
+        # Spread the visits over three days.
+        conn = sqlite3.connect(os.path.join(self.profiles['chrome'][0], 'History'))
+        with conn:
+            conn.execute('UPDATE visits SET visit_time = visit_time + (id % 3) * 86400000000')
+        conn.close()
+        days = self.chrome.search_terms(period='day', top=2)
+        self.assertEqual([term.period for term in days],
+                         ['2023-01-11', '2023-01-11', '2023-01-10', '2023-01-10',
+                          '2023-01-09', '2023-01-09'])
+        weeks = self.chrome.search_terms(period='week', top=5)
+        self.assertEqual({term.period for term in weeks}, {'2023-01-09'})
+        self.assertEqual(len(weeks), 5)
+        with self.assertRaises(BrowserError):
+            self.chrome.search_terms(period='year')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,11 @@
+import os
+import struct
+import tempfile
 import unittest
+from unittest import mock
 from pybrinf.__main__ import Brinf
-from pybrinf.session import Session
-from pybrinf.commands import CommandTabNavigation
+from pybrinf.session import CACHE, Session, parse_file
+from pybrinf.commands import CommandTabNavigation, CommandType, RestoreCommandType
 
 '''All tests for Browser Session module.'''
 
@@ -29,5 +33,138 @@ class TestSession(unittest.TestCase):
         tab = self.session.current_tab()
         self.assertIsInstance(tab, CommandTabNavigation)
     
+
+def pickle_string(value: str, wide: bool = False) -> bytes:
+    '''Encode a pickle aligned string (or string16 if wide).'''
+    data = value.encode('utf-16-le' if wide else 'utf-8')
+    data = struct.pack('<I', len(value) if wide else len(data)) + data
+    return data + b'\x00' * (-len(data) % 4)
+
+def command(kind: CommandType, payload: bytes) -> bytes:
+    '''Encode a SNSS command.'''
+    return struct.pack('<HB', len(payload) + 1, kind.value) + payload
+
+def navigation(tab_id: int, index: int, url: str, title: str,
+               kind: CommandType = CommandType.UpdateTabNavigation) -> bytes:
+    '''Encode a UpdateTabNavigation command.'''
+    body = struct.pack('<ii', tab_id, index) + pickle_string(url) + pickle_string(title, True)
+    return command(kind, struct.pack('<I', len(body)) + body)
+
+class TestSessionModel(unittest.TestCase):
+    '''Tests for the window/tab model using a synthetic Session file.'''
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        sessions = os.path.join(self.directory.name, 'Sessions')
+        os.mkdir(sessions)
+        commands = [
+            command(CommandType.SetTabWindow, struct.pack('<ii', 1, 10)),
+            command(CommandType.SetTabWindow, struct.pack('<ii', 1, 11)),
+            command(CommandType.SetTabWindow, struct.pack('<ii', 2, 20)),
+            command(CommandType.SetTabIndexInWindow, struct.pack('<ii', 10, 1)),
+            command(CommandType.SetTabIndexInWindow, struct.pack('<ii', 11, 0)),
+            navigation(10, 0, 'http://a.com', 'one'),
+            navigation(10, 1, 'http://b.com', 'two'),
+            navigation(11, 0, 'http://c.com/año', 'Año nuevo ☃'),
+            navigation(20, 0, 'http://d.com', 'ten'),
+            command(CommandType.SetSelectedNavigationIndex, struct.pack('<ii', 10, 0)),
+            command(CommandType.SetPinnedState, struct.pack('<iB3x', 11, 1)),
+            command(CommandType.SetSelectedTabInIndex, struct.pack('<ii', 1, 1)),
+            command(CommandType.TabClosed, struct.pack('<i4xq', 20, 0)),
+            command(CommandType.SetActiveWindow, struct.pack('<i', 1)),
+        ]
+        with open(os.path.join(sessions, 'Session_13300000000000000'), 'wb') as file:
+            file.write(b'SNSS' + struct.pack('<I', 3) + b''.join(commands))
+        restore = [
+            command(RestoreCommandType.SelectedNavigationInTab, struct.pack('<iiq', 30, 0, 5)),
+            navigation(30, 0, 'http://e.com', 'old', RestoreCommandType.UpdateTabNavigation),
+            command(RestoreCommandType.SelectedNavigationInTab, struct.pack('<iiq', 31, 0, 6)),
+            navigation(31, 0, 'http://f.com', 'new', RestoreCommandType.UpdateTabNavigation),
+            command(RestoreCommandType.RestoredEntry, struct.pack('<i', 31)),
+        ]
+        with open(os.path.join(sessions, 'Tabs_13300000000000000'), 'wb') as file:
+            file.write(b'SNSS' + struct.pack('<I', 3) + b''.join(restore))
+        self.session = Session(self.directory.name, 'Test')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_get_windows(self):
+        '''> Should group the open tabs by window ordered by index.'''
+        windows = self.session.windows()
+        self.assertEqual([window.id for window in windows], [1, 2])
+        self.assertEqual([tab.id for tab in windows[0].tabs], [11, 10])
+        self.assertEqual(windows[1].tabs, [])
+
+    def test_get_tabs(self):
+        '''> Should return every tab with its selected navigation.'''
+        tabs = self.session.tabs()
+        self.assertEqual([tab.id for tab in tabs], [11, 10, 20])
+        self.assertEqual(tabs[1].url, 'http://a.com')
+        self.assertEqual(tabs[0].url, 'http://c.com/año')
+        self.assertEqual(tabs[0].title, 'Año nuevo ☃')
+        self.assertEqual(len(tabs[1].navigations), 2)
+        self.assertTrue(tabs[0].pinned)
+        self.assertTrue(tabs[2].closed)
+
+    def test_get_current_tab(self):
+        '''> Should return the selected tab of the active window.'''
+        tab = self.session.current_tab
+        self.assertEqual(tab.id, 10)
+        self.assertEqual(tab.title, 'one')
+        self.assertTrue(tab.active)
+
+    def test_session_cache(self):
+        '''> Should parse an unchanged Session file only once across instances.'''
+        with mock.patch('pybrinf.session.parse_file', wraps=parse_file) as parse:
+            tabs = self.session.tabs()
+            current = Session(self.directory.name, 'Test').current_tab
+            self.assertEqual(current, tabs[1])
+            self.assertEqual(parse.call_count, 1)
+            path = os.path.join(self.directory.name, 'Sessions', self.session.filename)
+            with open(path, 'ab') as file:
+                file.write(command(CommandType.SetActiveWindow, struct.pack('<i', 2)))
+            self.session.tabs()
+            self.assertEqual(parse.call_count, 2)
+
+    def test_session_copies(self):
+        '''> Should not change the cached session when the returned tabs are changed.'''
+        tabs = self.session.tabs()
+        tabs[1].selected_index = 1
+        tabs[1].navigations.clear()
+        tabs.sort(key=lambda tab: tab.id)
+        self.session.windows()[0].tabs.clear()
+        self.assertEqual([tab.id for tab in self.session.windows()[0].tabs], [11, 10])
+        self.assertEqual([tab.id for tab in self.session.tabs()], [11, 10, 20])
+        self.assertEqual(self.session.tabs()[1].selected_index, 0)
+        self.assertEqual(len(self.session.tabs()[1].navigations), 2)
+
+    def test_prune_selected_navigation(self):
+        '''> Should select the first remaining navigation if the selected one is pruned.'''
+        commands = [
+            command(CommandType.SetTabWindow, struct.pack('<ii', 1, 10)),
+            navigation(10, 0, 'http://a.com', 'one'),
+            navigation(10, 1, 'http://b.com', 'two'),
+            navigation(10, 2, 'http://c.com', 'three'),
+            command(CommandType.SetSelectedNavigationIndex, struct.pack('<ii', 10, 0)),
+            command(CommandType.TabNavigationPathPrunedFromFront, struct.pack('<ii', 10, 1)),
+        ]
+        with tempfile.TemporaryDirectory() as directory:
+            os.mkdir(os.path.join(directory, 'Sessions'))
+            path = os.path.join(directory, 'Sessions', 'Session_13300000000000001')
+            with open(path, 'wb') as file:
+                file.write(b'SNSS' + struct.pack('<I', 3) + b''.join(commands))
+            tab = Session(directory, 'Test').tabs()[0]
+        self.assertEqual(tab.selected_index, 0)
+        self.assertEqual(tab.url, 'http://b.com')
+        self.assertEqual([item.url for item in tab.navigations], ['http://b.com', 'http://c.com'])
+
+    def test_get_all_sessions(self):
+        '''> Should parse every Session and Tabs file and merge the closed tabs.'''
+        sessions, closed = self.session.all_sessions(workers=2)
+        self.assertEqual(sorted(sessions), ['Session_13300000000000000', 'Tabs_13300000000000000'])
+        self.assertEqual([tab.url for tab in sessions['Tabs_13300000000000000']], ['http://e.com'])
+        self.assertEqual([tab.id for tab in closed], [30, 20])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
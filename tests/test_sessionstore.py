@@ -0,0 +1,64 @@
+import os
+import json
+import tempfile
+import unittest
+from pybrinf.browser import Browser
+from pybrinf.exceptions import ParserError
+from pybrinf.mozlz4 import decompress, decompress_block
+from pybrinf.session import CACHE
+from pybrinf.testing import make_home, firefox_session, lz4_block
+from pybrinf.utilities import Utilities
+
+'''All tests for the Firefox sessionstore files.'''
+
+class TestSessionstore(unittest.TestCase):
+
+    def setUp(self):
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        self.root = folder.name
+        self.profile = make_home(self.root, browsers=('firefox',), rows=10, tabs=6)['firefox'][0]
+        self.firefox = Browser('linux', root=self.root, **Utilities.get_browser_data('firefox'))
+        CACHE.clear()
+
+    def test_lz4_block(self):
+        '''> Should decode literals, matches and overlapping matches into the exact size.'''
+        data = b'abc' * 50 + b'x' * 300 + json.dumps({'url': 'https://example.com/' * 40}).encode()
+        block = lz4_block(data)
+        self.assertLess(len(block), len(data))
+        self.assertEqual(bytes(decompress_block(block, len(data))), data)
+        with self.assertRaises(ParserError):
+            decompress_block(block, len(data) + 1)
+        with self.assertRaises(ParserError):
+            decompress(b'notmozlz4')
+
+    def test_session(self):
+        '''> Should build the same tab model as chromium sessions.'''
+        session = self.firefox.session()
+        self.assertEqual(session.filename, 'sessionstore-backups/recovery.jsonlz4')
+        tabs = session.tabs()
+        self.assertEqual(len(tabs), 6)
+        self.assertEqual(len(tabs[0].navigations), 3)
+        self.assertEqual(tabs[0].url, tabs[0].navigations[2].url)
+        self.assertTrue(tabs[0].pinned)
+        self.assertEqual(session.current_tab, tabs[0])
+        self.assertEqual(tabs[0].profile, None)
+
+    def test_closed_and_newest(self):
+        '''> Should read the closed tabs and use the newest session file.'''
+        path = os.path.join(self.profile, 'sessionstore.jsonlz4')
+        firefox_session(path, 4, windows=2, closed=2)
+        recovery = os.path.join(self.profile, 'sessionstore-backups', 'recovery.jsonlz4')
+        os.utime(recovery, (1, 1))
+        session = self.firefox.session()
+        self.assertEqual(session.filename, 'sessionstore.jsonlz4')
+        self.assertEqual(len(session.windows()), 2)
+        tabs = session.tabs()
+        self.assertEqual(len([tab for tab in tabs if tab.closed]), 2)
+        self.assertIsNotNone(tabs[-1].close_time)
+        files, closed = session.all_sessions(workers=1)
+        self.assertEqual(list(files), ['sessionstore.jsonlz4', 'sessionstore-backups/recovery.jsonlz4'])
+        self.assertEqual(len(closed), 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+from pybrinf.__main__ import Brinf
+from pybrinf.database import Database
+from pybrinf.session import CACHE
+from pybrinf.stats import Stats, NULL_STAGE, stage, current
+from pybrinf.testing import make_home
+
+'''All tests for the instrumentation hooks.'''
+
+class TestStats(unittest.TestCase):
+
+    def setUp(self):
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        self.root = folder.name
+        self.profiles = make_home(self.root, profiles=2, rows=30, downloads=4, tabs=10)
+
+    def test_disabled(self):
+        '''> Should not record anything outside of a Stats block.'''
+        self.assertIsNone(current())
+        self.assertIs(stage('Google Chrome', 'copy'), NULL_STAGE)
+
+    def test_history_stages(self):
+        '''> Should record the copy, query, build and merge stages by browser.'''
+        brinf = Brinf(root=self.root)
+        brinf.init()
+        with Stats() as stats:
+            history = brinf.history()
+        self.assertIsNone(current())
+        stages = stats.stages
+        for browser in ('Google Chrome', 'Mozilla Firefox'):
+            self.assertEqual(stages[(browser, 'copy')]['calls'], 1)
+            self.assertGreater(stages[(browser, 'copy')]['bytes'], 0)
+            self.assertEqual(stages[(browser, 'query')]['rows'], 30)
+            self.assertEqual(stages[(browser, 'build')]['objects'], 30)
+        self.assertEqual(stages[(None, 'merge')]['objects'], len(history))
+        self.assertEqual(stats.total('build', 'objects'), 60)
+        self.assertIn('Google Chrome', stats.report())
+
+    def test_threads_and_callback(self):
+        '''> Should record the stages of the extract threads and call the callback.'''
+        brinf = Brinf(root=self.root)
+        brinf.init()
+        chrome = brinf.browser('chrome')
+        calls = []
+        with Stats(lambda *args: calls.append(args)) as stats:
+            chrome.extract('history')
+        self.assertEqual(stats.stages[('Google Chrome', 'copy')]['calls'], 2)
+        self.assertEqual(stats.total('build', 'objects'), 60)
+        self.assertIn(('Google Chrome', 'copy'), [(browser, name) for browser, name, _, _ in calls])
+
+    def test_session_and_database(self):
+        '''> Should record the session parsing and the stages of a database without browser.'''
+        brinf = Brinf(root=self.root)
+        brinf.init()
+        CACHE.clear()
+        with Stats() as stats:
+            tabs = brinf.browser('chrome').session().tabs()
+            database = Database(os.path.join(self.profiles['chrome'][0], 'History'), bypass=True)
+            database.connect()
+            database.execute('SELECT id FROM urls')
+            database.close()
+        stages = stats.stages
+        self.assertGreater(stages[('Google Chrome', 'read')]['bytes'], 0)
+        self.assertGreaterEqual(stages[('Google Chrome', 'parse')]['objects'], len(tabs))
+        self.assertEqual(stages[(None, 'query')]['rows'], 30)
+
+if __name__ == '__main__':
+    unittest.main()
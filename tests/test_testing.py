@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+from pybrinf.__main__ import Brinf
+from pybrinf.browser import Browser
+from pybrinf.parser import Parser
+from pybrinf.session import CACHE
+from pybrinf.testing import make_home, snss_session, data_folder
+from pybrinf.utilities import Utilities
+
+'''All tests for the synthetic fixtures.'''
+
+class TestFixtures(unittest.TestCase):
+
+    def setUp(self):
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        self.root = folder.name
+
+    def test_linux_home(self):
+        '''> Should write profiles the whole pipeline can read with no browser installed.'''
+        profiles = make_home(self.root, profiles=2, rows=50, downloads=5, tabs=30)
+        self.assertEqual([os.path.basename(path) for path in profiles['chrome']],
+                         ['Default', 'Profile 1'])
+        brinf = Brinf(root=self.root)
+        brinf.init()
+        browsers = {browser.name: browser for browser in brinf.installed_browsers()}
+        self.assertEqual(sorted(browsers), ['Chrome', 'Firefox'])
+        self.assertEqual(len(brinf.history()), 100)
+        chrome, firefox = browsers['Chrome'], browsers['Firefox']
+        self.assertEqual([profile.name for profile in chrome.profiles()], ['Person 1', 'Person 2'])
+        self.assertEqual(len(chrome.extract('history')), 100)
+        self.assertEqual(len(chrome.downloads()), 5)
+        self.assertEqual(len(firefox.profiles()), 2)
+        self.assertEqual(len(firefox.downloads()), 5)
+        CACHE.clear()
+        tabs = chrome.session().tabs()
+        self.assertEqual(len(tabs), 30)
+        self.assertEqual(len(tabs[0].navigations), 3)
+
+    def test_windows_home(self):
+        '''> Should lay out the profiles as in a Windows home directory.'''
+        make_home(self.root, browsers=('chrome', 'edge'), os_='win32', rows=10, tabs=5)
+        self.assertEqual(data_folder(self.root, 'chrome', 'win32'),
+                         os.path.join(self.root, 'AppData', 'Local', 'Google', 'Chrome', 'User Data'))
+        edge = Browser('win32', root=self.root, **Utilities.get_browser_data('edge'))
+        self.assertTrue(edge.installed)
+        self.assertEqual(len(edge.history()), 10)
+
+    def test_large_session(self):
+        '''> Should write a valid session file with thousands of tabs.'''
+        path = os.path.join(self.root, 'Session_1')
+        snss_session(path, 5000, windows=10, navigations=2)
+        self.assertEqual(len(Parser(path).commands), 5000 * 5 + 11)
+
+if __name__ == '__main__':
+    unittest.main()
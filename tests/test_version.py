@@ -0,0 +1,67 @@
+import os
+import tempfile
+import unittest
+from pybrinf import version
+from pybrinf.version import disk_version
+
+'''All tests for Version module.'''
+
+class TestVersion(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = self.directory.name
+        self.app_path = os.path.join(self.root, 'browser')
+        with open(self.app_path, 'w') as file:
+            file.write('binary')
+        version.CACHE.clear()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_get_chromium_version(self):
+        '''> Should read the Last Version file of the user data folder.'''
+        with open(os.path.join(self.root, 'Last Version'), 'w') as file:
+            file.write('120.0.6099.109\n')
+        self.assertEqual(disk_version(self.app_path, True, self.root), '120.0.6099.109')
+
+    def test_get_chromium_version_folder(self):
+        '''> Should use the newest version folder next to the executable.'''
+        os.mkdir(os.path.join(self.root, '99.0.1.2'))
+        os.mkdir(os.path.join(self.root, '120.0.1.2'))
+        self.assertEqual(disk_version(self.app_path, True, None), '120.0.1.2')
+
+    def test_get_firefox_version(self):
+        '''> Should read application.ini or the profile compatibility.ini.'''
+        with open(os.path.join(self.root, 'compatibility.ini'), 'w') as file:
+            file.write('[Compatibility]\nLastVersion=115.0.2_20230726201356/20230726201356\n')
+        self.assertEqual(disk_version(self.app_path, False, self.root), '115.0.2')
+        version.CACHE.clear()
+        with open(os.path.join(self.root, 'application.ini'), 'w') as file:
+            file.write('[App]\nVendor=Mozilla\nVersion=116.0\n')
+        self.assertEqual(disk_version(self.app_path, False, self.root), '116.0')
+
+    def test_version_is_cached(self):
+        '''> Should not read the files again while the executable is unchanged.'''
+        with open(os.path.join(self.root, 'Last Version'), 'w') as file:
+            file.write('1.0.0.0')
+        disk_version(self.app_path, True, self.root)
+        os.remove(os.path.join(self.root, 'Last Version'))
+        self.assertEqual(disk_version(self.app_path, True, self.root), '1.0.0.0')
+
+    def test_cache_is_bounded(self):
+        '''> Should keep only the most recently used versions.'''
+        for index in range(version.CACHE_SIZE + 5):
+            os.mkdir(os.path.join(self.root, f'data{index}'))
+            with open(os.path.join(self.root, f'data{index}', 'Last Version'), 'w') as file:
+                file.write(f'1.0.0.{index}')
+        with open(os.path.join(self.root, 'Last Version'), 'w') as file:
+            file.write('1.0.0.0')
+        for index in range(version.CACHE_SIZE + 5):
+            disk_version(self.app_path, True, os.path.join(self.root, f'data{index}'))
+            disk_version(self.app_path, True, self.root)
+        self.assertEqual(len(version.CACHE), version.CACHE_SIZE)
+        self.assertEqual(list(version.CACHE)[-1][2], self.root)
+
+if __name__ == '__main__':
+    unittest.main()